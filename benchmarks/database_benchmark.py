@@ -0,0 +1,127 @@
+"""
+Benchmark odczytu pomiarów z lokalnej bazy SQLite.
+
+Wypełnia tymczasową bazę syntetycznymi pomiarami godzinowymi kilku sensorów i porównuje:
+  - odczyt wierszami sqlite3.Row z obiektem datetime dla każdego pomiaru (dawna ścieżka
+    fetch_sensor_data, zwracająca listę widoków),
+  - odczyt krotkami przez fetchall i np.fromiter (poprzednia wersja fetch_sensor_data),
+  - Client.fetch_sensor_data wywoływane osobno dla każdego sensora,
+  - Client.fetch_sensors_data (fetchmany do zaalokowanych tablic NumPy, wszystkie sensory naraz).
+
+Uruchomienie:
+    python -m benchmarks.database_benchmark [--rows 1200000] [--sensors 12] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable
+
+import numpy as np
+
+import src.api.models as api_models
+from src.database.client import Client
+from src.series import SensorSeries
+
+HOUR = 3600
+
+
+def populate(client: Client, sensors: int, rows: int) -> tuple[datetime, datetime]:
+    """Zapisuje `rows` pomiarów rozłożonych po równo na `sensors` sensorów."""
+    per_sensor = rows // sensors
+    start = int(datetime(2015, 1, 1).timestamp())
+    timestamps = start + np.arange(per_sensor, dtype=np.int64) * HOUR
+    rng = np.random.default_rng(0)
+
+    client.update_stations([api_models.Station(
+        id=1, codename="BENCH", name="Benchmark", district="-", voivodeship="-",
+        city="-", address="-", latitude=50.0, longitude=20.0
+    )])
+    client.update_station_sensors(1, [
+        api_models.Sensor(id=sensor_id, codename="PM10", name="pył zawieszony PM10")
+        for sensor_id in range(1, sensors + 1)
+    ])
+    for sensor_id in range(1, sensors + 1):
+        client.update_sensor_data(sensor_id, SensorSeries(timestamps, rng.random(per_sensor) * 100))
+    return datetime.fromtimestamp(int(timestamps[0])), datetime.fromtimestamp(int(timestamps[-1]))
+
+
+def read_rows(client: Client, sensor_ids: list[int], date_from: datetime, date_to: datetime) -> int:
+    """Odczyt wierszami sqlite3.Row z datetime dla każdego pomiaru."""
+    count = 0
+    for sensor_id in sensor_ids:
+        rows = client._cursor.execute("""
+            SELECT date, value FROM sensor_data
+            WHERE sensor_id = ? AND date >= ? AND date <= ?
+            ORDER BY date
+        """, (sensor_id, int(date_from.timestamp()), int(date_to.timestamp()))).fetchall()
+        data = [(datetime.fromtimestamp(r["date"]), r["value"]) for r in rows]
+        count += len(data)
+    return count
+
+
+def read_fetchall(client: Client, sensor_ids: list[int], date_from: datetime, date_to: datetime) -> int:
+    """Odczyt krotkami przez fetchall i budowa tablic przez np.fromiter."""
+    cursor = client._conn.cursor()
+    cursor.row_factory = None
+    count = 0
+    for sensor_id in sensor_ids:
+        data = cursor.execute("""
+            SELECT date, value FROM sensor_data
+            WHERE sensor_id = ? AND date >= ? AND date <= ?
+            ORDER BY date
+        """, (sensor_id, int(date_from.timestamp()), int(date_to.timestamp()))).fetchall()
+        count += len(SensorSeries.from_arrays((r[0] for r in data), (r[1] for r in data), len(data)))
+    return count
+
+
+def measure(name: str, read: Callable[[], int], repeat: int) -> None:
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = read()
+        best = min(best, time.perf_counter() - started)
+    print(f"{name:<34} {best * 1000:9.1f} ms {rows / best:14.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_200_000)
+    parser.add_argument("--sensors", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "benchmark.db")
+    client = Client(path)
+    try:
+        started = time.perf_counter()
+        date_from, date_to = populate(client, options.sensors, options.rows)
+        print(
+            f"Baza: {options.rows} pomiarów, {options.sensors} sensorów"
+            f" ({time.perf_counter() - started:.1f} s, {os.path.getsize(path) / 1e6:.1f} MB)"
+        )
+        sensor_ids = list(range(1, options.sensors + 1))
+
+        measure("sqlite3.Row + datetime", lambda: read_rows(client, sensor_ids, date_from, date_to),
+                options.repeat)
+        measure("fetchall + np.fromiter", lambda: read_fetchall(client, sensor_ids, date_from, date_to),
+                options.repeat)
+        measure("fetch_sensor_data (po sensorze)", lambda: sum(
+            len(client.fetch_sensor_data(sensor_id, date_from, date_to)) for sensor_id in sensor_ids
+        ), options.repeat)
+        measure("fetch_sensors_data (zbiorczo)", lambda: sum(
+            len(series) for series in client.fetch_sensors_data(sensor_ids, date_from, date_to).values()
+        ), options.repeat)
+    finally:
+        client.close()
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark dekodowania stron danych archiwalnych API GIOŚ.
+
+Porównuje dostępne backendy JSON (src.api.decoding) oraz parser przyrostowy na nagranych
+odpowiedziach API zapisanych jako pliki *.json w katalogu payloads.
+
+Nagranie odpowiedzi (wymaga dostępu do api.gios.gov.pl):
+    python -m benchmarks.decoding_benchmark --record 12345 --days 30
+
+Uruchomienie:
+    python -m benchmarks.decoding_benchmark [--payloads benchmarks/payloads]
+
+Bez nagranych odpowiedzi można użyć --synthetic, które generuje strony w formacie GIOŚ.
+Opcja --processes N dodaje pomiar parsowania stron do tablic w puli N procesów.
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+from src.api import decoding, mappers
+from src.api.client import Client
+from src.api.parsing import PageParserPool, parse_sensor_page
+
+ARCHIVAL_TARGET = "Lista archiwalnych wyników pomiarów"
+DEFAULT_PAYLOADS = Path(__file__).with_name("payloads")
+
+
+def record(directory: Path, sensor_id: int, days: int) -> None:
+    """Zapisuje surowe strony danych archiwalnych czujnika do katalogu."""
+    directory.mkdir(parents=True, exist_ok=True)
+    client = Client()
+    endpoint = f"pjp-api/v1/rest/archivalData/getDataBySensor/{sensor_id}"
+    args = client._archival_params(days=days)
+
+    page, total_pages = 0, 1
+    while page < total_pages:
+        url = client.make_url(endpoint, page=page, size=500, args=args)
+        response = client._request(endpoint, url)
+        path = directory / f"archival_{sensor_id}_{page}.json"
+        path.write_bytes(response.content)
+        total_pages = int(json.loads(response.content).get("totalPages", 1))
+        print(f"Zapisano {path} ({len(response.content)} B)")
+        page += 1
+
+
+def synthesize(pages: int, size: int = 500) -> list[bytes]:
+    """Generuje strony w formacie odpowiedzi archiwalnej GIOŚ."""
+    base = datetime(2024, 1, 1)
+    payloads = []
+    for page in range(pages):
+        rows = [
+            {
+                "Kod stanowiska": "MpKrakAlKras-PM10-1g",
+                "Data": (base + timedelta(hours=page * size + i)).strftime("%Y-%m-%d %H:%M:%S"),
+                "Wartość": round(20 + (i % 37) * 0.731, 3),
+            }
+            for i in range(size)
+        ]
+        payloads.append(json.dumps(
+            {ARCHIVAL_TARGET: rows, "totalPages": pages},
+            ensure_ascii=False,
+        ).encode())
+    return payloads
+
+
+def measure(name: str, payloads: list[bytes], parse: Callable[[bytes], int], repeat: int) -> None:
+    total_bytes = sum(len(p) for p in payloads) * repeat
+    rows = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for payload in payloads:
+            rows += parse(payload)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<28} {elapsed * 1000:9.1f} ms"
+        f" {total_bytes / elapsed / 1e6:9.1f} MB/s"
+        f" {rows / elapsed:12.0f} rows/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payloads", type=Path, default=DEFAULT_PAYLOADS)
+    parser.add_argument("--record", type=int, metavar="SENSOR_ID")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--synthetic", type=int, metavar="PAGES")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024)
+    parser.add_argument("--processes", type=int, default=0, metavar="N",
+                        help="porównaj parsowanie do tablic w wątku i w puli N procesów")
+    options = parser.parse_args()
+
+    if options.record is not None:
+        record(options.payloads, options.record, options.days)
+        return
+
+    if options.synthetic:
+        payloads = synthesize(options.synthetic)
+        print(f"Syntetyczne strony: {len(payloads)}")
+    else:
+        files = sorted(options.payloads.glob("*.json"))
+        if not files:
+            parser.error(f"Brak nagranych odpowiedzi w {options.payloads} (użyj --record lub --synthetic)")
+        payloads = [f.read_bytes() for f in files]
+        print(f"Nagrane strony: {len(payloads)} z {options.payloads}")
+
+    print(f"Łączny rozmiar: {sum(len(p) for p in payloads) / 1e6:.2f} MB, powtórzenia: {options.repeat}")
+
+    for backend in decoding.available_backends().values():
+        def parse_backend(payload: bytes, loads=backend.loads) -> int:
+            return len(loads(payload)[ARCHIVAL_TARGET])
+
+        def parse_backend_rows(payload: bytes, loads=backend.loads) -> int:
+            return sum(1 for _ in mappers.map_sensor_data_rows(loads(payload)[ARCHIVAL_TARGET]))
+
+        measure(f"{backend.name}", payloads, parse_backend, options.repeat)
+        measure(f"{backend.name} + mapowanie", payloads, parse_backend_rows, options.repeat)
+
+    def parse_incremental(payload: bytes) -> int:
+        chunks = (payload[i:i + options.chunk_size] for i in range(0, len(payload), options.chunk_size))
+        page = decoding.IncrementalPage(chunks, ARCHIVAL_TARGET)
+        rows = sum(1 for _ in mappers.map_sensor_data_rows(page.items()))
+        page.finish()
+        return rows
+
+    measure("przyrostowy + mapowanie", payloads, parse_incremental, options.repeat)
+
+    if options.processes:
+        measure("tablice (wątek)", payloads,
+                lambda payload: len(parse_sensor_page(payload, ARCHIVAL_TARGET).series), options.repeat)
+
+        with PageParserPool(max_workers=options.processes) as pool:
+            # Rozgrzanie: uruchomienie procesów nie wchodzi do pomiaru
+            for future in [pool.submit(p, ARCHIVAL_TARGET) for p in payloads[:options.processes]]:
+                future.result()
+
+            total_bytes = sum(len(p) for p in payloads) * options.repeat
+            started = time.perf_counter()
+            futures = [pool.submit(p, ARCHIVAL_TARGET) for _ in range(options.repeat) for p in payloads]
+            rows = sum(len(future.result().series) for future in futures)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{f'tablice (pula {options.processes} proc.)':<28} {elapsed * 1000:9.1f} ms"
+                f" {total_bytes / elapsed / 1e6:9.1f} MB/s"
+                f" {rows / elapsed:12.0f} rows/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
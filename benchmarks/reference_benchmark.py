@@ -0,0 +1,168 @@
+"""
+Benchmark odczytu danych referencyjnych (stacje, sensory, czasy aktualizacji).
+
+Wypełnia tymczasową bazę syntetyczną listą stacji z sensorami i porównuje średni czas
+pojedynczego odczytu:
+  - zapytaniem SQL z JOIN przy każdym wywołaniu (dawne ciała metod klienta bazy),
+  - z kopii tabel referencyjnych w pamięci (src.database.mirror, obecne metody klienta).
+
+Uruchomienie:
+    python -m benchmarks.reference_benchmark [--stations 3000] [--sensors 4] [--calls 20000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable
+
+import src.api.models as api_models
+import src.database.views as views
+from src.database.client import Client
+from src.database.mirror import ReferenceMirror
+
+SENSOR_CODES = ["SO2", "NO2", "PM10", "PM2.5", "O3"]
+
+
+def populate(client: Client, stations: int, sensors: int) -> None:
+    """Zapisuje `stations` stacji w 100 miastach, każdą z `sensors` sensorami."""
+    client.update_stations([
+        api_models.Station(
+            id=station_id, codename=f"ST{station_id}", name=f"Stacja {station_id}",
+            district="-", voivodeship="-", city=f"Miasto {station_id % 100}", address="-",
+            latitude=50.0 + station_id / stations, longitude=20.0
+        ) for station_id in range(1, stations + 1)
+    ])
+    with client.bulk_ingest():
+        for station_id in range(1, stations + 1):
+            client.update_station_sensors(station_id, [
+                api_models.Sensor(
+                    id=station_id * 10 + n, codename=SENSOR_CODES[n % len(SENSOR_CODES)], name="-"
+                ) for n in range(sensors)
+            ])
+
+
+def sql_station_list(client: Client) -> list:
+    rows = client._cursor.execute("""
+        SELECT s.id, s.name, s.latitude, s.longitude, c.city
+        FROM station AS s
+        JOIN city AS c ON c.id = s.city_id
+    """).fetchall()
+    return [
+        views.StationListView(
+            id=r["id"], name=r["name"], latitude=r["latitude"], longitude=r["longitude"], city=r["city"]
+        ) for r in rows
+    ]
+
+
+def sql_station_details(client: Client, station_id: int) -> views.StationDetailsView:
+    r = client._cursor.execute("""
+        SELECT s.codename, s.name, c.district, c.voivodeship, c.city, s.address
+        FROM station AS s
+        JOIN city AS c ON s.city_id = c.id
+        WHERE s.id = ?
+    """, (station_id,)).fetchone()
+    return views.StationDetailsView(
+        id=station_id, codename=r["codename"], name=r["name"], district=r["district"],
+        voivodeship=r["voivodeship"], city=r["city"], address=r["address"]
+    )
+
+
+def sql_station_sensors(client: Client, station_id: int) -> list:
+    rows = client._cursor.execute("""
+        SELECT s.id, st.codename
+        FROM sensor AS s
+        JOIN sensor_type AS st ON s.sensor_type_id = st.id
+        WHERE s.station_id = ?
+    """, (station_id,)).fetchall()
+    return [views.SensorView(id=r["id"], codename=r["codename"]) for r in rows]
+
+
+def sql_last_stations_update(client: Client) -> datetime:
+    row = client._cursor.execute(
+        "SELECT last_update_at FROM global_update WHERE id = ?",
+        (Client.GlobalUpdateIds.STATION_LIST.value,)
+    ).fetchone()
+    return datetime.fromtimestamp(row["last_update_at"])
+
+
+def sql_last_sensors_update(client: Client, station_id: int) -> datetime:
+    row = client._cursor.execute(
+        "SELECT last_sensors_update_at FROM station_update WHERE station_id = ?", (station_id,)
+    ).fetchone()
+    return datetime.fromtimestamp(row["last_sensors_update_at"]) if row else datetime.fromtimestamp(0)
+
+
+def measure(read: Callable[[int], object], station_ids: list[int]) -> float:
+    """Zwraca średni czas wywołania `read` dla kolejnych id stacji [s]."""
+    started = time.perf_counter()
+    for station_id in station_ids:
+        read(station_id)
+    return (time.perf_counter() - started) / len(station_ids)
+
+
+def report(name: str, sql: float, mirrored: float) -> None:
+    print(f"{name:<34} {sql * 1e6:10.2f} µs {mirrored * 1e6:10.2f} µs {sql / mirrored:9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stations", type=int, default=3000)
+    parser.add_argument("--sensors", type=int, default=4)
+    parser.add_argument("--calls", type=int, default=20_000)
+    options = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "benchmark.db")
+    client = Client(path)
+    try:
+        populate(client, options.stations, options.sensors)
+
+        started = time.perf_counter()
+        ReferenceMirror().load_all(client._conn)
+        print(
+            f"Baza: {options.stations} stacji, {options.stations * options.sensors} sensorów;"
+            f" wczytanie kopii w pamięci {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+
+        rng = random.Random(0)
+        station_ids = [rng.randint(1, options.stations) for _ in range(options.calls)]
+        list_calls = station_ids[:max(1, options.calls // 100)]
+
+        print(f"{'odczyt':<34} {'SQL':>13} {'pamięć':>13} {'przyspieszenie':>10}")
+        report(
+            "get_station_list_view",
+            measure(lambda _: sql_station_list(client), list_calls),
+            measure(lambda _: client.get_station_list_view(), list_calls),
+        )
+        report(
+            "fetch_station_detail_view",
+            measure(lambda sid: sql_station_details(client, sid), station_ids),
+            measure(client.fetch_station_detail_view, station_ids),
+        )
+        report(
+            "fetch_station_sensors",
+            measure(lambda sid: sql_station_sensors(client, sid), station_ids),
+            measure(client.fetch_station_sensors, station_ids),
+        )
+        report(
+            "get_last_stations_update",
+            measure(lambda _: sql_last_stations_update(client), station_ids),
+            measure(lambda _: client.get_last_stations_update(), station_ids),
+        )
+        report(
+            "fetch_last_station_sensors_update",
+            measure(lambda sid: sql_last_sensors_update(client, sid), station_ids),
+            measure(client.fetch_last_station_sensors_update, station_ids),
+        )
+    finally:
+        client.close()
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
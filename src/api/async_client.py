@@ -0,0 +1,402 @@
+import asyncio
+import logging
+import typing
+from datetime import datetime
+from typing import Callable, Any
+
+import aiohttp
+import requests
+
+import src.api.decoding as decoding
+import src.api.mappers as mappers
+import src.api.models as models
+import src.config as config
+from src.api.base import BaseClient
+from src.api.breaker import CircuitBreaker
+from src.api.client import RATE_LIMIT_ERROR_CODE
+from src.api.exceptions import APIError, TooManyRequests
+from src.api.scheduler import RequestScheduler, DEFAULT_ENDPOINT_CLASS
+from src.series import SensorSeries
+
+
+class AsyncClient(BaseClient):
+    """
+    Asynchroniczny klient HTTP dla API GIOŚ działający na pętli zdarzeń asyncio.
+
+    Udostępnia te same metody co src.api.client.Client (jako korutyny), korzysta z tego samego
+    mapowania na modele i zgłasza te same wyjątki. Liczba jednocześnie wykonywanych żądań
+    jest ograniczona semaforem, dzięki czemu setki zapytań mogą być obsługiwane z jednego wątku.
+    Endpointy objęte limitem zapytań (np. dane archiwalne) czekają na budżet we wspólnym
+    harmonogramie żądań, a ich strony pobierane są jedna po drugiej.
+
+    Przykład:
+        async with AsyncClient() as client:
+            indexes = await asyncio.gather(*(client.fetch_air_quality_indexes(i) for i in ids))
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = config.API_TRANSPORT["async_max_concurrency"],
+        connect_timeout: float = config.API_TRANSPORT["connect_timeout"],
+        read_timeout: float = config.API_TRANSPORT["read_timeout"],
+        base_url: str = None,
+        scheduler: RequestScheduler = None,
+        breaker: CircuitBreaker = None,
+    ):
+        """
+        Args:
+            max_concurrency (int, opcjonalnie): Maksymalna liczba jednoczesnych żądań.
+            connect_timeout (float, opcjonalnie): Limit czasu nawiązania połączenia [s].
+            read_timeout (float, opcjonalnie): Limit czasu oczekiwania na dane [s].
+            base_url (str, opcjonalnie): Adres bazowy API; domyślnie https://api.gios.gov.pl.
+            scheduler (RequestScheduler, opcjonalnie): Harmonogram limitów zapytań, np. wspólny
+                z klientem synchronicznym; domyślnie tworzony z ustawień config.API_RATE_LIMITS.
+            breaker (CircuitBreaker, opcjonalnie): Bezpiecznik połączeń; domyślnie tworzony
+                z ustawień config.API_CIRCUIT_BREAKER.
+        """
+        if base_url is not None:
+            self._base_url = base_url.rstrip("/")
+        self._max_concurrency = max_concurrency
+        self._timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._scheduler = scheduler if scheduler is not None else RequestScheduler()
+        self._breaker = breaker if breaker is not None else CircuitBreaker()
+        self._decoder = decoding.get_backend(config.API_DECODING["backend"])
+
+    async def __aenter__(self) -> 'AsyncClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Zamyka sesję HTTP wraz z pulą połączeń."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        # Sesja i semafor muszą powstać wewnątrz działającej pętli zdarzeń
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self._max_concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self._timeout,
+                headers={"Accept": "application/json"},
+            )
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._session
+
+    @staticmethod
+    def _retry_after(response: aiohttp.ClientResponse) -> typing.Optional[float]:
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return None
+
+    async def _get(
+        self,
+        endpoint: str,
+        page: int = 0,
+        size: int = 100,
+        args: dict[str, Any] = None,
+    ) -> Any:
+        """
+        Wykonuje żądanie GET, sprawdza status odpowiedzi i zwraca dane z JSON.
+
+        Żądania do endpointów objętych limitem zapytań czekają na budżet w harmonogramie,
+        a odpowiedzi o przekroczeniu limitu są ponawiane do config.API_SCHEDULER["max_retries"] razy.
+        Błędy połączenia i przekroczenia czasu są zgłaszane do bezpiecznika i mapowane
+        na requests.exceptions.ConnectionError, tak jak w kliencie synchronicznym.
+
+        Args:
+            endpoint (str): Ścieżka API.
+            page (int, opcjonalnie): Numer strony.
+            size (int, opcjonalnie): Rozmiar strony.
+            args (dict[str, Any], opcjonalnie): Dodatkowe parametry query string.
+
+        Returns:
+            Any: Zdeserializowany obiekt JSON (słownik lub lista).
+
+        Raises:
+            APIError: W przypadku błędu HTTP z mapowaniem pól błędu udostępnionych przez GIOŚ API.
+            requests.exceptions.ConnectionError: Gdy nie udało się połączyć z API lub przekroczono
+                limit czasu (CircuitOpenError, gdy bezpiecznik jest otwarty).
+        """
+        session = self._ensure_session()
+        url = self.make_url(endpoint, page, size, args)
+        retries = config.API_SCHEDULER["max_retries"]
+
+        while True:
+            # Otwarty bezpiecznik odrzuca żądanie, zanim trafi do kolejki limitów; żądanie próbne
+            # rezerwowane jest dopiero po uzyskaniu żetonu i miejsca w semaforze, tuż przed połączeniem
+            self._breaker.check()
+            await self._scheduler.acquire_async(endpoint)
+            async with self._semaphore:
+                probe = self._breaker.before_call()
+                logging.info(f"API Request: {url}")
+                try:
+                    async with session.get(url) as response:
+                        status = response.status
+                        retry_after = self._retry_after(response)
+                        body = await response.read()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as conn_err:
+                    self._breaker.record_failure()
+                    self.connection_status = False
+                    raise requests.exceptions.ConnectionError(conn_err) from conn_err
+                except BaseException:
+                    # Anulowana korutyna (CancelledError) lub inny wyjątek nie daje wyniku próby;
+                    # bez zwolnienia bezpiecznik odrzucałby wszystkie kolejne żądania
+                    if probe:
+                        self._breaker.release_probe()
+                    raise
+                self._breaker.record_success()
+            self.connection_status = True
+
+            if status < 400:
+                logging.info(f"API Request finished!")
+                return self._decoder.loads(body)
+
+            logging.error(f"API Request error!")
+            try:
+                payload = self._decoder.loads(body)
+            except ValueError:
+                payload = {}
+            error = mappers.map_api_error(payload if isinstance(payload, dict) else {})
+
+            # Przekroczony limit: harmonogram uczy się limitu, a żądanie wraca do kolejki
+            if retries > 0 and (status == 429 or error.code == RATE_LIMIT_ERROR_CODE):
+                retries -= 1
+                self._scheduler.report_limited(endpoint, retry_after)
+                continue
+            raise error
+
+    async def _get_collected(
+        self,
+        endpoint: str,
+        target: str,
+        size: int = 100,
+        args: dict[str, Any] = None,
+    ) -> typing.Union[list, dict]:
+        """
+        Pobiera wszystkie strony wyników i scala dane z klucza target w kolejności stron.
+        Strony po pierwszej pobierane są współbieżnie (sekwencyjnie dla endpointów z limitem zapytań).
+
+        Args:
+            endpoint (str): Ścieżka API.
+            target (str): Klucz w JSON, pod którym znajdują się dane (lista lub słownik).
+            size (int, opcjonalnie): Liczba rekordów na stronę.
+            args (dict[str, Any], opcjonalnie): Dodatkowe parametry query string.
+
+        Returns:
+            list|dict: Scalona lista lub słownik wyników.
+
+        Raises:
+            TypeError: Gdy zwrócony fragment JSON nie jest listą ani słownikiem.
+        """
+        responses = await self._get_all_pages(endpoint, size, args)
+        fragment = responses[0].get(target)
+
+        if isinstance(fragment, list):
+            result = list(fragment)
+        elif isinstance(fragment, dict):
+            result = dict(fragment)
+        else:
+            raise TypeError(f"Nieoczekiwany typ danych: {type(fragment).__name__}")
+
+        for response in responses[1:]:
+            fragment = response.get(target)
+            if isinstance(fragment, list):
+                result.extend(fragment)
+            elif isinstance(fragment, dict):
+                result.update(fragment)
+            else:
+                raise TypeError(f"Nieoczekiwany typ danych: {type(fragment).__name__}")
+
+        return result
+
+    async def _get_each(
+        self,
+        endpoint: str,
+        target: str,
+        callback: Callable[[Any], None],
+        size: int = 500, # Maksymalna wielkość API
+        args: dict[str, Any] = None,
+    ) -> None:
+        """
+        Pobiera wszystkie strony wyników i wywołuje callback dla każdego fragmentu target
+        w kolejności stron.
+
+        Args:
+            endpoint (str): Ścieżka API.
+            target (str): Klucz JSON, z którego pobierane są fragmenty danych.
+            callback (Callable[[Any], None]): Funkcja przetwarzająca fragment danych.
+            size (int, opcjonalnie): Liczba rekordów na stronę. Domyślnie 500.
+            args (dict[str, Any], opcjonalnie): Dodatkowe parametry query string.
+        """
+        for response in await self._get_all_pages(endpoint, size, args):
+            callback(response.get(target))
+
+    async def _get_all_pages(
+        self,
+        endpoint: str,
+        size: int,
+        args: dict[str, Any] = None,
+    ) -> list[Any]:
+        """
+        Pobiera pierwszą stronę, a następnie pozostałe; zwraca odpowiedzi w kolejności stron.
+
+        Strony endpointów bez limitu zapytań pobierane są współbieżnie. Strony endpointów
+        z limitem (np. dane archiwalne) pobierane są jedna po drugiej, każda po uzyskaniu
+        żetonu z harmonogramu, więc seria nie wyczerpuje budżetu naraz.
+        """
+        first = await self._get(endpoint, size=size, args=args)
+        total_pages = int(first.get("totalPages", 1))
+        pages = range(1, total_pages)
+
+        if self._scheduler.endpoint_class(endpoint) != DEFAULT_ENDPOINT_CLASS:
+            rest = [await self._get(endpoint, page=page, size=size, args=args) for page in pages]
+        else:
+            rest = await asyncio.gather(*(
+                self._get(endpoint, page=page, size=size, args=args)
+                for page in pages
+            ))
+        return [first, *rest]
+
+    async def fetch_stations(self) -> list[models.Station]:
+        """
+        Pobiera pełną listę stacji pomiarowych.
+
+        Returns:
+            list[models.Station]: Lista obiektów Station z danymi lokalizacyjnymi i nazewnictwem.
+        """
+        raw = await self._get_collected(
+            endpoint="pjp-api/v1/rest/station/findAll",
+            target="Lista stacji pomiarowych",
+        )
+        return [mappers.map_station(entry) for entry in raw]
+
+    async def fetch_station_meta(
+        self,
+        city: str = None,
+        station_codename: str = None,
+    ) -> list[models.StationMeta]:
+        """
+        Pobiera metadane stacji pomiarowych z opcjonalnym filtrowaniem.
+
+        Args:
+            city (str, opcjonalnie): Nazwa miasta do filtrowania.
+            station_codename (str, opcjonalnie): Kod stacji do filtrowania.
+
+        Returns:
+            list[models.StationMeta]: Lista obiektów StationMeta.
+        """
+        raw = await self._get_collected(
+            endpoint="pjp-api/v1/rest/metadata/stations",
+            target="Lista metadanych stacji pomiarowych",
+            args=self._station_meta_params(city, station_codename),
+        )
+        return [mappers.map_station_meta(entry) for entry in raw]
+
+    async def fetch_air_quality_indexes(
+        self,
+        station_id: int,
+    ) -> models.AirQualityIndexes:
+        """
+        Pobiera aktualne indeksy jakości powietrza dla danej stacji.
+
+        Args:
+            station_id (int): Identyfikator stacji pomiarowej.
+
+        Returns:
+            models.AirQualityIndexes: Obiekt zawierający indeks ogólny i dla poszczególnych wskaźników.
+        """
+        raw = await self._get_collected(
+            endpoint=f"pjp-api/v1/rest/aqindex/getIndex/{station_id}",
+            target="AqIndex",
+        )
+        return mappers.map_air_quality_indexes(raw)
+
+    async def fetch_station_sensors(self, station_id: int) -> list[models.Sensor]:
+        """
+        Pobiera listę sensorów dostępnych na danej stacji.
+
+        Args:
+            station_id (int): Identyfikator stacji pomiarowej.
+
+        Returns:
+            list[models.Sensor]: Lista obiektów Sensor z identyfikatorem i nazwą wskaźnika.
+        """
+        raw = await self._get_collected(
+            endpoint=f"pjp-api/v1/rest/station/sensors/{station_id}",
+            target="Lista stanowisk pomiarowych dla podanej stacji",
+        )
+        return [mappers.map_sensor(entry) for entry in raw]
+
+    async def fetch_sensor_data(self, sensor_id: int) -> SensorSeries:
+        """
+        Pobiera bieżące dane pomiarowe dla czujnika ze wszystkich stron.
+
+        Args:
+            sensor_id (int): Identyfikator czujnika.
+
+        Returns:
+            SensorSeries: Seria pomiarów posortowana po czasie.
+        """
+        pages: list[SensorSeries] = []
+
+        def collect(data: list[dict[str, Any]]) -> None:
+            pages.append(mappers.map_sensor_series(data))
+
+        await self._get_each(
+            endpoint=f"pjp-api/v1/rest/data/getData/{sensor_id}",
+            target="Lista danych pomiarowych",
+            callback=collect,
+        )
+        return SensorSeries.concat(pages)
+
+    async def fetch_sensor_archival_data(
+        self,
+        sensor_id: int,
+        date_from: datetime = None,
+        date_to: datetime = None,
+        days: int = None,
+    ) -> SensorSeries:
+        """
+        Pobiera archiwalne dane pomiarowe dla czujnika z opcjonalnym zakresem czasowym.
+
+        Args:
+            sensor_id (int): Identyfikator czujnika.
+            date_from (datetime, opcjonalnie): Data początkowa.
+            date_to (datetime, opcjonalnie): Data końcowa.
+            days (int, opcjonalnie): Liczba dni do pobrania przed dniem dzisiejszym.
+
+        Returns:
+            SensorSeries: Seria pomiarów posortowana po czasie.
+
+        Raises:
+            TooManyRequests: Gdy przekroczono limit zapytań o dane archiwalne.
+        """
+        pages: list[SensorSeries] = []
+
+        def collect(data: list[dict[str, Any]]) -> None:
+            pages.append(mappers.map_sensor_series(data))
+
+        try:
+            await self._get_each(
+                endpoint=f"pjp-api/v1/rest/archivalData/getDataBySensor/{sensor_id}",
+                target="Lista archiwalnych wyników pomiarów",
+                callback=collect,
+                args=self._archival_params(date_from, date_to, days),
+            )
+        except APIError as e:
+            match e.code:
+                case "API-ERR-100003":
+                    raise TooManyRequests(
+                        "API rate limit exceeded (max 2 requests per minute). "
+                        "Please wait before retrying the request."
+                    )
+                case _:
+                    raise
+        return SensorSeries.concat(pages)
@@ -0,0 +1,90 @@
+import typing
+from datetime import datetime
+from typing import Any
+
+
+DEFAULT_BASE_URL = "https://api.gios.gov.pl"
+
+
+class BaseClient:
+    """
+    Część wspólna klientów API GIOŚ (synchronicznego i asynchronicznego):
+    budowanie adresów URL oraz status połączenia z callbackiem sygnalizującym zmiane stanu.
+    """
+
+    _base_url: str = DEFAULT_BASE_URL
+    _connection_status: bool = True
+    connection_status_changed : typing.Callable[[bool],None] = None
+
+    @property
+    def base_url(self) -> str:
+        """Adres bazowy API, względem którego budowane są adresy endpointów."""
+        return self._base_url
+
+    @property
+    def connection_status(self):
+        return self._connection_status
+
+    @connection_status.setter
+    def connection_status(self,value: bool):
+        """Setter statusu połączenia, w razie zmiany wywołuje callback oraz zapisuje wartość"""
+        if self._connection_status == value:
+            return
+
+        self._connection_status = value
+        if self.connection_status_changed is not None:
+            self.connection_status_changed(value)
+
+    def make_url(
+        self,
+        endpoint: str,
+        page: int = 0,
+        size: int = 100,
+        args: dict[str, Any] = None,
+    ) -> str:
+        """
+        Buduje pełny URL z bazowego adresu, ścieżki oraz parametrów paginacji i dodatkowych argumentów.
+
+        Args:
+            endpoint (str): Ścieżka API (np. "pjp-api/v1/rest/station/findAll").
+            page (int, opcjonalnie): Numer strony (0-based). Domyślnie 0.
+            size (int, opcjonalnie): Liczba rekordów na stronę. Domyślnie 100.
+            args (dict[str, Any], opcjonalnie): Dodatkowe parametry query string.
+
+        Returns:
+            str: Pełny adres URL gotowy do wywołania przez transport HTTP.
+        """
+        if args is None:
+            args = {}
+        url = f"{self._base_url}/{endpoint}?page={page}&size={size}"
+        for key, value in args.items():
+            url += f"&{key}={value}"
+        return url
+
+    @staticmethod
+    def _station_meta_params(city: str = None, station_codename: str = None) -> dict[str, Any]:
+        """Buduje parametry filtrowania zapytania o metadane stacji."""
+        params: dict[str, Any] = {}
+        if city:
+            params["filter[miasto]"] = city
+        if station_codename:
+            params["filter[kod-stacji]"] = station_codename
+        return params
+
+    @staticmethod
+    def _archival_params(
+        date_from: datetime = None,
+        date_to: datetime = None,
+        days: int = None,
+    ) -> dict[str, Any]:
+        """Buduje parametry zakresu czasowego zapytania o dane archiwalne."""
+        params: dict[str, Any] = {}
+        date_format = "%Y-%m-%d %H:%M"
+
+        if date_from:
+            params["dateFrom"] = date_from.strftime(date_format)
+        if date_to:
+            params["dateTo"] = date_to.strftime(date_format)
+        if days:
+            params["dayNumber"] = days
+        return params
@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from enum import Enum
+
+import src.config as config
+from src.api.exceptions import CircuitOpenError
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreakerStats:
+    """
+    Liczniki bezpiecznika połączeń.
+
+    Attributes:
+        failures: liczba zarejestrowanych błędów połączenia.
+        rejected: liczba żądań odrzuconych bez próby połączenia.
+        opened: liczba przejść w stan otwarty.
+        probes: liczba żądań próbnych w stanie półotwartym.
+    """
+    failures: int = 0
+    rejected: int = 0
+    opened: int = 0
+    probes: int = 0
+
+
+class CircuitBreaker:
+    """
+    Bezpiecznik połączeń z API.
+
+    Po `failure_threshold` kolejnych błędach połączenia bezpiecznik otwiera się i przez
+    `cooldown` odrzuca żądania natychmiast (CircuitOpenError), bez dotykania gniazd.
+    Po upływie tego czasu przepuszcza jedno żądanie próbne (stan półotwarty): jego powodzenie
+    zamyka bezpiecznik, a błąd ponownie go otwiera. Pozostałe żądania w trakcie próby są odrzucane.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = config.API_CIRCUIT_BREAKER["failure_threshold"],
+        cooldown: timedelta = config.API_CIRCUIT_BREAKER["cooldown"],
+    ):
+        """
+        Args:
+            failure_threshold: liczba kolejnych błędów połączenia otwierająca bezpiecznik.
+            cooldown: czas, przez który otwarty bezpiecznik odrzuca żądania.
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown.total_seconds()
+        self.stats = CircuitBreakerStats()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._state
+
+    def retry_after(self) -> float:
+        """Czas [s] do końca okna odrzucania (0, gdy żądania są przepuszczane)."""
+        with self._lock:
+            if self._state is not CircuitState.OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.cooldown - time.monotonic())
+
+    def _rejection(self, now: float) -> CircuitOpenError:
+        self.stats.rejected += 1
+        retry_after = max(0.0, self._opened_at + self.cooldown - now)
+        return CircuitOpenError(
+            f"API niedostępne, kolejna próba połączenia za {retry_after:.0f} s"
+        )
+
+    def check(self) -> None:
+        """
+        Sprawdza, czy żądanie ma szansę zostać wykonane, nie rezerwując żądania próbnego.
+
+        Służy do odrzucenia żądania przed kolejką limitów zapytań; właściwe `before_call`
+        wywoływane jest tuż przed połączeniem.
+
+        Raises:
+            CircuitOpenError: Gdy bezpiecznik jest otwarty lub trwa żądanie próbne.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._state is CircuitState.CLOSED:
+                return
+            if self._state is CircuitState.OPEN and now - self._opened_at >= self.cooldown:
+                return
+            if self._state is CircuitState.HALF_OPEN and not self._probing:
+                return
+            error = self._rejection(now)
+        raise error
+
+    def before_call(self) -> bool:
+        """
+        Sprawdza, czy żądanie może zostać wykonane, i w stanie półotwartym rezerwuje żądanie próbne.
+
+        Wywołujący, który otrzymał żądanie próbne, musi zakończyć je przez `record_success`,
+        `record_failure` albo - gdy żądanie przerwano bez wyniku (np. anulowana korutyna) -
+        przez `release_probe`.
+
+        Returns:
+            bool: True, gdy to żądanie jest żądaniem próbnym.
+
+        Raises:
+            CircuitOpenError: Gdy bezpiecznik jest otwarty lub trwa żądanie próbne.
+        """
+        with self._lock:
+            if self._state is CircuitState.CLOSED:
+                return False
+
+            now = time.monotonic()
+            if self._state is CircuitState.OPEN and now - self._opened_at >= self.cooldown:
+                self._state = CircuitState.HALF_OPEN
+
+            if self._state is CircuitState.HALF_OPEN and not self._probing:
+                self._probing = True
+                self.stats.probes += 1
+                logging.info("API circuit half-open, probing connection")
+                return True
+
+            error = self._rejection(now)
+        raise error
+
+    def release_probe(self) -> None:
+        """Zwalnia żądanie próbne przerwane bez wyniku; kolejne żądanie może wykonać próbę."""
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._probing = False
+
+    def record_success(self) -> None:
+        """Rejestruje odpowiedź serwera (dowolny kod HTTP) i zamyka bezpiecznik."""
+        with self._lock:
+            if self._state is not CircuitState.CLOSED:
+                logging.info("API circuit closed, connection restored")
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Rejestruje błąd połączenia; otwiera bezpiecznik po przekroczeniu progu lub nieudanej próbie."""
+        with self._lock:
+            self.stats.failures += 1
+            self._failures += 1
+            if self._state is CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state is not CircuitState.OPEN:
+                    self.stats.opened += 1
+                    logging.warning(
+                        "API circuit open after %d connection failures, failing fast for %.0f s",
+                        self._failures, self.cooldown
+                    )
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
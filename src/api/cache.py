@@ -0,0 +1,162 @@
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import requests
+
+import src.config as config
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    body: bytes
+    headers: dict[str, str]
+    etag: str | None
+    last_modified: str | None
+    fetched_at: datetime
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Nagłówki żądania warunkowego (rewalidacji) dla zapisanej odpowiedzi."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Trwała pamięć podręczna odpowiedzi HTTP w pliku SQLite, kluczowana pełnym adresem URL
+    (wynik BaseClient.make_url).
+
+    Przechowuje treść, nagłówki, walidatory ETag/Last-Modified i czas pobrania, dzięki czemu
+    klient może wysyłać żądania warunkowe i obsługiwać odpowiedzi 304 z dysku. Rozmiar pamięci
+    jest ograniczony, a przy przekroczeniu usuwane są najdawniej używane wpisy (LRU).
+    Plik może być współdzielony przez wiele procesów na tej samej stacji roboczej.
+    """
+
+    def __init__(
+        self,
+        filepath: str = config.API_CACHE["path"],
+        max_bytes: int = config.API_CACHE["max_bytes"],
+    ):
+        """
+        Args:
+            filepath: ścieżka do pliku pamięci podręcznej.
+            max_bytes: maksymalny łączny rozmiar przechowywanych treści w bajtach.
+        """
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(filepath, timeout=10.0, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS response (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                headers TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at INTEGER NOT NULL,
+                last_access_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_response_last_access ON response(last_access_at)"
+        )
+        self._conn.commit()
+
+    def __del__(self):
+        """Zamyka połączenie przy usunięciu instancji."""
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Zwraca zapisaną odpowiedź dla adresu URL lub None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM response WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(
+            url=row["url"],
+            body=row["body"],
+            headers=json.loads(row["headers"]),
+            etag=row["etag"],
+            last_modified=row["last_modified"],
+            fetched_at=datetime.fromtimestamp(row["fetched_at"]),
+        )
+
+    def touch(self, url: str) -> None:
+        """Oznacza wpis jako potwierdzony przez serwer (304) i ostatnio użyty."""
+        now = datetime.now().timestamp()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE response SET fetched_at = ?, last_access_at = ? WHERE url = ?",
+                (int(now), now, url)
+            )
+            self._conn.commit()
+
+    def put(self, url: str, response: requests.Response) -> None:
+        """
+        Zapisuje odpowiedź, o ile serwer udostępnił walidatory umożliwiające rewalidację.
+
+        Args:
+            url: adres URL żądania.
+            response: odpowiedź 200 z serwera.
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+
+        now = datetime.now().timestamp()
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO response
+                  (url, body, headers, etag, last_modified, fetched_at, last_access_at, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                url, body, json.dumps(dict(response.headers)), etag, last_modified,
+                int(now), now, len(body)
+            ))
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Usuwa najdawniej używane wpisy, dopóki łączny rozmiar przekracza limit."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM response").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT url, size FROM response ORDER BY last_access_at ASC"
+        ).fetchall()
+        evicted = []
+        for row in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((row["url"],))
+            total -= row["size"]
+        self._conn.executemany("DELETE FROM response WHERE url = ?", evicted)
+        logging.info(f"API cache evicted {len(evicted)} entries")
+
+    def clear(self) -> None:
+        """Usuwa wszystkie wpisy."""
+        with self._lock:
+            self._conn.execute("DELETE FROM response")
+            self._conn.commit()
@@ -1,65 +1,204 @@
 import logging
 import typing
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Callable, Any
+from typing import Callable, Any, Iterator
 
 import requests
 
-import src.api.exceptions as exceptions
+import src.api.decoding as decoding
+import src.api.mappers as mappers
 import src.api.models as models
+import src.config as config
+from src.api.base import BaseClient
+from src.api.breaker import CircuitBreaker, CircuitBreakerStats
+from src.api.cache import ResponseCache
+from src.api.decoding import IncrementalPage, JSONBackend
 from src.api.exceptions import APIError, TooManyRequests
+from src.api.parsing import PageParserPool, ParsedPage, parse_sensor_page
+from src.api.scheduler import RequestScheduler, ARCHIVAL_ENDPOINT_CLASS
+from src.api.transport import Transport, TransportStats
+from src.series import SensorSeries
+from src.singleflight import SingleFlight, SingleFlightStats
 
 
-class Client:
+RATE_LIMIT_ERROR_CODE = "API-ERR-100003"
+
+
+class Client(BaseClient):
     """
     Klient HTTP dla API GIOŚ (https://api.gios.gov.pl),
     obsługujący paginację, obsługę błędów oraz mapowanie odpowiedzi na modele.
     Przechowuje również status połączenia z API oraz udostępnia callback sygnalizujący zmiane stanu.
+    Żądania wykonywane są przez transport z pulą połączeń keep-alive.
     """
 
-    __BASE = "https://api.gios.gov.pl"
-    _connection_status: bool = True
-    connection_status_changed : typing.Callable[[bool],None] = None
+    def __init__(
+        self,
+        transport: Transport = None,
+        page_workers: int = 1,
+        scheduler: RequestScheduler = None,
+        cache: ResponseCache = None,
+        decoder: JSONBackend = None,
+        incremental: bool = False,
+        base_url: str = None,
+        breaker: CircuitBreaker = None,
+        parser_pool: PageParserPool = None,
+    ):
+        """
+        Args:
+            transport (Transport, opcjonalnie): Transport HTTP; domyślnie tworzony z ustawień
+                config.API_TRANSPORT.
+            page_workers (int, opcjonalnie): Liczba wątków pobierających równolegle kolejne strony
+                wyników. Domyślnie 1, czyli pobieranie sekwencyjne.
+            scheduler (RequestScheduler, opcjonalnie): Harmonogram limitów zapytań; domyślnie
+                tworzony z ustawień config.API_RATE_LIMITS.
+            cache (ResponseCache, opcjonalnie): Trwała pamięć podręczna odpowiedzi; gdy podana,
+                żądania są rewalidowane warunkowo, a odpowiedzi 304 obsługiwane z dysku.
+            decoder (JSONBackend, opcjonalnie): Backend dekodujący JSON; domyślnie najszybszy
+                zainstalowany (orjson, w przeciwnym razie biblioteka standardowa).
+            incremental (bool, opcjonalnie): Czy strony danych archiwalnych parsować przyrostowo,
+                element po elemencie, w miarę odbierania bajtów.
+            base_url (str, opcjonalnie): Adres bazowy API (np. lokalnego symulatora
+                z src.api.simulator); domyślnie https://api.gios.gov.pl.
+            breaker (CircuitBreaker, opcjonalnie): Bezpiecznik połączeń; domyślnie tworzony
+                z ustawień config.API_CIRCUIT_BREAKER.
+            parser_pool (PageParserPool, opcjonalnie): Pula procesów parsujących strony danych
+                archiwalnych (iter_sensor_archival_series); domyślnie strony parsowane są
+                w wątku, który je pobrał.
+        """
+        if base_url is not None:
+            self._base_url = base_url.rstrip("/")
+        self._transport = transport if transport is not None else Transport()
+        self._page_workers = max(1, page_workers)
+        self._scheduler = scheduler if scheduler is not None else RequestScheduler()
+        self._cache = cache
+        self._decoder = decoder if decoder is not None else decoding.get_backend(
+            config.API_DECODING["backend"]
+        )
+        self._incremental = incremental
+        self._single_flight = SingleFlight()
+        self._breaker = breaker if breaker is not None else CircuitBreaker()
+        self._parser_pool = parser_pool
+
+    @property
+    def transport_stats(self) -> TransportStats:
+        """Liczniki żądań i ponownie użytych połączeń transportu."""
+        return self._transport.stats
+
+    @property
+    def breaker_stats(self) -> CircuitBreakerStats:
+        """Liczniki bezpiecznika połączeń (błędy, odrzucone żądania, próby)."""
+        return self._breaker.stats
 
     @property
-    def connection_status(self):
-        return self._connection_status
+    def parser_pool(self) -> typing.Optional[PageParserPool]:
+        """Pula procesów parsujących strony danych archiwalnych (None, gdy nieużywana)."""
+        return self._parser_pool
 
-    @connection_status.setter
-    def connection_status(self,value: bool):
-        """Setter statusu połączenia, w razie zmiany wywołuje callback oraz zapisuje wartość"""
-        if self._connection_status == value:
-            return
+    @property
+    def is_offline(self) -> bool:
+        """Czy bezpiecznik odrzuca żądania (API uznane za niedostępne)."""
+        return self._breaker.retry_after() > 0
+
+    @property
+    def single_flight_stats(self) -> SingleFlightStats:
+        """Liczniki scalonych, równoczesnych żądań o ten sam adres URL."""
+        return self._single_flight.stats
+
+    def expected_wait(self, endpoint_class: str = ARCHIVAL_ENDPOINT_CLASS) -> float:
+        """
+        Zwraca przewidywany czas oczekiwania [s] na wykonanie nowego żądania danej klasy
+        wynikający z limitów zapytań API.
+        """
+        return self._scheduler.expected_wait(endpoint_class)
 
-        self._connection_status = value
-        if self.connection_status_changed is not None:
-            self.connection_status_changed(value)
+    @staticmethod
+    def _is_rate_limited(response: requests.Response, error: APIError) -> bool:
+        return response.status_code == 429 or error.code == RATE_LIMIT_ERROR_CODE
 
-    def make_url(
+    @staticmethod
+    def _retry_after(response: requests.Response) -> typing.Optional[float]:
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return None
+
+    def _request(
         self,
         endpoint: str,
-        page: int = 0,
-        size: int = 100,
-        args: dict[str, Any] = None,
-    ) -> str:
+        url: str,
+        headers: dict[str, str] = None,
+        stream: bool = False,
+    ) -> requests.Response:
         """
-        Buduje pełny URL z bazowego adresu, ścieżki oraz parametrów paginacji i dodatkowych argumentów.
+        Wykonuje żądanie GET i sprawdza status odpowiedzi.
+
+        Żądania do endpointów objętych limitem zapytań czekają na budżet w harmonogramie,
+        a odpowiedzi o przekroczeniu limitu są ponawiane do config.API_SCHEDULER["max_retries"] razy.
+        Błędy połączenia są zgłaszane do bezpiecznika, który po ich serii odrzuca kolejne
+        żądania natychmiast, aż do udanego żądania próbnego.
 
         Args:
-            endpoint (str): Ścieżka API (np. "pjp-api/v1/rest/station/findAll").
-            page (int, opcjonalnie): Numer strony (0-based). Domyślnie 0.
-            size (int, opcjonalnie): Liczba rekordów na stronę. Domyślnie 100.
-            args (dict[str, Any], opcjonalnie): Dodatkowe parametry query string.
+            endpoint (str): Ścieżka API (wyznacza klasę limitu zapytań).
+            url (str): Pełny adres URL.
+            headers (dict[str, str], opcjonalnie): Dodatkowe nagłówki żądania.
+            stream (bool, opcjonalnie): Czy treść odpowiedzi ma być odbierana strumieniowo.
 
         Returns:
-            str: Pełny adres URL gotowy do wywołania przez requests.get().
+            requests.Response: Odpowiedź z kodem 2xx lub 304.
+
+        Raises:
+            APIError: W przypadku błędu HTTP z mapowaniem pól error_code, error_reason,
+                error_result oraz error_solution udostępnionymi przez GIOŚ API.
+            CircuitOpenError: Gdy po serii błędów połączenia API uznano za niedostępne
+                (podklasa requests.exceptions.ConnectionError).
         """
-        if args is None:
-            args = {}
-        url = f"{self.__BASE}/{endpoint}?page={page}&size={size}"
-        for key, value in args.items():
-            url += f"&{key}={value}"
-        return url
+        retries = config.API_SCHEDULER["max_retries"]
+
+        while True:
+            # Otwarty bezpiecznik odrzuca żądanie, zanim trafi do kolejki limitów; żądanie próbne
+            # rezerwowane jest dopiero po uzyskaniu żetonu, tuż przed połączeniem
+            self._breaker.check()
+            self._scheduler.acquire(endpoint)
+            probe = self._breaker.before_call()
+            try:
+                logging.info(f"API Request: {url}")
+                try:
+                    response = self._transport.get(url, headers=headers, stream=stream)
+                except requests.exceptions.RequestException:
+                    self._breaker.record_failure()
+                    raise
+                except BaseException:
+                    # Żądanie przerwane bez wyniku nie może zablokować bezpiecznika w stanie próby
+                    if probe:
+                        self._breaker.release_probe()
+                    raise
+                self._breaker.record_success()
+                self.connection_status = True
+                response.raise_for_status()
+                return response
+            except requests.exceptions.HTTPError as http_err:
+                logging.error(f"API Request error!")
+                try:
+                    payload = self._decoder.loads(http_err.response.content)
+                except ValueError:
+                    payload = {}
+                error = mappers.map_api_error(payload)
+
+                # Przekroczony limit: harmonogram uczy się limitu, a żądanie wraca do kolejki
+                if retries > 0 and self._is_rate_limited(http_err.response, error):
+                    retries -= 1
+                    self._scheduler.report_limited(endpoint, self._retry_after(http_err.response))
+                    continue
+                raise error
+            except requests.exceptions.ConnectionError as conn_err:
+                self.connection_status = False
+                raise conn_err
+            except requests.exceptions.Timeout as timeout_err:
+                # ReadTimeout nie dziedziczy po ConnectionError, a wywołujący obsługują tylko ten typ
+                self.connection_status = False
+                raise requests.exceptions.ConnectionError(timeout_err) from timeout_err
 
     def _get(
         self,
@@ -69,7 +208,11 @@ class Client:
         args: dict[str, Any] = None,
     ) -> Any:
         """
-        Wykonuje żądanie GET, sprawdza status odpowiedzi i zwraca dane z JSON.
+        Wykonuje żądanie GET i zwraca dane z JSON zdekodowane backendem klienta.
+
+        Równoczesne żądania o ten sam adres URL są scalane w jedno (single-flight).
+        Jeśli klient ma pamięć podręczną, żądanie jest warunkowe (If-None-Match/If-Modified-Since),
+        a odpowiedź 304 jest obsługiwana z dysku.
 
         Args:
             endpoint (str): Ścieżka API.
@@ -81,29 +224,78 @@ class Client:
             Any: Zdeserializowany obiekt JSON (słownik lub lista).
 
         Raises:
-            exceptions.APIError: W przypadku błędu HTTP z mapowaniem pól error_code, error_reason,
-                error_result oraz error_solution udostępnionymi przez GIOŚ API.
+            APIError: W przypadku błędu HTTP z mapowaniem pól udostępnionych przez GIOŚ API.
         """
-        try:
-            url = self.make_url(endpoint, page, size, args)
-            logging.info(f"API Request: {url}")
-            response = requests.get(url, timeout=None)
-            self.connection_status = True
-            response.raise_for_status()
-            logging.info(f"API Request finished!")
-            return response.json()
-        except requests.exceptions.HTTPError as http_err:
-            logging.error(f"API Request error!")
-            payload = http_err.response.json()
-            raise exceptions.APIError(
-                code=payload.get("error_code"),
-                reason=payload.get("error_reason"),
-                result=payload.get("error_result"),
-                solution=payload.get("error_solution"),
-            )
-        except requests.exceptions.ConnectionError as conn_err:
-            self.connection_status = False
-            raise conn_err
+        url = self.make_url(endpoint, page, size, args)
+        return self._single_flight.do(url, self._fetch, endpoint, url)
+
+    def _fetch(self, endpoint: str, url: str) -> Any:
+        """Pobiera i dekoduje odpowiedź dla adresu URL, korzystając z pamięci podręcznej."""
+        return self._decoder.loads(self._fetch_raw(endpoint, url))
+
+    def _get_raw(
+        self,
+        endpoint: str,
+        page: int = 0,
+        size: int = 100,
+        args: dict[str, Any] = None,
+    ) -> bytes:
+        """
+        Wykonuje żądanie GET jak `_get`, ale zwraca surową treść odpowiedzi (bez dekodowania JSON).
+
+        Args:
+            endpoint (str): Ścieżka API.
+            page (int, opcjonalnie): Numer strony.
+            size (int, opcjonalnie): Rozmiar strony.
+            args (dict[str, Any], opcjonalnie): Dodatkowe parametry query string.
+        """
+        url = self.make_url(endpoint, page, size, args)
+        return self._single_flight.do(("raw", url), self._fetch_raw, endpoint, url)
+
+    def _fetch_raw(self, endpoint: str, url: str) -> bytes:
+        """Pobiera treść odpowiedzi dla adresu URL, korzystając z pamięci podręcznej."""
+        cached = self._cache.get(url) if self._cache is not None else None
+
+        response = self._request(
+            endpoint, url, headers=cached.conditional_headers() if cached else None
+        )
+        if cached is not None and response.status_code == 304:
+            logging.info(f"API Request finished! (not modified)")
+            self._cache.touch(url)
+            return cached.body
+
+        logging.info(f"API Request finished!")
+        if self._cache is not None:
+            self._cache.put(url, response)
+        return response.content
+
+    def _get_incremental(
+        self,
+        endpoint: str,
+        target: str,
+        page: int = 0,
+        size: int = 500,
+        args: dict[str, Any] = None,
+    ) -> IncrementalPage:
+        """
+        Wykonuje żądanie GET z odbiorem strumieniowym i zwraca parser przyrostowy strony,
+        który udostępnia elementy listy target w miarę napływania bajtów.
+
+        Odpowiedzi strumieniowe nie są zapisywane w pamięci podręcznej.
+
+        Args:
+            endpoint (str): Ścieżka API.
+            target (str): Klucz listy JSON parsowanej przyrostowo.
+            page (int, opcjonalnie): Numer strony.
+            size (int, opcjonalnie): Rozmiar strony.
+            args (dict[str, Any], opcjonalnie): Dodatkowe parametry query string.
+        """
+        url = self.make_url(endpoint, page, size, args)
+        response = self._request(endpoint, url, stream=True)
+        return IncrementalPage(
+            response.iter_content(chunk_size=config.API_DECODING["chunk_size"]),
+            target,
+        )
 
     def _get_collected(
         self,
@@ -111,14 +303,18 @@ class Client:
         target: str,
         size: int = 100,
         args: dict[str, Any] = None,
+        workers: int = None,
     ) -> typing.Union[list, dict]:
         """
-        Pobiera wszystkie strony wyników (paginacja) i scala dane z klucza target.
+        Pobiera wszystkie strony wyników (paginacja) i scala dane z klucza target
+        w kolejności stron.
 
         Args:
             endpoint (str): Ścieżka API.
             target (str): Klucz w JSON, pod którym znajdują się dane (lista lub słownik).
+            size (int, opcjonalnie): Liczba rekordów na stronę, wspólna dla wszystkich stron.
             args (dict[str, Any], opcjonalnie): Dodatkowe parametry query string.
+            workers (int, opcjonalnie): Liczba równoległych pobrań stron; domyślnie page_workers klienta.
 
         Returns:
             list|dict: Scalona lista lub słownik wyników.
@@ -137,8 +333,7 @@ class Client:
         else:
             raise TypeError(f"Nieoczekiwany typ danych: {type(fragment).__name__}")
 
-        for page in range(1, total_pages):
-            response = self._get(endpoint, page=page, args=args)
+        for response in self._get_remaining_pages(endpoint, total_pages, size, args, workers):
             fragment = response.get(target)
             if isinstance(fragment, list):
                 result.extend(fragment)
@@ -156,9 +351,11 @@ class Client:
         callback: Callable[[Any], None],
         size: int = 500, # Maksymalna wielkość API
         args: dict[str, Any] = None,
+        workers: int = None,
     ) -> None:
         """
         Iteruje po wszystkich stronach wyników i wywołuje funkcję callback dla każdego fragmentu target.
+        Fragmenty przekazywane są do callback zawsze w kolejności stron.
 
         Args:
             endpoint (str): Ścieżka API.
@@ -166,14 +363,105 @@ class Client:
             callback (Callable[[Any], None]): Funkcja przetwarzająca fragment danych.
             size (int, opcjonalnie): Liczba rekordów na stronę. Domyślnie 500.
             args (dict[str, Any], opcjonalnie): Dodatkowe parametry query string.
+            workers (int, opcjonalnie): Liczba równoległych pobrań stron; domyślnie page_workers klienta.
+        """
+        for fragment in self._iter_each(endpoint, target, size, args, workers):
+            callback(fragment)
+
+    def _iter_each(
+        self,
+        endpoint: str,
+        target: str,
+        size: int = 500, # Maksymalna wielkość API
+        args: dict[str, Any] = None,
+        workers: int = None,
+    ) -> Iterator[Any]:
+        """
+        Generator zwracający fragmenty target kolejnych stron wyników w kolejności stron.
+        Kolejna strona jest pobierana dopiero, gdy wywołujący poprosi o następny fragment
+        (przy workers > 1 strony są pobierane z wyprzedzeniem przez pulę wątków).
+
+        Args:
+            endpoint (str): Ścieżka API.
+            target (str): Klucz JSON, z którego pobierane są fragmenty danych.
+            size (int, opcjonalnie): Liczba rekordów na stronę. Domyślnie 500.
+            args (dict[str, Any], opcjonalnie): Dodatkowe parametry query string.
+            workers (int, opcjonalnie): Liczba równoległych pobrań stron; domyślnie page_workers klienta.
         """
         response = self._get(endpoint, size=size, args=args)
         total_pages = int(response.get("totalPages", 1))
+        yield response.get(target)
 
-        for page in range(total_pages):
-            if page > 0:
-                response = self._get(endpoint, page=page, args=args)
-            callback(response.get(target))
+        for response in self._get_remaining_pages(endpoint, total_pages, size, args, workers):
+            yield response.get(target)
+
+    def _iter_each_incremental(
+        self,
+        endpoint: str,
+        target: str,
+        size: int = 500, # Maksymalna wielkość API
+        args: dict[str, Any] = None,
+    ) -> Iterator[Iterator[Any]]:
+        """
+        Generator zwracający dla kolejnych stron iteratory elementów listy target, parsowanych
+        przyrostowo w miarę odbierania danych. Strony pobierane są sekwencyjnie; liczba stron
+        jest odczytywana z pierwszej strony po jej przetworzeniu.
+
+        Args:
+            endpoint (str): Ścieżka API.
+            target (str): Klucz listy JSON parsowanej przyrostowo.
+            size (int, opcjonalnie): Liczba rekordów na stronę. Domyślnie 500.
+            args (dict[str, Any], opcjonalnie): Dodatkowe parametry query string.
+        """
+        first = self._get_incremental(endpoint, target, size=size, args=args)
+        yield first.items()
+        total_pages = int(first.finish().get("totalPages", 1))
+
+        for page in range(1, total_pages):
+            incremental_page = self._get_incremental(endpoint, target, page=page, size=size, args=args)
+            yield incremental_page.items()
+            incremental_page.finish()
+
+    def _get_remaining_pages(
+        self,
+        endpoint: str,
+        total_pages: int,
+        size: int,
+        args: dict[str, Any] = None,
+        workers: int = None,
+    ) -> Iterator[Any]:
+        """
+        Pobiera strony 1..total_pages-1 (strona 0 jest już pobrana przez wywołującego)
+        i zwraca odpowiedzi w kolejności stron.
+
+        Przy workers > 1 strony pobierane są równolegle przez ograniczoną pulę wątków;
+        błąd dowolnej strony przerywa iterację, a niepobrane jeszcze strony są anulowane.
+
+        Args:
+            endpoint (str): Ścieżka API.
+            total_pages (int): Liczba stron odczytana z pierwszej odpowiedzi.
+            size (int): Liczba rekordów na stronę.
+            args (dict[str, Any], opcjonalnie): Dodatkowe parametry query string.
+            workers (int, opcjonalnie): Liczba równoległych pobrań; domyślnie page_workers klienta.
+        """
+        pages = range(1, total_pages)
+        workers = min(workers or self._page_workers, len(pages))
+
+        if workers <= 1:
+            for page in pages:
+                yield self._get(endpoint, page=page, size=size, args=args)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-page")
+        try:
+            futures = [
+                executor.submit(self._get, endpoint, page=page, size=size, args=args)
+                for page in pages
+            ]
+            for future in futures:
+                yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def fetch_stations(self) -> list[models.Station]:
         """
@@ -186,20 +474,7 @@ class Client:
             endpoint="pjp-api/v1/rest/station/findAll",
             target="Lista stacji pomiarowych",
         )
-        return [
-            models.Station(
-                id=entry["Identyfikator stacji"],
-                codename=entry["Kod stacji"],
-                name=entry["Nazwa stacji"],
-                district=entry["Powiat"],
-                voivodeship=entry["Województwo"],
-                city=entry["Nazwa miasta"],
-                address=entry["Ulica"],
-                latitude=entry["WGS84 φ N"],
-                longitude=entry["WGS84 λ E"],
-            )
-            for entry in raw
-        ]
+        return [mappers.map_station(entry) for entry in raw]
 
     def fetch_station_meta(
         self,
@@ -216,31 +491,12 @@ class Client:
         Returns:
             list[models.StationMeta]: Lista obiektów StationMeta.
         """
-        params: dict[str, Any] = {}
-        if city:
-            params["filter[miasto]"] = city
-        if station_codename:
-            params["filter[kod-stacji]"] = station_codename
-
         raw = self._get_collected(
             endpoint="pjp-api/v1/rest/metadata/stations",
             target="Lista metadanych stacji pomiarowych",
-            args=params,
+            args=self._station_meta_params(city, station_codename),
         )
-        return [
-            models.StationMeta(
-                codename=entry["Kod stacji"],
-                international_codename=entry["Kod międzynarodowy"],
-                launch_date=datetime.fromisoformat(entry["Data uruchomienia"]),
-                close_date=(
-                    datetime.fromisoformat(entry["Data zamknięcia"])
-                    if entry.get("Data zamknięcia")
-                    else None
-                ),
-                type=entry["Rodzaj stacji"],
-            )
-            for entry in raw
-        ]
+        return [mappers.map_station_meta(entry) for entry in raw]
 
     def fetch_air_quality_indexes(
         self,
@@ -262,28 +518,7 @@ class Client:
             endpoint=f"pjp-api/v1/rest/aqindex/getIndex/{station_id}",
             target="AqIndex",
         )
-
-        def parse_date(key: str) -> typing.Optional[datetime]:
-            value = raw.get(key)
-            return datetime.fromisoformat(value) if value else None
-
-        overall = models.Index(
-            date=parse_date("Data wykonania obliczeń indeksu"),
-            value=raw.get("Wartość indeksu"),
-        )
-        sensors: dict[str, models.Index] = {}
-        for pollutant in ["NO2", "O3", "PM10", "PM2.5", "SO2"]:
-            sensors[pollutant] = models.Index(
-                date=parse_date(f"Data wykonania obliczeń indeksu dla wskaźnika {pollutant}"),
-                value=raw.get(f"Wartość indeksu dla wskaźnika {pollutant}"),
-            )
-
-        return models.AirQualityIndexes(
-            overall=overall,
-            sensors=sensors,
-            index_status=raw.get("Status indeksu ogólnego dla stacji pomiarowej"),
-            index_critical=raw.get("Kod zanieczyszczenia krytycznego"),
-        )
+        return mappers.map_air_quality_indexes(raw)
 
     def fetch_station_sensors(self, station_id: int) -> list[models.Sensor]:
         """
@@ -299,16 +534,9 @@ class Client:
             endpoint=f"pjp-api/v1/rest/station/sensors/{station_id}",
             target="Lista stanowisk pomiarowych dla podanej stacji",
         )
-        return [
-            models.Sensor(
-                id=entry["Identyfikator stanowiska"],
-                codename=entry["Wskaźnik - kod"],
-                name=entry["Wskaźnik"],
-            )
-            for entry in raw
-        ]
+        return [mappers.map_sensor(entry) for entry in raw]
 
-    def fetch_sensor_data(self, sensor_id: int) -> list[models.SensorData]:
+    def fetch_sensor_data(self, sensor_id: int) -> SensorSeries:
         """
         Pobiera bieżące dane pomiarowe dla czujnika, iterując po wszystkich stronach.
 
@@ -316,27 +544,19 @@ class Client:
             sensor_id (int): Identyfikator czujnika.
 
         Returns:
-            list[models.SensorData]: Lista obiektów SensorData z datą i wartością pomiaru.
+            SensorSeries: Seria pomiarów posortowana po czasie.
         """
-        result: list[models.SensorData] = []
+        pages: list[SensorSeries] = []
 
         def collect(data: list[dict[str, Any]]) -> None:
-            for entry in data:
-                value = entry.get("Wartość")
-                if value is not None:
-                    result.append(
-                        models.SensorData(
-                            date=datetime.fromisoformat(entry["Data"]),
-                            value=value,
-                        )
-                    )
+            pages.append(mappers.map_sensor_series(data))
 
         self._get_each(
             endpoint=f"pjp-api/v1/rest/data/getData/{sensor_id}",
             target="Lista danych pomiarowych",
             callback=collect,
         )
-        return result
+        return SensorSeries.concat(pages)
 
     def fetch_sensor_archival_data(
         self,
@@ -344,7 +564,7 @@ class Client:
         date_from: datetime = None,
         date_to: datetime = None,
         days: int = None,
-    ) -> list[models.SensorData]:
+    ) -> SensorSeries:
         """
         Pobiera archiwalne dane pomiarowe dla czujnika z opcjonalnym zakresem czasowym.
 
@@ -355,34 +575,19 @@ class Client:
             days (int, opcjonalnie): Liczba dni do pobrania przed dniem dzisiejszym.
 
         Returns:
-            list[models.SensorData]: Lista obiektów SensorData z datą i wartością.
+            SensorSeries: Seria pomiarów posortowana po czasie.
         """
-        result: list[models.SensorData] = []
-        params: dict[str, Any] = {}
-        date_format = "%Y-%m-%d %H:%M"
-
-        if date_from:
-            params["dateFrom"] = date_from.strftime(date_format)
-        if date_to:
-            params["dateTo"] = date_to.strftime(date_format)
-        if days:
-            params["dayNumber"] = days
+        pages: list[SensorSeries] = []
 
         def collect(data: list[dict[str, Any]]) -> None:
-            for entry in data:
-                result.append(
-                    models.SensorData(
-                        date=datetime.fromisoformat(entry["Data"]),
-                        value=entry.get("Wartość"),
-                    )
-                )
+            pages.append(mappers.map_sensor_series(data))
 
         try:
             self._get_each(
                 endpoint=f"pjp-api/v1/rest/archivalData/getDataBySensor/{sensor_id}",
                 target="Lista archiwalnych wyników pomiarów",
                 callback=collect,
-                args=params,
+                args=self._archival_params(date_from, date_to, days),
             )
         except APIError as e:
             match e.code:
@@ -391,4 +596,129 @@ class Client:
                         "API rate limit exceeded (max 2 requests per minute). "
                         "Please wait before retrying the request."
                     )
-        return result
+                case _:
+                    raise
+        return SensorSeries.concat(pages)
+
+    def iter_sensor_data_pages(
+        self,
+        sensor_id: int,
+    ) -> Iterator[Iterator[tuple[datetime, float]]]:
+        """
+        Strumieniowo pobiera bieżące dane pomiarowe czujnika, strona po stronie.
+
+        Każda strona jest leniwym iteratorem krotek (data, wartość) bez tworzenia obiektów modeli;
+        pomiary bez wartości są pomijane. W pamięci znajduje się jednocześnie co najwyżej jedna strona
+        odpowiedzi (przy sekwencyjnym pobieraniu stron).
+
+        Args:
+            sensor_id (int): Identyfikator czujnika.
+
+        Returns:
+            Iterator[Iterator[tuple[datetime, float]]]: Iterator stron z krotkami (data, wartość).
+        """
+        for data in self._iter_each(
+            endpoint=f"pjp-api/v1/rest/data/getData/{sensor_id}",
+            target="Lista danych pomiarowych",
+        ):
+            yield mappers.map_sensor_data_rows(data)
+
+    def iter_sensor_archival_data_pages(
+        self,
+        sensor_id: int,
+        date_from: datetime = None,
+        date_to: datetime = None,
+        days: int = None,
+    ) -> Iterator[Iterator[tuple[datetime, float]]]:
+        """
+        Strumieniowo pobiera archiwalne dane pomiarowe czujnika, strona po stronie.
+
+        Args:
+            sensor_id (int): Identyfikator czujnika.
+            date_from (datetime, opcjonalnie): Data początkowa.
+            date_to (datetime, opcjonalnie): Data końcowa.
+            days (int, opcjonalnie): Liczba dni do pobrania przed dniem dzisiejszym.
+
+        Returns:
+            Iterator[Iterator[tuple[datetime, float]]]: Iterator stron z krotkami (data, wartość).
+
+        Raises:
+            TooManyRequests: Gdy mimo ponowień przekroczono limit zapytań o dane archiwalne.
+        """
+        endpoint = f"pjp-api/v1/rest/archivalData/getDataBySensor/{sensor_id}"
+        target = "Lista archiwalnych wyników pomiarów"
+        args = self._archival_params(date_from, date_to, days)
+
+        try:
+            if self._incremental:
+                for items in self._iter_each_incremental(endpoint, target, args=args):
+                    yield mappers.map_sensor_data_rows(items)
+            else:
+                for data in self._iter_each(endpoint, target, args=args):
+                    yield mappers.map_sensor_data_rows(data)
+        except APIError as e:
+            if e.code == RATE_LIMIT_ERROR_CODE:
+                raise TooManyRequests(
+                    "API rate limit exceeded (max 2 requests per minute). "
+                    "Please wait before retrying the request."
+                )
+            raise
+
+    def iter_sensor_archival_series(
+        self,
+        sensor_id: int,
+        date_from: datetime = None,
+        date_to: datetime = None,
+        days: int = None,
+    ) -> Iterator[SensorSeries]:
+        """
+        Strumieniowo pobiera archiwalne dane pomiarowe czujnika jako serie, strona po stronie.
+
+        Surowe bajty stron trafiają do puli procesów klienta (jeśli jest ustawiona), więc
+        parsowanie nie blokuje GIL wątku pobierającego; pobieranie kolejnej strony odbywa się
+        równolegle z parsowaniem poprzedniej. Serie zwracane są w kolejności stron.
+
+        Args:
+            sensor_id (int): Identyfikator czujnika.
+            date_from (datetime, opcjonalnie): Data początkowa.
+            date_to (datetime, opcjonalnie): Data końcowa.
+            days (int, opcjonalnie): Liczba dni do pobrania przed dniem dzisiejszym.
+
+        Returns:
+            Iterator[SensorSeries]: Iterator serii pomiarów kolejnych stron.
+
+        Raises:
+            TooManyRequests: Gdy mimo ponowień przekroczono limit zapytań o dane archiwalne.
+        """
+        endpoint = f"pjp-api/v1/rest/archivalData/getDataBySensor/{sensor_id}"
+        target = "Lista archiwalnych wyników pomiarów"
+        args = self._archival_params(date_from, date_to, days)
+        size = 500 # Maksymalna wielkość API
+
+        def parse(page: int) -> Future:
+            payload = self._get_raw(endpoint, page=page, size=size, args=args)
+            if self._parser_pool is not None:
+                return self._parser_pool.submit(payload, target)
+            future = Future()
+            future.set_result(parse_sensor_page(payload, target, self._decoder.name))
+            return future
+
+        try:
+            first: ParsedPage = parse(0).result()
+            yield first.series
+
+            pending = None
+            for page in range(1, first.total_pages):
+                future = parse(page)
+                if pending is not None:
+                    yield pending.result().series
+                pending = future
+            if pending is not None:
+                yield pending.result().series
+        except APIError as e:
+            if e.code == RATE_LIMIT_ERROR_CODE:
+                raise TooManyRequests(
+                    "API rate limit exceeded (max 2 requests per minute). "
+                    "Please wait before retrying the request."
+                )
+            raise
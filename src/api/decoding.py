@@ -0,0 +1,173 @@
+"""
+Warstwa dekodowania odpowiedzi JSON API GIOŚ.
+
+Udostępnia wymienne backendy dekodujące (szybki orjson, jeśli jest zainstalowany,
+w przeciwnym razie biblioteka standardowa) oraz parser przyrostowy, który zwraca elementy
+wskazanej listy (np. "Lista archiwalnych wyników pomiarów") w miarę napływania bajtów.
+"""
+
+import codecs
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@dataclass(frozen=True)
+class JSONBackend:
+    name: str
+    loads: Callable[[bytes | str], Any]
+
+
+STDLIB_BACKEND = JSONBackend(name="json", loads=json.loads)
+
+
+def available_backends() -> dict[str, JSONBackend]:
+    """Zwraca zainstalowane backendy JSON, od najszybszego."""
+    backends = {}
+    if orjson is not None:
+        backends["orjson"] = JSONBackend(name="orjson", loads=orjson.loads)
+    backends[STDLIB_BACKEND.name] = STDLIB_BACKEND
+    return backends
+
+
+def get_backend(name: str = None) -> JSONBackend:
+    """
+    Zwraca backend JSON o podanej nazwie lub najszybszy dostępny.
+
+    Args:
+        name: nazwa backendu ("orjson", "json"); domyślnie najszybszy zainstalowany.
+
+    Raises:
+        ValueError: Gdy wskazany backend nie jest zainstalowany.
+    """
+    backends = available_backends()
+    if name is None:
+        return next(iter(backends.values()))
+    if name not in backends:
+        raise ValueError(f"Backend JSON '{name}' nie jest dostępny")
+    return backends[name]
+
+
+class _NeedMoreData(Exception):
+    """Bufor kończy się w środku wartości JSON."""
+
+
+class IncrementalPage:
+    """
+    Przyrostowy parser strony odpowiedzi API (obiekt JSON najwyższego poziomu).
+
+    Elementy listy pod kluczem `target` są zwracane przez `items()` pojedynczo, gdy tylko
+    zostaną w całości odebrane, bez buforowania całej odpowiedzi. Pozostałe klucze najwyższego
+    poziomu (np. "totalPages") trafiają do `fields`; komplet jest dostępny po `finish()`.
+    """
+
+    _WHITESPACE = " \t\r\n"
+
+    def __init__(self, chunks: Iterable[bytes], target: str):
+        """
+        Args:
+            chunks: kolejne fragmenty bajtów odpowiedzi (np. Response.iter_content()).
+            target: klucz listy, której elementy mają być zwracane przyrostowo.
+        """
+        self.target = target
+        self.fields: dict[str, Any] = {}
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._items = self._parse()
+
+    def _feed(self) -> None:
+        """Dokłada kolejny fragment do bufora, usuwając już przetworzoną część."""
+        if self._eof:
+            raise json.JSONDecodeError("Nieoczekiwany koniec danych", self._buffer, self._pos)
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        try:
+            chunk = next(self._chunks)
+            self._buffer += self._text_decoder.decode(chunk)
+        except StopIteration:
+            self._buffer += self._text_decoder.decode(b"", final=True)
+            self._eof = True
+
+    def _skip_whitespace(self) -> str:
+        """Pomija białe znaki i zwraca pierwszy znaczący znak (dociąga dane w razie potrzeby)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in self._WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            self._feed()
+
+    def _expect(self, chars: str) -> str:
+        char = self._skip_whitespace()
+        if char not in chars:
+            raise json.JSONDecodeError(f"Oczekiwano jednego z '{chars}'", self._buffer, self._pos)
+        self._pos += 1
+        return char
+
+    def _try_decode(self) -> Any:
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            raise _NeedMoreData()
+        # Liczba lub literał na końcu bufora może być jeszcze niekompletny
+        if end >= len(self._buffer) and not self._eof:
+            raise _NeedMoreData()
+        self._pos = end
+        return value
+
+    def _decode_value(self) -> Any:
+        self._skip_whitespace()
+        while True:
+            try:
+                return self._try_decode()
+            except _NeedMoreData:
+                self._feed()
+
+    def items(self) -> Iterator[Any]:
+        """
+        Zwraca kolejne elementy listy `target` w miarę odbierania danych.
+        Kolejne wywołania zwracają ten sam iterator, kontynuujący od miejsca przerwania.
+        """
+        return self._items
+
+    def _parse(self) -> Iterator[Any]:
+        self._expect("{")
+        if self._skip_whitespace() == "}":
+            return
+
+        while True:
+            key = self._decode_value()
+            self._expect(":")
+
+            if key == self.target and self._skip_whitespace() == "[":
+                self._pos += 1
+                if self._skip_whitespace() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._decode_value()
+                        if self._expect(",]") == "]":
+                            break
+                self.fields[key] = None
+            else:
+                self.fields[key] = self._decode_value()
+
+            if self._expect(",}") == "}":
+                return
+
+    def finish(self) -> dict[str, Any]:
+        """Dokańcza parsowanie (pomijając nieodebrane elementy `target`) i zwraca `fields`."""
+        for _ in self._items:
+            pass
+        return self.fields
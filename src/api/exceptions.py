@@ -1,3 +1,6 @@
+import requests.exceptions
+
+
 class APIError(IOError):
     """
     Wyjątek reprezentujący błąd specyficzny dla API GIOŚ.
@@ -22,4 +25,12 @@ class TooManyRequests(IOError):
     """
     Wyjątek reprezentujący błąd API GIOŚ zbyt wielu żadań
     """
-    pass
\ No newline at end of file
+    pass
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+    Wyjątek zgłaszany bez próby połączenia, gdy bezpiecznik połączeń z API jest otwarty
+    (API uznane za niedostępne po serii błędów połączenia).
+    """
+    pass
@@ -0,0 +1,105 @@
+"""
+Mapowanie surowych odpowiedzi JSON API GIOŚ (klucze w języku polskim) na modele z src.api.models.
+Wspólne dla klienta synchronicznego i asynchronicznego.
+"""
+
+import typing
+from datetime import datetime
+from typing import Any, Iterable, Iterator
+
+import src.api.models as models
+from src.api.exceptions import APIError
+from src.series import SensorSeries
+
+
+AQ_INDEX_POLLUTANTS = ["NO2", "O3", "PM10", "PM2.5", "SO2"]
+
+
+def map_api_error(payload: dict[str, Any]) -> APIError:
+    """Tworzy wyjątek APIError z pól błędu zwróconych przez GIOŚ API."""
+    return APIError(
+        code=payload.get("error_code"),
+        reason=payload.get("error_reason"),
+        result=payload.get("error_result"),
+        solution=payload.get("error_solution"),
+    )
+
+
+def map_station(entry: dict[str, Any]) -> models.Station:
+    return models.Station(
+        id=entry["Identyfikator stacji"],
+        codename=entry["Kod stacji"],
+        name=entry["Nazwa stacji"],
+        district=entry["Powiat"],
+        voivodeship=entry["Województwo"],
+        city=entry["Nazwa miasta"],
+        address=entry["Ulica"],
+        latitude=entry["WGS84 φ N"],
+        longitude=entry["WGS84 λ E"],
+    )
+
+
+def map_station_meta(entry: dict[str, Any]) -> models.StationMeta:
+    return models.StationMeta(
+        codename=entry["Kod stacji"],
+        international_codename=entry["Kod międzynarodowy"],
+        launch_date=datetime.fromisoformat(entry["Data uruchomienia"]),
+        close_date=(
+            datetime.fromisoformat(entry["Data zamknięcia"])
+            if entry.get("Data zamknięcia")
+            else None
+        ),
+        type=entry["Rodzaj stacji"],
+    )
+
+
+def map_air_quality_indexes(raw: dict[str, Any]) -> models.AirQualityIndexes:
+    def parse_date(key: str) -> typing.Optional[datetime]:
+        value = raw.get(key)
+        return datetime.fromisoformat(value) if value else None
+
+    overall = models.Index(
+        date=parse_date("Data wykonania obliczeń indeksu"),
+        value=raw.get("Wartość indeksu"),
+    )
+    sensors: dict[str, models.Index] = {}
+    for pollutant in AQ_INDEX_POLLUTANTS:
+        sensors[pollutant] = models.Index(
+            date=parse_date(f"Data wykonania obliczeń indeksu dla wskaźnika {pollutant}"),
+            value=raw.get(f"Wartość indeksu dla wskaźnika {pollutant}"),
+        )
+
+    return models.AirQualityIndexes(
+        overall=overall,
+        sensors=sensors,
+        index_status=raw.get("Status indeksu ogólnego dla stacji pomiarowej"),
+        index_critical=raw.get("Kod zanieczyszczenia krytycznego"),
+    )
+
+
+def map_sensor(entry: dict[str, Any]) -> models.Sensor:
+    return models.Sensor(
+        id=entry["Identyfikator stanowiska"],
+        codename=entry["Wskaźnik - kod"],
+        name=entry["Wskaźnik"],
+    )
+
+
+def map_sensor_data_rows(data: Iterable[dict[str, Any]]) -> Iterator[tuple[datetime, float]]:
+    """Leniwie mapuje stronę pomiarów na krotki (data, wartość), pomijając pomiary bez wartości."""
+    for entry in data:
+        value = entry.get("Wartość")
+        if value is not None:
+            yield datetime.fromisoformat(entry["Data"]), value
+
+
+def map_sensor_series(data: Iterable[dict[str, Any]]) -> SensorSeries:
+    """Mapuje stronę pomiarów na kolumnową serię SensorSeries, pomijając pomiary bez wartości."""
+    timestamps: list[int] = []
+    values: list[float] = []
+    for entry in data:
+        value = entry.get("Wartość")
+        if value is not None:
+            timestamps.append(int(datetime.fromisoformat(entry["Data"]).timestamp()))
+            values.append(value)
+    return SensorSeries.from_arrays(timestamps, values, len(values))
@@ -47,9 +47,4 @@ class AirQualityIndexes:
 class Sensor:
     id: int
     codename: str
-    name: str
-
-@dataclass
-class SensorData:
-    date: datetime
-    value: float
\ No newline at end of file
+    name: str
\ No newline at end of file
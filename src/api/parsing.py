@@ -0,0 +1,111 @@
+"""
+Parsowanie stron danych pomiarowych w puli procesów.
+
+Mapowanie strony na pomiary (dekodowanie JSON i `datetime.fromisoformat` dla każdego wiersza)
+wykonywane w wątku pobierającym stronę jest serializowane przez GIL. Przy uzupełnianiu historii
+wielu sensorów strony mogą być parsowane w osobnych procesach: do procesu trafiają surowe bajty
+odpowiedzi, a wraca zwarta seria (tablice epoka/wartość), przekazywana z powrotem jako
+zserializowane tablice NumPy.
+"""
+
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+import src.config as config
+from src.api import decoding
+from src.series import SensorSeries
+
+
+@dataclass(frozen=True)
+class ParsedPage:
+    """
+    Sparsowana strona odpowiedzi z pomiarami.
+
+    Attributes:
+        series: pomiary strony (bez pomiarów bez wartości).
+        total_pages: liczba stron odpowiedzi (pole "totalPages").
+    """
+    series: SensorSeries
+    total_pages: int
+
+
+def parse_sensor_page(payload: bytes, target: str, backend: str = None) -> ParsedPage:
+    """
+    Parsuje surowe bajty strony pomiarów do serii SensorSeries.
+
+    Args:
+        payload: treść odpowiedzi API.
+        target: klucz listy pomiarów (np. "Lista archiwalnych wyników pomiarów").
+        backend: nazwa backendu JSON; domyślnie najszybszy zainstalowany.
+    """
+    data = decoding.get_backend(backend).loads(payload)
+    entries = data.get(target) or []
+
+    timestamps = np.empty(len(entries), dtype=np.int64)
+    values = np.empty(len(entries), dtype=np.float64)
+    count = 0
+    for entry in entries:
+        value = entry.get("Wartość")
+        if value is None:
+            continue
+        timestamps[count] = int(datetime.fromisoformat(entry["Data"]).timestamp())
+        values[count] = value
+        count += 1
+
+    series = SensorSeries(timestamps[:count], values[:count]).sorted()
+    return ParsedPage(series=series, total_pages=int(data.get("totalPages", 1)))
+
+
+class PageParserPool:
+    """
+    Pula procesów parsujących strony pomiarów.
+
+    Procesy uruchamiane są przy pierwszym zleceniu i współdzielone przez wszystkie wątki
+    korzystające z klienta API, więc równoległe uzupełnianie wielu sensorów wykorzystuje
+    wszystkie rdzenie.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = config.API_PARSING["max_workers"],
+        backend: str = config.API_DECODING["backend"],
+    ):
+        """
+        Args:
+            max_workers: liczba procesów; None oznacza liczbę rdzeni.
+            backend: nazwa backendu JSON używanego w procesach.
+        """
+        self.max_workers = max_workers
+        self.backend = backend
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, payload: bytes, target: str) -> Future:
+        """
+        Zleca sparsowanie strony.
+
+        Returns:
+            Future: Future z obiektem ParsedPage.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            executor = self._executor
+        return executor.submit(parse_sensor_page, payload, target, self.backend)
+
+    def shutdown(self) -> None:
+        """Zamyka procesy puli."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> "PageParserPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from typing import Any
+
+import src.config as config
+
+
+DEFAULT_ENDPOINT_CLASS = "default"
+ARCHIVAL_ENDPOINT_CLASS = "archival"
+
+
+class TokenBucket:
+    """
+    Kubełek żetonów dla jednej klasy endpointów.
+
+    Każdy wydany żeton wraca do kubełka dokładnie `period` po użyciu, więc w dowolnym oknie
+    o długości `period` wydanych jest co najwyżej `capacity` żetonów (zgodnie z limitem
+    "N żądań na minutę" po stronie API). Oczekujący obsługiwani są w kolejności zgłoszeń.
+    Pojemność jest korygowana w dół po zaobserwowaniu odpowiedzi o przekroczeniu limitu, ale tylko
+    tymczasowo: po każdym pełnym oknie bez kolejnego odrzucenia rośnie o jeden, aż wróci
+    do skonfigurowanej wartości.
+    """
+
+    # Minimalny odstęp [s] ponownego sprawdzenia kubełka przez oczekującą korutynę
+    _ASYNC_POLL = 0.05
+
+    def __init__(self, capacity: int, period: timedelta):
+        """
+        Args:
+            capacity: liczba żądań dozwolonych w oknie czasowym.
+            period: długość okna czasowego.
+        """
+        self.capacity = capacity
+        self.configured_capacity = capacity
+        self.period = period.total_seconds()
+        self._limited_at: float | None = None
+        self._grants: deque[float] = deque()
+        self._waiters: deque[object] = deque()
+        self._blocked_until = 0.0
+        self._cond = threading.Condition()
+
+    def _expire(self, now: float) -> None:
+        while self._grants and self._grants[0] + self.period <= now:
+            self._grants.popleft()
+        self._recover(now)
+
+    def _recover(self, now: float) -> None:
+        """Podnosi obniżoną pojemność o jeden za każde pełne okno bez odrzuconego żądania."""
+        if self._limited_at is None:
+            return
+        clean_periods = int((now - self._limited_at) // self.period)
+        if clean_periods <= 0:
+            return
+        lowered = self.capacity
+        self.capacity = min(self.configured_capacity, self.capacity + clean_periods)
+        self._limited_at += clean_periods * self.period
+        if self.capacity >= self.configured_capacity:
+            self._limited_at = None
+        logging.info(f"Rate limit raised: {lowered} -> {self.capacity} per {self.period}s")
+
+    def _next_release(self, now: float, position: int) -> float:
+        """Czas [s] do chwili, w której żeton otrzyma oczekujący na pozycji `position` (0 = pierwszy)."""
+        grants = list(self._grants)
+        free = self.capacity - len(grants)
+        release_at = now
+        for _ in range(position + 1):
+            if free > 0:
+                free -= 1
+                grants.append(release_at)
+            else:
+                release_at = max(release_at, grants.pop(0) + self.period)
+                grants.append(release_at)
+        return max(release_at, self._blocked_until) - now
+
+    def acquire(self) -> float:
+        """
+        Blokuje do chwili uzyskania żetonu.
+
+        Returns:
+            float: czas oczekiwania w sekundach.
+        """
+        ticket = object()
+        started = time.monotonic()
+        with self._cond:
+            self._waiters.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._expire(now)
+                    if self._waiters[0] is ticket:
+                        delay = self._next_release(now, 0)
+                        if delay <= 0:
+                            self._grants.append(now)
+                            return now - started
+                        self._cond.wait(delay)
+                    else:
+                        self._cond.wait()
+            finally:
+                self._waiters.remove(ticket)
+                self._cond.notify_all()
+
+    async def acquire_async(self) -> float:
+        """
+        Czeka na żeton bez blokowania pętli zdarzeń.
+
+        Żeton jest wydawany dopiero wtedy, gdy nie czeka na niego żaden wątek z `acquire`;
+        do tego czasu korutyna usypia na przewidywany czas oczekiwania.
+
+        Returns:
+            float: czas oczekiwania w sekundach.
+        """
+        started = time.monotonic()
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                self._expire(now)
+                delay = self._next_release(now, len(self._waiters))
+                if not self._waiters and delay <= 0:
+                    self._grants.append(now)
+                    return now - started
+            await asyncio.sleep(max(delay, self._ASYNC_POLL))
+
+    def expected_wait(self) -> float:
+        """Przewidywany czas oczekiwania [s] dla nowego żądania, z uwzględnieniem już oczekujących."""
+        with self._cond:
+            now = time.monotonic()
+            self._expire(now)
+            return self._next_release(now, len(self._waiters))
+
+    def report_limited(self, retry_after: float = None) -> None:
+        """
+        Uczy się rzeczywistego limitu na podstawie odpowiedzi o przekroczeniu limitu.
+
+        Liczba żądań wydanych w bieżącym oknie (bez odrzuconego) staje się tymczasową pojemnością,
+        a kolejne żetony wstrzymywane są na `retry_after` sekund lub pełne okno. Odliczanie
+        do podniesienia pojemności (`_recover`) zaczyna się od nowa.
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._expire(now)
+            accepted = len(self._grants) - 1
+            if 1 <= accepted < self.capacity:
+                logging.warning(f"Rate limit lowered: {self.capacity} -> {accepted} per {self.period}s")
+                self.capacity = accepted
+            if self.capacity < self.configured_capacity:
+                self._limited_at = now
+            self._blocked_until = now + (retry_after if retry_after is not None else self.period)
+            self._cond.notify_all()
+
+
+class RequestScheduler:
+    """
+    Harmonogram żądań API z limitami per klasa endpointów (np. dane archiwalne: 2 żądania na minutę).
+
+    Żądania do endpointów objętych limitem czekają w kolejce na żeton zamiast kończyć się błędem
+    TooManyRequests; wywołujący blokuje się (lub usypia korutynę) do chwili uzyskania żetonu.
+    `expected_wait` podaje przewidywany czas tego oczekiwania.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            limits: słownik klasa -> {"prefix", "requests", "period"}; domyślnie config.API_RATE_LIMITS.
+        """
+        if limits is None:
+            limits = config.API_RATE_LIMITS
+        self._prefixes = [(spec["prefix"], name) for name, spec in limits.items()]
+        self._buckets = {
+            name: TokenBucket(spec["requests"], spec["period"])
+            for name, spec in limits.items()
+        }
+
+    def endpoint_class(self, endpoint: str) -> str:
+        """Zwraca klasę limitu dla ścieżki endpointu."""
+        for prefix, name in self._prefixes:
+            if endpoint.startswith(prefix):
+                return name
+        return DEFAULT_ENDPOINT_CLASS
+
+    def acquire(self, endpoint: str) -> float:
+        """
+        Czeka na budżet dla endpointu; endpointy bez limitu przechodzą od razu.
+
+        Returns:
+            float: czas oczekiwania w sekundach.
+        """
+        bucket = self._buckets.get(self.endpoint_class(endpoint))
+        if bucket is None:
+            return 0.0
+        waited = bucket.acquire()
+        if waited > 0:
+            logging.info(f"Rate limited request to {endpoint} waited {waited:.1f}s")
+        return waited
+
+    async def acquire_async(self, endpoint: str) -> float:
+        """
+        Odpowiednik `acquire` dla klienta asynchronicznego: czeka na budżet we wspólnym
+        kubełku klasy endpointu, nie blokując pętli zdarzeń.
+
+        Returns:
+            float: czas oczekiwania w sekundach.
+        """
+        bucket = self._buckets.get(self.endpoint_class(endpoint))
+        if bucket is None:
+            return 0.0
+        waited = await bucket.acquire_async()
+        if waited > 0:
+            logging.info(f"Rate limited request to {endpoint} waited {waited:.1f}s")
+        return waited
+
+    def expected_wait(self, endpoint_class: str) -> float:
+        """Przewidywany czas oczekiwania [s] nowego żądania danej klasy."""
+        bucket = self._buckets.get(endpoint_class)
+        return bucket.expected_wait() if bucket is not None else 0.0
+
+    def report_limited(self, endpoint: str, retry_after: float = None) -> None:
+        """Przekazuje do kubełka informację o odpowiedzi 429 / API-ERR-100003."""
+        bucket = self._buckets.get(self.endpoint_class(endpoint))
+        if bucket is not None:
+            bucket.report_limited(retry_after)
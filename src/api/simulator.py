@@ -0,0 +1,503 @@
+"""
+Lokalny symulator API GIOŚ do testów obciążeniowych i opóźnień bez dostępu do api.gios.gov.pl.
+
+Obsługuje wszystkie endpointy używane przez src.api.client.Client, z polskimi nazwami pól
+i paginacją (`page`, `size`, `totalPages`). Dane (stacje, stanowiska, pomiary, indeksy) są
+syntetyczne i deterministyczne dla danego ziarna. Dane archiwalne podlegają limitowi zapytań
+jak w prawdziwym API (config.API_RATE_LIMITS["archival"]). Opóźnienie odpowiedzi oraz
+wstrzykiwanie błędów można konfigurować.
+
+Uruchomienie:
+    python -m src.api.simulator --port 8080 --stations 3000 --latency 0.05 --error-rate 0.01
+
+Użycie w kodzie:
+    with Simulator(port=0) as simulator:
+        client = Client(base_url=simulator.url)
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import src.config as config
+from src.api.mappers import AQ_INDEX_POLLUTANTS
+
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+QUERY_DATE_FORMAT = "%Y-%m-%d %H:%M"
+MAX_PAGE_SIZE = 500
+MAX_ARCHIVAL_SPAN = timedelta(days=366)
+LIVE_WINDOW = timedelta(days=3)
+
+VOIVODESHIPS = [
+    ("DOLNOŚLĄSKIE", "Ds"), ("KUJAWSKO-POMORSKIE", "Kp"), ("LUBELSKIE", "Lu"), ("LUBUSKIE", "Lb"),
+    ("ŁÓDZKIE", "Ld"), ("MAŁOPOLSKIE", "Mp"), ("MAZOWIECKIE", "Mz"), ("OPOLSKIE", "Op"),
+    ("PODKARPACKIE", "Pk"), ("PODLASKIE", "Pd"), ("POMORSKIE", "Pm"), ("ŚLĄSKIE", "Sl"),
+    ("ŚWIĘTOKRZYSKIE", "Sk"), ("WARMIŃSKO-MAZURSKIE", "Wm"), ("WIELKOPOLSKIE", "Wp"),
+    ("ZACHODNIOPOMORSKIE", "Zp"),
+]
+
+STATION_TYPES = ["tło miejskie", "tło podmiejskie", "komunikacyjna", "przemysłowa"]
+
+#           kod, nazwa wskaźnika, id wskaźnika, typowe stężenie [µg/m³]
+POLLUTANTS = [
+    ("PM10", "pył zawieszony PM10", 3, 30.0),
+    ("PM2.5", "pył zawieszony PM2.5", 69, 20.0),
+    ("NO2", "dwutlenek azotu", 6, 25.0),
+    ("O3", "ozon", 5, 60.0),
+    ("SO2", "dwutlenek siarki", 1, 5.0),
+    ("CO", "tlenek węgla", 8, 400.0),
+    ("C6H6", "benzen", 10, 1.5),
+]
+
+# Progi indeksu (górne granice kategorii 0..4) względem typowego stężenia
+INDEX_THRESHOLDS = [0.5, 1.0, 1.5, 2.0, 3.0]
+
+RATE_LIMIT_ERROR_CODE = "API-ERR-100003"
+
+
+@dataclass
+class SimulatorStats:
+    """
+    Liczniki symulatora.
+
+    Attributes:
+        requests: liczba obsłużonych żądań.
+        rate_limited: liczba żądań odrzuconych z powodu limitu zapytań.
+        errors: liczba wstrzykniętych błędów 500.
+        dropped: liczba połączeń zerwanych bez odpowiedzi.
+    """
+    requests: int = 0
+    rate_limited: int = 0
+    errors: int = 0
+    dropped: int = 0
+
+
+class _SimulatorError(Exception):
+    """Błąd zwracany klientowi w formacie błędów GIOŚ API."""
+
+    def __init__(self, status: int, code: str, reason: str, solution: str = None, retry_after: int = None):
+        self.status = status
+        self.retry_after = retry_after
+        self.payload = {
+            "error_code": code,
+            "error_reason": reason,
+            "error_result": None,
+            "error_solution": solution,
+        }
+
+
+class Simulator:
+    """
+    Serwer HTTP udający API GIOŚ, działający w wątku w tle.
+
+    Każdy klient (adres IP) ma osobny budżet zapytań archiwalnych liczony w oknie przesuwnym;
+    po jego przekroczeniu serwer odpowiada kodem 429 z błędem API-ERR-100003 i nagłówkiem Retry-After.
+    """
+
+    def __init__(
+        self,
+        host: str = config.API_SIMULATOR["host"],
+        port: int = config.API_SIMULATOR["port"],
+        stations: int = config.API_SIMULATOR["stations"],
+        seed: int = config.API_SIMULATOR["seed"],
+        latency: float = config.API_SIMULATOR["latency"],
+        jitter: float = config.API_SIMULATOR["jitter"],
+        error_rate: float = config.API_SIMULATOR["error_rate"],
+        drop_rate: float = config.API_SIMULATOR["drop_rate"],
+        archival_requests: int = config.API_RATE_LIMITS["archival"]["requests"],
+        archival_period: timedelta = config.API_RATE_LIMITS["archival"]["period"],
+    ):
+        """
+        Args:
+            host: adres nasłuchiwania.
+            port: port nasłuchiwania; 0 oznacza dowolny wolny port.
+            stations: liczba generowanych stacji.
+            seed: ziarno generatora danych syntetycznych i wstrzykiwanych błędów.
+            latency: opóźnienie każdej odpowiedzi [s].
+            jitter: maksymalny losowy dodatek do opóźnienia [s].
+            error_rate: prawdopodobieństwo odpowiedzi z błędem 500.
+            drop_rate: prawdopodobieństwo zerwania połączenia bez odpowiedzi.
+            archival_requests: limit zapytań archiwalnych na klienta w oknie `archival_period`.
+            archival_period: długość okna limitu zapytań archiwalnych.
+        """
+        self.seed = seed
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.archival_requests = archival_requests
+        self.archival_period = archival_period.total_seconds()
+
+        self.stats = SimulatorStats()
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._archival_log: dict[str, deque[float]] = {}
+
+        self._stations: list[dict[str, Any]] = []
+        self._meta: list[dict[str, Any]] = []
+        self._sensors: dict[int, list[dict[str, Any]]] = {}
+        self._sensor_pollutant: dict[int, tuple] = {}
+        self._generate(stations)
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.simulator = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Adres bazowy symulatora (do przekazania jako base_url klienta)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def station_ids(self) -> list[int]:
+        return [s["Identyfikator stacji"] for s in self._stations]
+
+    def sensor_ids(self) -> list[int]:
+        return list(self._sensor_pollutant)
+
+    def start(self) -> "Simulator":
+        """Uruchamia serwer w wątku w tle."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="gios-simulator", daemon=True
+        )
+        self._thread.start()
+        logging.info(f"GIOŚ API simulator listening on {self.url}")
+        return self
+
+    def serve_forever(self) -> None:
+        """Obsługuje żądania w bieżącym wątku (do przerwania Ctrl+C)."""
+        logging.info(f"GIOŚ API simulator listening on {self.url}")
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Zatrzymuje serwer i zamyka gniazdo nasłuchujące."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "Simulator":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _generate(self, count: int) -> None:
+        """Generuje stacje, ich metadane i stanowiska pomiarowe."""
+        for station_id in range(1, count + 1):
+            rnd = random.Random(self.seed * 1_000_003 + station_id)
+            voivodeship, prefix = VOIVODESHIPS[station_id % len(VOIVODESHIPS)]
+            city = f"Miasto {station_id % 700 + 1}"
+            codename = f"{prefix}Sym{station_id:05d}"
+
+            self._stations.append({
+                "Identyfikator stacji": station_id,
+                "Kod stacji": codename,
+                "Nazwa stacji": f"{city}, ul. Testowa {station_id}",
+                "WGS84 φ N": round(rnd.uniform(49.0, 54.8), 6),
+                "WGS84 λ E": round(rnd.uniform(14.1, 24.1), 6),
+                "Identyfikator miasta": station_id % 700 + 1,
+                "Nazwa miasta": city,
+                "Gmina": city,
+                "Powiat": f"powiat {station_id % 380 + 1}",
+                "Województwo": voivodeship,
+                "Ulica": f"ul. Testowa {station_id}",
+            })
+            self._meta.append({
+                "Kod stacji": codename,
+                "Kod międzynarodowy": f"PL{station_id:04d}A",
+                "Nazwa stacji": f"{city}, ul. Testowa {station_id}",
+                "Data uruchomienia": f"{rnd.randint(1990, 2020)}-01-01",
+                "Data zamknięcia": None,
+                "Rodzaj stacji": rnd.choice(STATION_TYPES),
+                "Miejscowość": city,
+                "Województwo": voivodeship,
+            })
+
+            sensors = []
+            for index in sorted(rnd.sample(range(len(POLLUTANTS)), rnd.randint(1, 6))):
+                code, name, pollutant_id, _ = POLLUTANTS[index]
+                sensor_id = station_id * 10 + index
+                self._sensor_pollutant[sensor_id] = POLLUTANTS[index]
+                sensors.append({
+                    "Identyfikator stanowiska": sensor_id,
+                    "Identyfikator stacji": station_id,
+                    "Wskaźnik": name,
+                    "Wskaźnik - wzór": code,
+                    "Wskaźnik - kod": code,
+                    "Id wskaźnika": pollutant_id,
+                })
+            self._sensors[station_id] = sensors
+
+    def _value(self, sensor_id: int, hour: datetime) -> Optional[float]:
+        """Deterministyczna wartość pomiaru sensora w danej godzinie (None dla ok. 1% godzin)."""
+        typical = self._sensor_pollutant[sensor_id][3]
+        epoch_hour = int(hour.timestamp()) // 3600
+        noise = ((sensor_id * 2654435761) ^ (epoch_hour * 40503) ^ self.seed) % 1000 / 1000
+        if noise < 0.01:
+            return None
+        daily = math.sin(2 * math.pi * (hour.hour - 6) / 24)
+        seasonal = math.cos(2 * math.pi * hour.timetuple().tm_yday / 365)
+        return round(typical * (1 + 0.3 * daily + 0.4 * seasonal + 0.8 * (noise - 0.5)), 4)
+
+    def _measurements(self, sensor_id: int, date_from: datetime, date_to: datetime) -> list[dict[str, Any]]:
+        """Pomiary godzinowe sensora z przedziału (włącznie z końcami), od najnowszego."""
+        code = self._sensor_pollutant[sensor_id][0]
+        station_codename = self._stations[sensor_id // 10 - 1]["Kod stacji"]
+        position = f"{station_codename}-{code}-1g"
+
+        hour = date_to.replace(minute=0, second=0, microsecond=0)
+        result = []
+        while hour >= date_from:
+            result.append({
+                "Kod stanowiska": position,
+                "Data": hour.strftime(DATE_FORMAT),
+                "Wartość": self._value(sensor_id, hour),
+            })
+            hour -= timedelta(hours=1)
+        return result
+
+    def _check_archival_limit(self, client: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            log = self._archival_log.setdefault(client, deque())
+            while log and now - log[0] >= self.archival_period:
+                log.popleft()
+            if len(log) >= self.archival_requests:
+                self.stats.rate_limited += 1
+                raise _SimulatorError(
+                    429,
+                    RATE_LIMIT_ERROR_CODE,
+                    "Przekroczono limit zapytań o dane archiwalne",
+                    f"Dozwolone są {self.archival_requests} zapytania na "
+                    f"{self.archival_period:.0f} s",
+                    retry_after=math.ceil(self.archival_period - (now - log[0])),
+                )
+            log.append(now)
+
+    def handle(self, client: str, path: str, query: dict[str, str]) -> dict[str, Any]:
+        """
+        Obsługuje żądanie GET i zwraca treść odpowiedzi.
+
+        Raises:
+            _SimulatorError: Dla błędnych żądań i przekroczonego limitu zapytań.
+        """
+        page = int(query.get("page", 0))
+        size = int(query.get("size", 20))
+        if size > MAX_PAGE_SIZE or size < 1 or page < 0:
+            raise _SimulatorError(400, "API-ERR-100001", "Nieprawidłowe parametry stronicowania")
+
+        if path == "/pjp-api/v1/rest/station/findAll":
+            return self._paginate("Lista stacji pomiarowych", self._stations, page, size)
+
+        if path == "/pjp-api/v1/rest/metadata/stations":
+            meta = self._meta
+            if "filter[miasto]" in query:
+                meta = [m for m in meta if m["Miejscowość"] == query["filter[miasto]"]]
+            if "filter[kod-stacji]" in query:
+                meta = [m for m in meta if m["Kod stacji"] == query["filter[kod-stacji]"]]
+            return self._paginate("Lista metadanych stacji pomiarowych", meta, page, size)
+
+        if match := re.fullmatch(r"/pjp-api/v1/rest/aqindex/getIndex/(\d+)", path):
+            return {"AqIndex": self._air_quality_index(int(match.group(1)))}
+
+        if match := re.fullmatch(r"/pjp-api/v1/rest/station/sensors/(\d+)", path):
+            sensors = self._sensors.get(int(match.group(1)), [])
+            return self._paginate("Lista stanowisk pomiarowych dla podanej stacji", sensors, page, size)
+
+        if match := re.fullmatch(r"/pjp-api/v1/rest/data/getData/(\d+)", path):
+            sensor_id = self._sensor(int(match.group(1)))
+            now = datetime.now()
+            data = self._measurements(sensor_id, now - LIVE_WINDOW, now)
+            return self._paginate("Lista danych pomiarowych", data, page, size)
+
+        if match := re.fullmatch(r"/pjp-api/v1/rest/archivalData/getDataBySensor/(\d+)", path):
+            sensor_id = self._sensor(int(match.group(1)))
+            self._check_archival_limit(client)
+            date_from, date_to = self._archival_range(query)
+            data = self._measurements(sensor_id, date_from, date_to)
+            return self._paginate("Lista archiwalnych wyników pomiarów", data, page, size)
+
+        raise _SimulatorError(404, "API-ERR-100002", f"Nieznany zasób: {path}")
+
+    def _sensor(self, sensor_id: int) -> int:
+        if sensor_id not in self._sensor_pollutant:
+            raise _SimulatorError(404, "API-ERR-100002", f"Brak stanowiska o identyfikatorze {sensor_id}")
+        return sensor_id
+
+    @staticmethod
+    def _archival_range(query: dict[str, str]) -> tuple[datetime, datetime]:
+        now = datetime.now()
+        try:
+            date_to = datetime.strptime(query["dateTo"], QUERY_DATE_FORMAT) if "dateTo" in query else now
+            if "dateFrom" in query:
+                date_from = datetime.strptime(query["dateFrom"], QUERY_DATE_FORMAT)
+            else:
+                date_from = now - timedelta(days=int(query.get("dayNumber", 1)))
+        except ValueError:
+            raise _SimulatorError(400, "API-ERR-100001", "Nieprawidłowy format daty")
+
+        if date_to - date_from > MAX_ARCHIVAL_SPAN:
+            raise _SimulatorError(
+                400, "API-ERR-100001", "Zbyt długi zakres dat",
+                f"Maksymalny zakres to {MAX_ARCHIVAL_SPAN.days} dni",
+            )
+        return date_from, min(date_to, now)
+
+    def _air_quality_index(self, station_id: int) -> dict[str, Any]:
+        if station_id not in self._sensors:
+            raise _SimulatorError(404, "API-ERR-100002", f"Brak stacji o identyfikatorze {station_id}")
+
+        hour = datetime.now().replace(minute=0, second=0, microsecond=0)
+        calculated = hour.strftime(DATE_FORMAT)
+        index: dict[str, Any] = {"Identyfikator stacji pomiarowej": station_id}
+
+        worst, critical = None, None
+        for sensor in self._sensors[station_id]:
+            code = sensor["Wskaźnik - kod"]
+            if code not in AQ_INDEX_POLLUTANTS:
+                continue
+            value = self._value(sensor["Identyfikator stanowiska"], hour)
+            category = None
+            if value is not None:
+                ratio = value / self._sensor_pollutant[sensor["Identyfikator stanowiska"]][3]
+                category = next(
+                    (i for i, limit in enumerate(INDEX_THRESHOLDS) if ratio <= limit),
+                    len(INDEX_THRESHOLDS) - 1,
+                )
+                if worst is None or category > worst:
+                    worst, critical = category, code
+            index[f"Data danych źródłowych, z których policzono wartość indeksu dla wskaźnika {code}"] = calculated
+            index[f"Data wykonania obliczeń indeksu dla wskaźnika {code}"] = calculated
+            index[f"Wartość indeksu dla wskaźnika {code}"] = category
+            index[f"Nazwa kategorii indeksu dla wskażnika {code}"] = (
+                config.AQ_INDEX_CATEGORIES[category] if category is not None else None
+            )
+
+        index["Data wykonania obliczeń indeksu"] = calculated
+        index["Wartość indeksu"] = worst
+        index["Nazwa kategorii indeksu"] = config.AQ_INDEX_CATEGORIES[worst] if worst is not None else None
+        index["Status indeksu ogólnego dla stacji pomiarowej"] = worst is not None
+        index["Kod zanieczyszczenia krytycznego"] = critical
+        return index
+
+    @staticmethod
+    def _paginate(target: str, items: list[Any], page: int, size: int) -> dict[str, Any]:
+        total_pages = max(1, math.ceil(len(items) / size))
+        return {
+            target: items[page * size:(page + 1) * size],
+            "totalPages": total_pages,
+        }
+
+    def _inject(self) -> Optional[str]:
+        """Losuje opóźnienie i ewentualny błąd; zwraca "error", "drop" lub None."""
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+        roll = self._rng.random()
+        with self._lock:
+            self.stats.requests += 1
+            if roll < self.drop_rate:
+                self.stats.dropped += 1
+                return "drop"
+            if roll < self.drop_rate + self.error_rate:
+                self.stats.errors += 1
+                return "error"
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "GIOS-Simulator/1.0"
+
+    def do_GET(self):
+        simulator: Simulator = self.server.simulator
+        fault = simulator._inject()
+        if fault == "drop":
+            self.close_connection = True
+            return
+
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        headers = {}
+        try:
+            if fault == "error":
+                raise _SimulatorError(500, "API-ERR-500000", "Wewnętrzny błąd serwera (symulowany)")
+            status, payload = 200, simulator.handle(self.client_address[0], url.path, query)
+        except _SimulatorError as e:
+            status, payload = e.status, e.payload
+            if e.retry_after is not None:
+                headers["Retry-After"] = str(e.retry_after)
+
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # Klient zrezygnował z odpowiedzi (np. po przekroczeniu limitu czasu)
+            self.close_connection = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logging.debug("simulator: " + format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokalny symulator API GIOŚ")
+    parser.add_argument("--host", default=config.API_SIMULATOR["host"])
+    parser.add_argument("--port", type=int, default=config.API_SIMULATOR["port"])
+    parser.add_argument("--stations", type=int, default=config.API_SIMULATOR["stations"])
+    parser.add_argument("--seed", type=int, default=config.API_SIMULATOR["seed"])
+    parser.add_argument("--latency", type=float, default=config.API_SIMULATOR["latency"])
+    parser.add_argument("--jitter", type=float, default=config.API_SIMULATOR["jitter"])
+    parser.add_argument("--error-rate", type=float, default=config.API_SIMULATOR["error_rate"])
+    parser.add_argument("--drop-rate", type=float, default=config.API_SIMULATOR["drop_rate"])
+    parser.add_argument("--archival-requests", type=int, default=config.API_RATE_LIMITS["archival"]["requests"])
+    parser.add_argument(
+        "--archival-period", type=float, metavar="SECONDS",
+        default=config.API_RATE_LIMITS["archival"]["period"].total_seconds(),
+    )
+    options = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    simulator = Simulator(
+        host=options.host,
+        port=options.port,
+        stations=options.stations,
+        seed=options.seed,
+        latency=options.latency,
+        jitter=options.jitter,
+        error_rate=options.error_rate,
+        drop_rate=options.drop_rate,
+        archival_requests=options.archival_requests,
+        archival_period=timedelta(seconds=options.archival_period),
+    )
+    try:
+        simulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
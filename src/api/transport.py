@@ -0,0 +1,210 @@
+import threading
+import time
+from dataclasses import dataclass, field
+
+import requests
+import urllib3.exceptions
+from requests.adapters import HTTPAdapter
+
+import src.config as config
+
+
+class BufferedResponse(requests.Response):
+    """
+    Odpowiedź, której treść została już odebrana przez Transport w ramach terminu żądania.
+
+    Nagłówki, status i pozostałe publiczne pola pochodzą z odpowiedzi strumieniowej,
+    a `content` (i oparte na nim `text`, `json()`, `iter_content()`) zwraca odebrane bajty.
+    """
+
+    def __init__(self, response: requests.Response, body: bytes):
+        super().__init__()
+        for name in ("status_code", "headers", "url", "encoding", "reason", "elapsed",
+                     "request", "history", "cookies", "connection", "raw"):
+            setattr(self, name, getattr(response, name))
+        self._body = body
+
+    @property
+    def content(self) -> bytes:
+        return self._body
+
+    def iter_content(self, chunk_size: int = 1, decode_unicode: bool = False):
+        chunk_size = chunk_size or len(self._body) or 1
+        chunks = (self._body[i:i + chunk_size] for i in range(0, len(self._body), chunk_size))
+        if decode_unicode:
+            return requests.utils.stream_decode_response_unicode(chunks, self)
+        return chunks
+
+
+@dataclass
+class TransportStats:
+    """
+    Liczniki transportu HTTP pozwalające ocenić ponowne użycie połączeń.
+
+    Attributes:
+        requests: liczba wykonanych żądań.
+        connections_opened: liczba nowo otwartych połączeń TCP(+TLS).
+    """
+    requests: int = 0
+    connections_opened: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def connections_reused(self) -> int:
+        """Liczba żądań obsłużonych na już otwartym połączeniu (keep-alive)."""
+        return max(0, self.requests - self.connections_opened)
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Udział żądań, które nie musiały otwierać nowego połączenia."""
+        return self.connections_reused / self.requests if self.requests else 0.0
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def count_connection(self) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter zliczający otwierane połączenia w pulach urllib3."""
+
+    def __init__(self, stats: TransportStats, **kwargs):
+        # init_poolmanager jest wołane z konstruktora bazowego, statystyki muszą być już ustawione
+        self._stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self._stats
+
+        # Połączenie z puli może zostać ponownie zestawione na tym samym obiekcie,
+        # dlatego liczone jest każde wywołanie connect(), a nie tworzenie obiektów
+        def counting(pool_class):
+            class CountingConnection(pool_class.ConnectionCls):
+                def connect(self):
+                    stats.count_connection()
+                    return super().connect()
+
+            class CountingPool(pool_class):
+                ConnectionCls = CountingConnection
+            return CountingPool
+
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: counting(pool_class)
+            for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+
+class Transport:
+    """
+    Transport HTTP oparty o współdzieloną sesję requests z pulą połączeń keep-alive,
+    negocjacją kompresji gzip/deflate oraz limitami czasu połączenia i odczytu.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = config.API_TRANSPORT["pool_connections"],
+        pool_maxsize: int = config.API_TRANSPORT["pool_maxsize"],
+        connect_timeout: float = config.API_TRANSPORT["connect_timeout"],
+        read_timeout: float = config.API_TRANSPORT["read_timeout"],
+        deadline: float = config.API_TRANSPORT["deadline"],
+    ):
+        """
+        Args:
+            pool_connections: liczba pul (hostów) przechowywanych w sesji.
+            pool_maxsize: maksymalna liczba połączeń utrzymywanych dla jednego hosta.
+            connect_timeout: limit czasu nawiązania połączenia [s].
+            read_timeout: limit czasu oczekiwania na dane [s].
+            deadline: maksymalny łączny czas żądania wraz z odbiorem treści [s]; None wyłącza limit.
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.deadline = deadline
+        self.stats = TransportStats()
+
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
+        adapter = _CountingAdapter(
+            self.stats,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=False,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def get(
+        self,
+        url: str,
+        headers: dict[str, str] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Wykonuje żądanie GET na połączeniu z puli.
+
+        Limity czasu połączenia i odczytu dotyczą pojedynczych operacji na gnieździe, dlatego
+        odpowiedź odbierana jest fragmentami i przerywana po przekroczeniu łącznego terminu
+        `deadline` (np. gdy serwer wysyła dane bardzo powoli). Termin liczony jest od wysłania
+        żądania: jest sprawdzany po odebraniu nagłówków i po każdym fragmencie treści. Samo
+        oczekiwanie na połączenie i nagłówki ograniczają limity gniazda, skrócone do `deadline`.
+
+        Args:
+            url: pełny adres URL.
+            headers: dodatkowe nagłówki żądania.
+            stream: czy treść odpowiedzi ma być odbierana strumieniowo (Response.iter_content());
+                termin obejmuje wtedy tylko nawiązanie połączenia i odbiór nagłówków.
+
+        Returns:
+            requests.Response: odpowiedź serwera (BufferedResponse, gdy odebrano ją w ramach terminu).
+
+        Raises:
+            requests.exceptions.Timeout: Gdy przekroczono limit czasu lub termin żądania.
+        """
+        self.stats.count_request()
+        if self.deadline is None:
+            return self._session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+
+        deadline = time.monotonic() + self.deadline
+        timeout = tuple(min(limit, self.deadline) for limit in self.timeout)
+        response = self._session.get(url, headers=headers, timeout=timeout, stream=True)
+        if time.monotonic() > deadline:
+            response.close()
+            raise requests.exceptions.Timeout(
+                f"Przekroczono termin żądania ({self.deadline:g} s) przed odbiorem treści: {url}"
+            )
+        if stream:
+            return response
+
+        chunks = []
+        try:
+            # read1 zwraca dane zaraz po ich nadejściu, więc termin jest sprawdzany także
+            # przy odpowiedziach wysyłanych po kilka bajtów
+            while chunk := response.raw.read1(config.API_DECODING["chunk_size"], decode_content=True):
+                if time.monotonic() > deadline:
+                    raise requests.exceptions.Timeout(
+                        f"Przekroczono termin żądania ({self.deadline:g} s): {url}"
+                    )
+                chunks.append(chunk)
+        except urllib3.exceptions.ReadTimeoutError as e:
+            response.close()
+            raise requests.exceptions.ConnectionError(e) from e
+        except urllib3.exceptions.ProtocolError as e:
+            response.close()
+            raise requests.exceptions.ChunkedEncodingError(e) from e
+        except urllib3.exceptions.DecodeError as e:
+            response.close()
+            raise requests.exceptions.ContentDecodingError(e) from e
+        except BaseException:
+            response.close()
+            raise
+        return BufferedResponse(response, b"".join(chunks))
+
+    def close(self) -> None:
+        """Zamyka wszystkie połączenia w puli."""
+        self._session.close()
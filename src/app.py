@@ -3,10 +3,12 @@ from PySide6.QtWidgets import QApplication, QDialog, QBoxLayout, QVBoxLayout  #
 from repository import Repository
 from gui.station_select import StationSelectWidget
 from gui.station_details import StationDetailsWidget
+from gui.maintenance import RetentionScheduler
 
 class Application(QApplication):
     station_select: StationSelectWidget
     station_details: StationDetailsWidget
+    retention_scheduler: RetentionScheduler
 
     api_connection_status_changed = Signal(bool)
 
@@ -25,6 +27,10 @@ class Application(QApplication):
         self.station_select = StationSelectWidget(self.repository)
         self.station_select.stationSelected.connect(self.open_station_details)
         self.station_select.show()
+
+        # Porządkowanie lokalnej bazy w czasie bezczynności
+        self.retention_scheduler = RetentionScheduler(self.repository, self)
+        self.retention_scheduler.start()
         return super().exec()
 
     @Slot(int)
@@ -6,6 +6,146 @@ UPDATE_INTERVALS = {
     "sensors": timedelta(days=1)
 }
 
+# Retencja pomiarów w lokalnej bazie (src.database.client.Client.apply_retention_step)
+DATABASE_RETENTION = {
+    # jak długo przechowywane są pomiary godzinowe; z wcześniejszych dób zostają tylko agregaty
+    # dobowe i miesięczne (None - bez limitu)
+    "raw_data": timedelta(days=730),
+    # maksymalna liczba pomiarów usuwanych w jednym kroku (jednej transakcji)
+    "batch_rows": 20_000,
+    # maksymalna liczba pustych stron zwalnianych z pliku bazy w jednym kroku
+    "vacuum_pages": 2048,
+    # odstęp między krokami wykonywanymi w czasie bezczynności aplikacji
+    "idle_interval": timedelta(seconds=30),
+    # po zakończeniu porządkowania kolejne sprawdzenie następuje po tym czasie
+    "recheck_interval": timedelta(hours=6),
+}
+
+# Pula połączeń z lokalną bazą SQLite (src.database.pool.ConnectionPool)
+DATABASE_POOL = {
+    # maksymalna liczba jednocześnie wydanych połączeń
+    "max_size": 8,
+    # maksymalny czas oczekiwania na wolne połączenie [s]
+    "checkout_timeout": 5.0,
+    # czas oczekiwania na blokadę bazy przed błędem "database is locked" [s]
+    "busy_timeout": 10.0,
+    # ustawienia nowych połączeń (journal_mode = WAL jest ustawiany zawsze)
+    "pragmas": {
+        # w trybie WAL NORMAL nie traci spójności bazy, a oszczędza fsync przy każdym commit
+        "synchronous": "NORMAL",
+        # odczyt pliku bazy przez mapowanie pamięci [B]
+        "mmap_size": 256 * 1024 * 1024,
+        # pamięć podręczna stron per połączenie (wartość ujemna w KiB)
+        "cache_size": -16 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+
+# Migracje schematu lokalnej bazy (src.database.migrations.MigrationRunner)
+DATABASE_MIGRATIONS = {
+    # liczba wierszy kopiowanych w jednej transakcji przy przebudowie dużych tabel
+    "batch_size": 50_000,
+}
+
+# Odczyt pomiarów do tablic NumPy (src.database.client.Client.fetch_sensors_data)
+DATABASE_READ = {
+    # liczba wierszy pobieranych z kursora jednym wywołaniem fetchmany (partia mieści się
+    # w pamięci podręcznej procesora)
+    "batch_size": 4096,
+}
+
+# Agregaty pomiarów sensorów (src.database.rollups)
+SENSOR_ROLLUPS = {
+    # maksymalna liczba punktów serii wykresu; dłuższe zakresy pokazywane są jako średnie dobowe
+    # lub miesięczne
+    "max_points": 1000,
+}
+
+# Planowanie żądań danych archiwalnych
+ARCHIVAL_PLANNER = {
+    # liczba pomiarów na stronę odpowiedzi (maksimum API)
+    "page_size": 500,
+    # maksymalny zakres czasu jednego żądania archiwalnego
+    "max_span": timedelta(days=366),
+    # dane z tego okresu udostępnia endpoint danych bieżących zamiast archiwalnego
+    "live_window": timedelta(days=3, hours=1),
+}
+
+# Zbiorcze odświeżanie indeksów jakości powietrza wszystkich stacji
+BULK_UPDATE = {
+    # maksymalna liczba równoczesnych żądań do API
+    "max_workers": 8,
+}
+
+# Ustawienia transportu HTTP klienta API (pula połączeń keep-alive, limity czasu w sekundach)
+API_TRANSPORT = {
+    "pool_connections": 4,
+    "pool_maxsize": 16,
+    "connect_timeout": 5.0,
+    "read_timeout": 30.0,
+    # maksymalny łączny czas pojedynczego żądania (połączenie + odbiór całej odpowiedzi)
+    "deadline": 60.0,
+    # maksymalna liczba jednoczesnych żądań klienta asynchronicznego
+    "async_max_concurrency": 32,
+}
+
+# Limity zapytań API per klasa endpointów (prefiks ścieżki, liczba żądań w oknie czasowym)
+API_RATE_LIMITS = {
+    "archival": {
+        "prefix": "pjp-api/v1/rest/archivalData/",
+        "requests": 2,
+        "period": timedelta(minutes=1),
+    },
+}
+
+# Bezpiecznik połączeń: po serii błędów połączenia żądania są odrzucane natychmiast
+API_CIRCUIT_BREAKER = {
+    # liczba kolejnych błędów połączenia otwierająca bezpiecznik
+    "failure_threshold": 3,
+    # czas odrzucania żądań przed próbą ponownego połączenia
+    "cooldown": timedelta(seconds=30),
+}
+
+# Trwała pamięć podręczna odpowiedzi API (rewalidowana żądaniami warunkowymi)
+API_CACHE = {
+    "path": "api_cache.db",
+    "max_bytes": 64 * 1024 * 1024,
+}
+
+API_DECODING = {
+    # backend JSON ("orjson", "json"); None oznacza najszybszy zainstalowany
+    "backend": None,
+    # rozmiar fragmentu odbieranego przy parsowaniu przyrostowym [B]
+    "chunk_size": 64 * 1024,
+}
+
+# Parsowanie stron danych archiwalnych w puli procesów (src.api.parsing.PageParserPool)
+API_PARSING = {
+    # liczba procesów; None oznacza liczbę rdzeni procesora
+    "max_workers": None,
+}
+
+API_SCHEDULER = {
+    # ile razy ponowić żądanie po odpowiedzi o przekroczeniu limitu
+    "max_retries": 3,
+}
+
+# Lokalny symulator API GIOŚ (src.api.simulator) do testów obciążeniowych bez dostępu do sieci
+API_SIMULATOR = {
+    "host": "127.0.0.1",
+    "port": 8080,
+    # liczba generowanych stacji (każda ma od 1 do 6 stanowisk pomiarowych)
+    "stations": 3000,
+    # ziarno generatora danych syntetycznych
+    "seed": 0,
+    # opóźnienie odpowiedzi [s] i jego losowy rozrzut [s]
+    "latency": 0.0,
+    "jitter": 0.0,
+    # prawdopodobieństwo odpowiedzi z błędem 500 oraz zerwania połączenia bez odpowiedzi
+    "error_rate": 0.0,
+    "drop_rate": 0.0,
+}
+
 AQ_INDEX_CATEGORIES = {
     -1: "Brak wartości",
     0: "Bardzo dobry",
@@ -1,16 +1,45 @@
-import os
+import itertools
+import json
+import logging
 import sqlite3
-from datetime import datetime
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 import src.api.models as api_models
 import src.config as config
+import src.database.migrations as migrations
+import src.database.mirror as mirror
+import src.database.rollups as rollups
+import src.database.search as search
 import src.database.views as views
+from src.database.pool import ConnectionPool, PoolStats
+from src.database.retention import RetentionReport
+from src.series import Resolution, SensorRollup, SensorSeries
 
 
 OVERALL_SENSOR_TYPE_CODENAME: str = "Ogólny"
 
+HOUR_SECONDS: int = 3600
+
+
+def _epoch(date: Optional[datetime]) -> Optional[int]:
+    """Zamienia datę na sekundy epoki Unix (format kolumn dat w bazie)."""
+    return int(date.timestamp()) if date is not None else None
+
+
+def _extend_range(
+    current: Optional[Tuple[int, int]], start: int, end: int
+) -> Tuple[int, int]:
+    """Rozszerza zakres (początek, koniec) o przedział [start, end]."""
+    if current is None:
+        return start, end
+    return min(current[0], start), max(current[1], end)
+
 
 class Client:
     """
@@ -24,36 +53,187 @@ class Client:
         """Identyfikatory typów globalnych aktualizacji."""
         STATION_LIST = 0
 
-    def __init__(self, database_filepath: str):
+    def __init__(
+        self,
+        database_filepath: str,
+        pool: ConnectionPool = None,
+        reference_mirror: mirror.ReferenceMirror = None
+    ):
         """
-        Inicjalizuje połączenie i ewentualnie wypełnia bazę.
+        Pobiera połączenie z puli, tworzy schemat nowej bazy lub migruje schemat istniejącej
+        do bieżącej wersji, a następnie wczytuje tabele referencyjne do pamięci.
 
         Args:
             database_filepath: ścieżka do pliku SQLite.
+            pool: pula połączeń współdzielona z innymi klientami tej bazy;
+                domyślnie tworzona nowa.
+            reference_mirror: kopia tabel referencyjnych współdzielona z innymi klientami
+                tej bazy; domyślnie tworzona i wczytywana nowa.
         """
-        needs_populate = not os.path.exists(database_filepath)
         self._filepath = database_filepath
-        self._conn = sqlite3.connect(database_filepath)
-        self._conn.row_factory = sqlite3.Row
+        self._pool = pool if pool is not None else ConnectionPool(database_filepath)
+        self._conn = self._pool.acquire()
         self._cursor = self._conn.cursor()
+        self._transaction_depth = 0
+        # Czasy aktualizacji stacji odłożone do końca bloku bulk_ingest() (kolumna -> id stacji)
+        self._pending_station_updates: Optional[Dict[str, set]] = None
+        # Sekcje kopii tabel referencyjnych zmienione w niezatwierdzonej transakcji
+        self._mirror_changes: set = set()
 
-        if needs_populate:
+        runner = migrations.MigrationRunner(self._conn)
+        if runner.is_empty():
             self._populate_tables()
+        elif runner.pending():
+            logging.info("Migrating database schema:\n%s", runner.run().format())
+
+        if reference_mirror is None:
+            reference_mirror = mirror.ReferenceMirror()
+            reference_mirror.load_all(self._conn)
+        self._mirror = reference_mirror
 
     def __del__(self):
-        """Zamyka kursor i połączenie przy usunięciu instancji."""
+        """Zwraca połączenie do puli przy usunięciu instancji."""
         try:
-            self._cursor.close()
-            self._conn.close()
+            self.close()
         except Exception:
             pass
 
+    def close(self) -> None:
+        """Zamyka kursor i zwraca połączenie do puli."""
+        if self._conn is None:
+            return
+        self._cursor.close()
+        self._pool.release(self._conn)
+        self._conn = None
+
     def duplicate_connection(self) -> 'Client':
-        """Zwraca nową instancję Client na tym samym pliku bazy."""
-        return Client(self._filepath)
+        """Zwraca nową instancję Client na tym samym pliku bazy, korzystającą z tej samej puli."""
+        return Client(self._filepath, self._pool, self._mirror)
+
+    @property
+    def pool_stats(self) -> PoolStats:
+        """Liczniki puli połączeń (wspólne dla wszystkich duplikatów klienta)."""
+        return self._pool.stats
+
+    @contextmanager
+    def transaction(self) -> Iterator['Client']:
+        """
+        Grupuje wywołania metod update_* w jedną transakcję zatwierdzaną przy wyjściu z bloku
+        (lub wycofywaną w razie wyjątku). Bloki mogą być zagnieżdżane; zatwierdza najbardziej
+        zewnętrzny.
+
+        Transakcja od razu zajmuje blokadę zapisu (BEGIN IMMEDIATE), więc czekanie na innych
+        piszących odbywa się na początku bloku i jest liczone w statystykach puli.
+
+        Przykład:
+            with database_client.transaction():
+                for station_id, indexes in results.items():
+                    database_client.update_station_air_quality_indexes(station_id, indexes)
+        """
+        if self._transaction_depth == 0:
+            self._begin_immediate()
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            self._rollback()
+            raise
+        self._transaction_depth -= 1
+        self._commit()
+
+    def _begin_immediate(self) -> None:
+        """Rozpoczyna transakcję zapisu, mierząc czas oczekiwania na blokadę bazy."""
+        if self._conn.in_transaction:
+            return
+        started = time.perf_counter()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError:
+            self._pool.stats.count_lock_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self._pool.stats.count_lock_wait(time.perf_counter() - started)
+
+    def _commit(self) -> None:
+        """Zatwierdza zmiany, chyba że trwa transakcja otwarta przez transaction()."""
+        if self._transaction_depth == 0:
+            self._conn.commit()
+            if self._mirror_changes:
+                self._mirror.invalidate(self._mirror_changes)
+                self._mirror_changes = set()
+
+    def _rollback(self) -> None:
+        """Wycofuje zmiany, chyba że trwa transakcja otwarta przez transaction()."""
+        if self._transaction_depth == 0:
+            self._conn.rollback()
+            self._mirror_changes = set()
+
+    def _mirrored(self, section: mirror.Section):
+        """
+        Zwraca sekcję kopii tabel referencyjnych. Sekcja zmieniona w trwającej transakcji
+        wczytywana jest z bazy (z niezatwierdzonymi zmianami) bez zapisywania w kopii.
+        """
+        if section in self._mirror_changes:
+            return mirror.load(section, self._conn)
+        return self._mirror.get(section, self._conn)
+
+    @contextmanager
+    def bulk_ingest(self) -> Iterator['Client']:
+        """
+        Zbiorczy zapis wielu aktualizacji: wywołania metod update_* w bloku trafiają do jednej
+        transakcji (jak w transaction()), a czasy aktualizacji odświeżonych stacji zapisywane są
+        raz, przy zamknięciu bloku, jednym poleceniem na rodzaj aktualizacji.
+
+        Przykład:
+            with database_client.bulk_ingest():
+                for station_id, indexes in results.items():
+                    database_client.update_station_air_quality_indexes(station_id, indexes)
+        """
+        outermost = self._pending_station_updates is None
+        if outermost:
+            self._pending_station_updates = {}
+        try:
+            with self.transaction():
+                yield self
+                if outermost:
+                    for column, station_ids in self._pending_station_updates.items():
+                        self._write_station_updates(column, station_ids)
+        finally:
+            if outermost:
+                self._pending_station_updates = None
+
+    def _mark_stations_updated(self, column: str, station_ids: Iterable) -> None:
+        """
+        Zapisuje bieżący czas w kolumnie station_update podanych stacji; w bloku bulk_ingest()
+        zapis odkładany jest do zamknięcia bloku.
+
+        Args:
+            column: kolumna czasu aktualizacji (np. "last_indexes_update_at").
+            station_ids: identyfikatory stacji.
+        """
+        if self._pending_station_updates is not None:
+            self._pending_station_updates.setdefault(column, set()).update(station_ids)
+            return
+        self._write_station_updates(column, station_ids)
+
+    def _write_station_updates(self, column: str, station_ids: Iterable) -> None:
+        """Zapisuje czas aktualizacji wielu stacji jednym poleceniem."""
+        if column != "last_indexes_update_at":
+            self._mirror_changes.add(mirror.Section.UPDATES)
+        self._cursor.execute(f"""
+            INSERT INTO station_update (station_id, {column})
+            SELECT DISTINCT value, unixepoch('now') FROM json_each(?) WHERE true
+            ON CONFLICT(station_id) DO UPDATE
+              SET {column} = EXCLUDED.{column}
+        """, (json.dumps(list(station_ids)),))
 
     def _populate_tables(self) -> None:
-        """Tworzy wszystkie tabele, triggery i dane początkowe."""
+        """Tworzy wszystkie tabele, indeksy i dane początkowe."""
+        # Zwolnione strony oddawane są przez PRAGMA incremental_vacuum (polityka retencji);
+        # po włączeniu trybu WAL zmiana wymaga przebudowy (pustego) pliku
+        self._cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self._cursor.execute("VACUUM")
+
         # global_update
         self._cursor.execute("""
             CREATE TABLE IF NOT EXISTS global_update (
@@ -97,41 +277,23 @@ class Client:
                     ON UPDATE CASCADE
             )
         """)
-        # triggery dla station
-        for evt in ("INSERT", "UPDATE"):
-            self._cursor.execute(f"""
-                CREATE TRIGGER IF NOT EXISTS tgr_on_{evt.lower()}_station
-                AFTER {evt} ON station
-                BEGIN
-                    UPDATE global_update
-                    SET last_update_at = unixepoch('now')
-                    WHERE id = {self.GlobalUpdateIds.STATION_LIST.value};
-                END
-            """)
-
-        # station_meta + triggery
+
+        # station_meta
         self._cursor.execute("""
             CREATE TABLE IF NOT EXISTS station_meta (
                 station_id INTEGER NOT NULL,
                 international_codename TEXT NOT NULL,
-                launch_date TEXT,
-                shutdown_date TEXT,
+                launch_date INTEGER,
+                shutdown_date INTEGER,
                 type TEXT,
                 FOREIGN KEY(station_id) REFERENCES station(id)
                     ON UPDATE CASCADE
             )
         """)
-        for evt in ("INSERT", "UPDATE"):
-            self._cursor.execute(f"""
-                CREATE TRIGGER IF NOT EXISTS tgr_on_{evt.lower()}_station_meta
-                AFTER {evt} ON station_meta
-                FOR EACH ROW
-                BEGIN
-                    INSERT OR REPLACE INTO station_update
-                    (station_id, last_meta_update_at)
-                    VALUES (NEW.station_id, unixepoch('now'));
-                END
-            """)
+        self._cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_station_meta_station_id
+            ON station_meta(station_id)
+        """)
 
         # kategorie indeksów
         self._cursor.execute("""
@@ -157,13 +319,13 @@ class Client:
             ((t,) for t in config.AQ_TYPES)
         )
 
-        # aq_index + triggery
+        # aq_index
         self._cursor.execute("""
             CREATE TABLE IF NOT EXISTS aq_index (
                 station_id INTEGER,
                 sensor_type_id INTEGER,
                 value INTEGER,
-                record_date TEXT,
+                record_date INTEGER,
                 PRIMARY KEY(station_id, sensor_type_id),
                 FOREIGN KEY(station_id) REFERENCES station(id)
                     ON UPDATE CASCADE,
@@ -171,23 +333,8 @@ class Client:
                 FOREIGN KEY(value) REFERENCES aq_index_category_name(value)
             )
         """)
-        for evt in ("INSERT", "UPDATE"):
-            self._cursor.execute(f"""
-                CREATE TRIGGER IF NOT EXISTS tgr_on_{evt.lower()}_aq_index
-                AFTER {evt} ON aq_index
-                FOR EACH ROW
-                BEGIN
-                    INSERT INTO station_update
-                      (station_id, last_indexes_update_at)
-                    VALUES
-                      (NEW.station_id, unixepoch('now'))
-                    ON CONFLICT(station_id) DO UPDATE
-                      SET last_indexes_update_at =
-                        EXCLUDED.last_indexes_update_at;
-                END
-            """)
-
-        # sensor + triggery
+
+        # sensor
         self._cursor.execute("""
             CREATE TABLE IF NOT EXISTS sensor (
                 id INTEGER PRIMARY KEY,
@@ -198,32 +345,35 @@ class Client:
                 FOREIGN KEY(sensor_type_id) REFERENCES sensor_type(id)
             )
         """)
-        for evt in ("INSERT", "UPDATE"):
-            self._cursor.execute(f"""
-                CREATE TRIGGER IF NOT EXISTS tgr_on_{evt.lower()}_sensor
-                AFTER {evt} ON sensor
-                FOR EACH ROW
-                BEGIN
-                    INSERT INTO station_update
-                      (station_id, last_sensors_update_at)
-                    VALUES
-                      (NEW.station_id, unixepoch('now'))
-                    ON CONFLICT(station_id) DO UPDATE
-                      SET last_sensors_update_at =
-                        EXCLUDED.last_sensors_update_at;
-                END
-            """)
-
-        # sensor_data
+
+        # sensor_data (daty jako sekundy epoki Unix, wiersze ułożone wg klucza)
         self._cursor.execute("""
             CREATE TABLE IF NOT EXISTS sensor_data (
                 sensor_id INTEGER NOT NULL,
-                date TEXT NOT NULL,
+                date INTEGER NOT NULL,
                 value REAL NOT NULL,
                 PRIMARY KEY(sensor_id, date),
                 FOREIGN KEY(sensor_id) REFERENCES sensor(id)
-            )
+            ) WITHOUT ROWID
+        """)
+        # sensor_coverage: przedziały godzin (włącznie z końcami) pobrane z API dla sensora
+        self._cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sensor_coverage (
+                sensor_id INTEGER NOT NULL,
+                date_from INTEGER NOT NULL,
+                date_to INTEGER NOT NULL,
+                PRIMARY KEY(sensor_id, date_from),
+                FOREIGN KEY(sensor_id) REFERENCES sensor(id)
+            ) WITHOUT ROWID
         """)
+        # agregaty dobowe i miesięczne sensor_data
+        for resolution in rollups.TABLES:
+            self._cursor.execute(rollups.create_table_sql(resolution))
+        # granica pomiarów usuniętych przez politykę retencji
+        self._cursor.execute(migrations.SENSOR_RETENTION_TABLE_SQL)
+        # indeks pełnotekstowy stacji
+        self._cursor.execute(search.create_table_sql())
+        self._cursor.execute(f"PRAGMA user_version = {migrations.SCHEMA_VERSION}")
         self._conn.commit()
 
     def update_stations(self, stations: Iterable[api_models.Station]) -> None:
@@ -255,40 +405,74 @@ class Client:
         ]
         self._cursor.executemany(
             """
-            INSERT OR REPLACE INTO station
+            INSERT INTO station
               (id, codename, name, city_id, address, latitude, longitude)
             SELECT
               :id, :codename, :name, city.id, :address, :latitude, :longitude
             FROM city WHERE city.city = :city
+            ON CONFLICT(id) DO UPDATE
+              SET codename = EXCLUDED.codename,
+                  name = EXCLUDED.name,
+                  city_id = EXCLUDED.city_id,
+                  address = EXCLUDED.address,
+                  latitude = EXCLUDED.latitude,
+                  longitude = EXCLUDED.longitude
+              WHERE station.codename IS NOT EXCLUDED.codename
+                 OR station.name IS NOT EXCLUDED.name
+                 OR station.city_id IS NOT EXCLUDED.city_id
+                 OR station.address IS NOT EXCLUDED.address
+                 OR station.latitude IS NOT EXCLUDED.latitude
+                 OR station.longitude IS NOT EXCLUDED.longitude
             """,
             station_params
         )
-        self._conn.commit()
+        # indeks wyszukiwania zapisanych stacji
+        ids = json.dumps([s["id"] for s in station_params])
+        self._cursor.execute(
+            f"DELETE FROM {search.TABLE} WHERE rowid IN (SELECT value FROM json_each(?))", (ids,)
+        )
+        self._cursor.execute(search.index_sql("s.id IN (SELECT value FROM json_each(?))"), (ids,))
+        self._cursor.execute(
+            "UPDATE global_update SET last_update_at = unixepoch('now') WHERE id = ?",
+            (self.GlobalUpdateIds.STATION_LIST.value,)
+        )
+        self._mirror_changes.update((mirror.Section.STATIONS, mirror.Section.UPDATES))
+        self._commit()
 
     def get_last_stations_update(self) -> datetime:
         """Zwraca czas ostatniej aktualizacji listy stacji."""
-        row = self._cursor.execute(
-            "SELECT last_update_at FROM global_update WHERE id = ?",
-            (self.GlobalUpdateIds.STATION_LIST.value,)
-        ).fetchone()
-        return datetime.fromtimestamp(row["last_update_at"])
+        updates: mirror.UpdateTimes = self._mirrored(mirror.Section.UPDATES)
+        return updates.global_updates[self.GlobalUpdateIds.STATION_LIST.value]
 
     def get_station_list_view(self) -> List[views.StationListView]:
-        """Zwraca listę stacji (id, nazwa, współrzędne, miasto)."""
-        rows = self._cursor.execute("""
-            SELECT s.id, s.name, s.latitude, s.longitude, c.city
-            FROM station AS s
-            JOIN city AS c ON c.id = s.city_id
-        """).fetchall()
-        return [
-            views.StationListView(
-                id=r["id"],
-                name=r["name"],
-                latitude=r["latitude"],
-                longitude=r["longitude"],
-                city=r["city"]
-            ) for r in rows
-        ]
+        """Zwraca listę stacji (id, nazwa, współrzędne, miasto) z kopii w pamięci."""
+        stations: mirror.Stations = self._mirrored(mirror.Section.STATIONS)
+        return list(stations.list_views)
+
+    def search_stations(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """
+        Wyszukuje stacje w indeksie pełnotekstowym (nazwa, miasto, powiat, województwo, adres,
+        kod stacji) jednym zapytaniem. Słowa zapytania dopasowywane są jako prefiksy,
+        bez rozróżniania wielkości liter i znaków diakrytycznych.
+
+        Args:
+            query: tekst wpisany przez użytkownika.
+            limit: maksymalna liczba wyników; domyślnie wszystkie.
+
+        Returns:
+            List[int]: identyfikatory stacji od najlepiej dopasowanej.
+        """
+        expression = search.match_expression(query)
+        if expression is None:
+            return []
+        weights = ", ".join(str(w) for w in search.COLUMNS.values())
+        rows = self._cursor.execute(f"""
+            SELECT rowid FROM {search.TABLE}
+            WHERE {search.TABLE} MATCH :match
+            ORDER BY bm25({search.TABLE}, {weights}), rowid
+            LIMIT :limit
+        """, {"match": expression, "limit": -1 if limit is None else limit}).fetchall()
+        return [r["rowid"] for r in rows]
 
     def update_station_meta(self, meta: List[api_models.StationMeta]) -> None:
         """
@@ -301,21 +485,31 @@ class Client:
             {
                 "station_id": m.codename,
                 "international": m.international_codename,
-                "launch_date": m.launch_date.isoformat(),
-                "shutdown_date": m.close_date.isoformat(),
+                "launch_date": _epoch(m.launch_date),
+                "shutdown_date": _epoch(m.close_date),
                 "type": m.type
             } for m in meta
         )
         self._cursor.executemany(
             """
-            INSERT OR REPLACE INTO station_meta
+            INSERT INTO station_meta
               (station_id, international_codename, launch_date, shutdown_date, type)
             VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(station_id) DO UPDATE
+              SET international_codename = EXCLUDED.international_codename,
+                  launch_date = EXCLUDED.launch_date,
+                  shutdown_date = EXCLUDED.shutdown_date,
+                  type = EXCLUDED.type
+              WHERE station_meta.international_codename IS NOT EXCLUDED.international_codename
+                 OR station_meta.launch_date IS NOT EXCLUDED.launch_date
+                 OR station_meta.shutdown_date IS NOT EXCLUDED.shutdown_date
+                 OR station_meta.type IS NOT EXCLUDED.type
             """,
             [(p["station_id"], p["international"], p["launch_date"],
               p["shutdown_date"], p["type"]) for p in params]
         )
-        self._conn.commit()
+        self._mark_stations_updated("last_meta_update_at", (m.codename for m in meta))
+        self._commit()
 
     def fetch_last_station_meta_update(self, station_id: int) -> datetime:
         """
@@ -324,37 +518,20 @@ class Client:
         Args:
             station_id: id stacji.
         """
-        row = self._cursor.execute(
-            "SELECT last_meta_update_at FROM station_update WHERE station_id = ?",
-            (station_id,)
-        ).fetchone()
-        return datetime.fromtimestamp(row["last_meta_update_at"])
+        updates: mirror.UpdateTimes = self._mirrored(mirror.Section.UPDATES)
+        return updates.meta.get(station_id, datetime.fromtimestamp(0))
 
     def fetch_station_detail_view(
         self, station_id: int
     ) -> views.StationDetailsView:
         """
-        Zwraca szczegóły wybranej stacji.
+        Zwraca szczegóły wybranej stacji z kopii w pamięci.
 
         Args:
             station_id: id stacji.
         """
-        r = self._cursor.execute("""
-            SELECT s.codename, s.name, c.district, c.voivodeship,
-                   c.city, s.address
-            FROM station AS s
-            JOIN city AS c ON s.city_id = c.id
-            WHERE s.id = ?
-        """, (station_id,)).fetchone()
-        return views.StationDetailsView(
-            id=station_id,
-            codename=r["codename"],
-            name=r["name"],
-            district=r["district"],
-            voivodeship=r["voivodeship"],
-            city=r["city"],
-            address=r["address"]
-        )
+        stations: mirror.Stations = self._mirrored(mirror.Section.STATIONS)
+        return stations.details[station_id]
 
     def update_sensor_types(self, types: List[str]) -> None:
         """
@@ -368,7 +545,7 @@ class Client:
             "INSERT OR IGNORE INTO sensor_type (codename) VALUES (?)",
             params
         )
-        self._conn.commit()
+        self._commit()
 
     def update_station_air_quality_indexes(
         self, station_id: int, indexes: api_models.AirQualityIndexes
@@ -387,8 +564,7 @@ class Client:
                 "station_id": station_id,
                 "codename": key,
                 "value": idx.value,
-                "date": (idx.date.isoformat()
-                         if idx.date else None)
+                "date": _epoch(idx.date)
             } for key, idx in all_idxs
         )
         self._cursor.executemany(
@@ -405,10 +581,13 @@ class Client:
             ON CONFLICT(station_id, sensor_type_id) DO UPDATE
               SET value = EXCLUDED.value,
                   record_date = EXCLUDED.record_date
+              WHERE aq_index.value IS NOT EXCLUDED.value
+                 OR aq_index.record_date IS NOT EXCLUDED.record_date
             """,
             params
         )
-        self._conn.commit()
+        self._mark_stations_updated("last_indexes_update_at", (station_id,))
+        self._commit()
 
     def fetch_last_station_air_quality_indexes_update(
         self, station_id: int
@@ -427,6 +606,10 @@ class Client:
         return (datetime.fromtimestamp(row["last_indexes_update_at"])
                 if row else datetime.fromtimestamp(0))
 
+    def get_air_quality_index_categories(self) -> Dict[int, str]:
+        """Zwraca nazwy kategorii indeksu jakości powietrza według wartości (kopia w pamięci)."""
+        return dict(self._mirrored(mirror.Section.CATEGORIES))
+
     def fetch_station_air_quality_index_value(
         self, station_id: int, type_codename: str
     ) -> Optional[int]:
@@ -447,6 +630,51 @@ class Client:
         """, {"sid": station_id, "cod": type_codename}).fetchone()
         return row["value"] if row else None
 
+    def fetch_station_air_quality_index_values(
+        self,
+        station_ids: Iterable[int],
+        type_codename: str,
+        max_age: timedelta
+    ) -> views.AQIndexValuesView:
+        """
+        Zwraca wartości indeksu danego typu dla wielu stacji wraz z czasem ich ostatniej
+        aktualizacji, jednym zapytaniem korzystającym z kluczy aq_index i station_update.
+
+        Args:
+            station_ids: identyfikatory stacji.
+            type_codename: kod sensora.
+            max_age: dopuszczalny wiek indeksów; starsze (lub nigdy niepobrane) są oznaczane
+                jako nieaktualne.
+        """
+        # Lista id przekazywana jest jako tablica JSON, więc nie dotyczy jej limit parametrów SQLite
+        rows = self._cursor.execute("""
+            WITH ids(station_id) AS (
+                SELECT DISTINCT value FROM json_each(:ids)
+            )
+            SELECT ids.station_id,
+                   aq.value,
+                   COALESCE(su.last_indexes_update_at, 0) AS updated_at,
+                   COALESCE(su.last_indexes_update_at, 0) <= unixepoch('now') - :max_age AS stale
+            FROM ids
+            LEFT JOIN station_update AS su
+              ON su.station_id = ids.station_id
+            LEFT JOIN aq_index AS aq
+              ON aq.station_id = ids.station_id
+             AND aq.sensor_type_id = (SELECT id FROM sensor_type WHERE codename = :cod)
+        """, {
+            "ids": json.dumps(list(station_ids)),
+            "cod": type_codename,
+            "max_age": int(max_age.total_seconds())
+        }).fetchall()
+        return views.AQIndexValuesView(stations=[
+            views.StationAQIndexValueView(
+                station_id=r["station_id"],
+                value=r["value"],
+                updated_at=datetime.fromtimestamp(r["updated_at"]),
+                stale=bool(r["stale"])
+            ) for r in rows
+        ])
+
     def update_station_sensors(
         self, station_id: int, sensors: List[api_models.Sensor]
     ) -> None:
@@ -478,7 +706,9 @@ class Client:
             """,
             params
         )
-        self._conn.commit()
+        self._mirror_changes.add(mirror.Section.SENSORS)
+        self._mark_stations_updated("last_sensors_update_at", (station_id,))
+        self._commit()
 
     def fetch_last_station_sensors_update(
         self, station_id: int
@@ -489,55 +719,134 @@ class Client:
         Args:
             station_id: id stacji.
         """
-        row = self._cursor.execute(
-            "SELECT last_sensors_update_at FROM station_update "
-            "WHERE station_id = ?",
-            (station_id,)
-        ).fetchone()
-        return (datetime.fromtimestamp(row["last_sensors_update_at"])
-                if row else datetime.fromtimestamp(0))
+        updates: mirror.UpdateTimes = self._mirrored(mirror.Section.UPDATES)
+        return updates.sensors.get(station_id, datetime.fromtimestamp(0))
 
     def fetch_station_sensors(
         self, station_id: int
     ) -> List[views.SensorView]:
         """
-        Zwraca listę sensorów z kodami.
+        Zwraca listę sensorów z kodami z kopii w pamięci.
 
         Args:
             station_id: id stacji.
         """
-        rows = self._cursor.execute("""
-            SELECT s.id, st.codename
-            FROM sensor AS s
-            JOIN sensor_type AS st ON s.sensor_type_id = st.id
-            WHERE s.station_id = ?
-        """, (station_id,)).fetchall()
-        return [
-            views.SensorView(id=r["id"], codename=r["codename"])
-            for r in rows
-        ]
+        sensors: Dict[int, Tuple[views.SensorView, ...]] = self._mirrored(mirror.Section.SENSORS)
+        return list(sensors.get(station_id, ()))
 
     def update_sensor_data(
-        self, sensor_id: int, data: List[api_models.SensorData]
+        self,
+        sensor_id: int,
+        data: SensorSeries,
+        coverage: Tuple[datetime, datetime] = None
     ) -> None:
         """
         Wstawia lub aktualizuje pomiary z sensora.
 
         Args:
             sensor_id: id sensora.
-            data: lista obiektów SensorData.
+            data: seria pomiarów.
+            coverage: przedział godzin (włącznie z końcami), dla którego pobrano pomiary.
         """
-        params = [
-            (sensor_id, entry.date.isoformat(), entry.value)
-            for entry in data
-        ]
-        self._cursor.executemany("""
-            INSERT INTO sensor_data (sensor_id, date, value)
-            VALUES (?, ?, ?)
-            ON CONFLICT(sensor_id, date) DO UPDATE
-              SET value = EXCLUDED.value
-        """, params)
-        self._conn.commit()
+        self.update_sensor_series_pages(sensor_id, [data], coverage)
+
+    def update_sensor_data_pages(
+        self,
+        sensor_id: int,
+        pages: Iterable[Iterable[Tuple[datetime, float]]],
+        coverage: Tuple[datetime, datetime] = None
+    ) -> int:
+        """
+        Strumieniowo wstawia lub aktualizuje pomiary z sensora, strona po stronie.
+        W pamięci przechowywana jest najwyżej jedna strona.
+
+        Każda strona zapisywana jest w osobnej krótkiej transakcji, więc blokada zapisu
+        nie jest trzymana w trakcie pobierania kolejnych stron z API.
+
+        Args:
+            sensor_id: id sensora.
+            pages: iterable stron, każda będąca iterable krotek (data, wartość).
+            coverage: przedział godzin (włącznie z końcami), którego dotyczą strony;
+                dodawany do pokrycia sensora dopiero po zapisaniu wszystkich stron.
+
+        Returns:
+            int: liczba zapisanych pomiarów (nowych lub o zmienionej wartości; pomiary
+                identyczne z zapisanymi są pomijane).
+        """
+        written = 0
+        for page in pages:
+            rows = [(sensor_id, int(date.timestamp()), value) for date, value in page]
+            if rows:
+                written += self._write_sensor_page(
+                    sensor_id, rows, min(r[1] for r in rows), max(r[1] for r in rows)
+                )
+        if coverage is not None:
+            with self.transaction():
+                self._add_sensor_coverage(sensor_id, *coverage)
+        return written
+
+    def update_sensor_series_pages(
+        self,
+        sensor_id: int,
+        pages: Iterable[SensorSeries],
+        coverage: Tuple[datetime, datetime] = None
+    ) -> int:
+        """
+        Strumieniowo wstawia lub aktualizuje pomiary z sensora podane jako serie
+        (np. strony sparsowane w puli procesów), każdą serię w osobnej krótkiej transakcji.
+
+        Znaczniki czasu zapisywane są wprost, bez tworzenia obiektów datetime.
+
+        Args:
+            sensor_id: id sensora.
+            pages: iterable serii pomiarów.
+            coverage: przedział godzin (włącznie z końcami), którego dotyczą serie;
+                dodawany do pokrycia sensora dopiero po zapisaniu wszystkich serii.
+
+        Returns:
+            int: liczba zapisanych pomiarów (nowych lub o zmienionej wartości; pomiary
+                identyczne z zapisanymi są pomijane).
+        """
+        written = 0
+        for series in pages:
+            if len(series):
+                written += self._write_sensor_page(
+                    sensor_id,
+                    zip(itertools.repeat(sensor_id), series.timestamps.tolist(), series.values.tolist()),
+                    int(series.timestamps[0]),
+                    int(series.timestamps[-1])
+                )
+        if coverage is not None:
+            with self.transaction():
+                self._add_sensor_coverage(sensor_id, *coverage)
+        return written
+
+    def _write_sensor_page(
+        self,
+        sensor_id: int,
+        rows: Iterable[Tuple[int, int, float]],
+        date_from: int,
+        date_to: int
+    ) -> int:
+        """
+        Zapisuje stronę pomiarów (sensor_id, data, wartość) z zakresu [date_from, date_to]
+        i przelicza jej agregaty w jednej transakcji.
+
+        Returns:
+            int: liczba nowych lub zmienionych pomiarów.
+        """
+        with self.transaction():
+            self._cursor.executemany("""
+                INSERT INTO sensor_data (sensor_id, date, value)
+                VALUES (?, ?, ?)
+                ON CONFLICT(sensor_id, date) DO UPDATE
+                  SET value = EXCLUDED.value
+                  WHERE sensor_data.value IS NOT EXCLUDED.value
+            """, rows)
+            changed = max(self._cursor.rowcount, 0)
+            if changed:
+                self._refresh_sensor_rollups(sensor_id, date_from, date_to)
+        return changed
 
     def fetch_latest_sensor_record_date(
         self, sensor_id: int
@@ -552,8 +861,8 @@ class Client:
             SELECT MAX(date) AS dt FROM sensor_data
             WHERE sensor_id = ?
         """, (sensor_id,)).fetchone()
-        return (datetime.fromisoformat(row["dt"])
-                if row and row["dt"] else None)
+        return (datetime.fromtimestamp(row["dt"])
+                if row and row["dt"] is not None else None)
 
     def fetch_oldest_sensor_record_date(
         self, sensor_id: int
@@ -568,37 +877,351 @@ class Client:
             SELECT MIN(date) AS dt FROM sensor_data
             WHERE sensor_id = ?
         """, (sensor_id,)).fetchone()
-        return (datetime.fromisoformat(row["dt"])
-                if row and row["dt"] else None)
+        return (datetime.fromtimestamp(row["dt"])
+                if row and row["dt"] is not None else None)
 
-    def fetch_sensor_data(
+    def _refresh_sensor_rollups(self, sensor_id: int, date_from: int, date_to: int) -> None:
+        """
+        Przelicza agregaty dobowe i miesięczne sensora dla przedziałów zawierających daty
+        z zakresu [date_from, date_to] (sekundy epoki). Koszt zależy od liczby pomiarów
+        w zmienionych dobach, a nie w całej tabeli.
+
+        Doby, z których polityka retencji usunęła pomiary, nie są przeliczane (ich agregaty
+        pochodzą z pełnych danych).
+        """
+        raw_from = self._fetch_sensor_raw_from(sensor_id)
+        if raw_from is not None:
+            date_from = max(date_from, raw_from)
+            if date_from > date_to:
+                return
+        params = {"sid": sensor_id, "dfrom": date_from, "dto": date_to}
+        day_range = (
+            f"sensor_id = :sid"
+            f" AND date >= {rollups.bucket_sql(':dfrom', Resolution.DAY)}"
+            f" AND date < {rollups.bucket_sql(':dto', Resolution.DAY, next_bucket=True)}"
+        )
+        self._cursor.execute(
+            f"INSERT OR REPLACE INTO {rollups.TABLES[Resolution.DAY]} "
+            + rollups.aggregate_sql(Resolution.DAY, day_range),
+            params
+        )
+        month_range = (
+            f"sensor_id = :sid"
+            f" AND bucket >= {rollups.bucket_sql(':dfrom', Resolution.MONTH)}"
+            f" AND bucket < {rollups.bucket_sql(':dto', Resolution.MONTH, next_bucket=True)}"
+        )
+        self._cursor.execute(
+            f"INSERT OR REPLACE INTO {rollups.TABLES[Resolution.MONTH]} "
+            + rollups.monthly_from_daily_sql(month_range),
+            params
+        )
+
+    def _add_sensor_coverage(
+        self, sensor_id: int, date_from: datetime, date_to: datetime
+    ) -> None:
+        """Dodaje przedział do pokrycia sensora, scalając go z nakładającymi się i sąsiednimi."""
+        params = {
+            "sid": sensor_id,
+            "dfrom": _epoch(date_from),
+            "dto": _epoch(date_to),
+            "hour": HOUR_SECONDS
+        }
+        overlapping = """
+            WHERE sensor_id = :sid
+              AND date_from <= :dto + :hour
+              AND date_to >= :dfrom - :hour
+        """
+        row = self._cursor.execute(
+            "SELECT MIN(date_from) AS dfrom, MAX(date_to) AS dto FROM sensor_coverage" + overlapping,
+            params
+        ).fetchone()
+        self._cursor.execute("DELETE FROM sensor_coverage" + overlapping, params)
+        self._cursor.execute(
+            "INSERT INTO sensor_coverage (sensor_id, date_from, date_to) VALUES (?, ?, ?)",
+            (
+                sensor_id,
+                min(params["dfrom"], row["dfrom"] if row["dfrom"] is not None else params["dfrom"]),
+                max(params["dto"], row["dto"] if row["dto"] is not None else params["dto"])
+            )
+        )
+
+    def fetch_sensor_coverage(
         self,
         sensor_id: int,
         date_from: datetime,
-        date_to: datetime = datetime.now()
-    ) -> List[views.SensorValueView]:
+        date_to: datetime
+    ) -> List[Tuple[datetime, datetime]]:
         """
-        Zwraca pomiary sensora z zakresu dat.
+        Zwraca przedziały godzin (włącznie z końcami) pobrane już z API dla sensora,
+        nakładające się na podany zakres. Godziny pobrane, dla których API nie zwróciło
+        wartości, również należą do pokrycia.
 
         Args:
             sensor_id: id sensora.
             date_from: początek zakresu.
-            date_to: koniec zakresu (domyślnie teraz).
+            date_to: koniec zakresu.
         """
         rows = self._cursor.execute("""
-            SELECT date, value FROM sensor_data
+            SELECT date_from, date_to FROM sensor_coverage
             WHERE sensor_id = :sid
-              AND date >= :dfrom
-              AND date <= :dto
+              AND date_to >= :dfrom
+              AND date_from <= :dto
+            ORDER BY date_from
         """, {
             "sid": sensor_id,
-            "dfrom": date_from.isoformat(),
-            "dto": date_to.isoformat()
+            "dfrom": _epoch(date_from),
+            "dto": _epoch(date_to)
         }).fetchall()
         return [
-            views.SensorValueView(
-                date=datetime.fromisoformat(r["date"]),
-                value=r["value"]
-            ) for r in rows
+            (datetime.fromtimestamp(r["date_from"]), datetime.fromtimestamp(r["date_to"]))
+            for r in rows
         ]
 
+    def fetch_sensor_data(
+        self,
+        sensor_id: int,
+        date_from: datetime,
+        date_to: datetime = datetime.now()
+    ) -> SensorSeries:
+        """
+        Zwraca pomiary sensora z zakresu dat jako serię posortowaną po czasie.
+
+        Daty przechowywane są jako sekundy epoki Unix, więc odczyt nie tworzy
+        obiektów datetime dla pojedynczych pomiarów.
+
+        Args:
+            sensor_id: id sensora.
+            date_from: początek zakresu.
+            date_to: koniec zakresu (domyślnie teraz).
+        """
+        return self.fetch_sensors_data([sensor_id], date_from, date_to)[sensor_id]
+
+    def fetch_sensors_data(
+        self,
+        sensor_ids: Iterable[int],
+        date_from: datetime,
+        date_to: datetime,
+        batch_size: int = config.DATABASE_READ["batch_size"]
+    ) -> Dict[int, SensorSeries]:
+        """
+        Zwraca pomiary wielu sensorów z zakresu dat, po jednej serii na sensor.
+
+        Wiersze czytane są zwykłym kursorem (krotki zamiast sqlite3.Row) partiami fetchmany
+        i kopiowane do wspólnych tablic NumPy, bez tworzenia obiektów datetime ani listy
+        wszystkich wierszy. Tablice alokowane są z góry na podstawie liczby pomiarów
+        z agregatów dobowych (O(liczba dób)). Zapytania wykonywane są w jednej transakcji
+        odczytu, więc pochodzą z tego samego stanu bazy. Serie sensorów są widokami wspólnych tablic.
+
+        Args:
+            sensor_ids: identyfikatory sensorów.
+            date_from: początek zakresu.
+            date_to: koniec zakresu.
+            batch_size: liczba wierszy pobieranych jednym fetchmany.
+
+        Returns:
+            Dict[int, SensorSeries]: serie posortowane po czasie dla każdego z podanych sensorów
+                (puste, gdy brak pomiarów).
+        """
+        sensor_ids = list(dict.fromkeys(sensor_ids))
+        dfrom, dto = _epoch(date_from), _epoch(date_to)
+
+        cursor = self._conn.cursor()
+        cursor.row_factory = None
+        cursor.arraysize = max(1, batch_size)
+        snapshot = not self._conn.in_transaction
+        if snapshot:
+            cursor.execute("BEGIN")
+        try:
+            # Doby nachodzące na zakres zawierają co najmniej tyle pomiarów, ile sam zakres
+            capacity = cursor.execute(f"""
+                SELECT COALESCE(SUM(count), 0)
+                FROM {rollups.TABLES[Resolution.DAY]}
+                WHERE sensor_id IN (SELECT value FROM json_each(:ids))
+                  AND bucket >= {rollups.bucket_sql(":dfrom", Resolution.DAY)}
+                  AND bucket <= :dto
+            """, {"ids": json.dumps(sensor_ids), "dfrom": dfrom, "dto": dto}).fetchone()[0]
+            timestamps = np.empty(capacity, dtype=np.int64)
+            values = np.empty(capacity, dtype=np.float64)
+
+            bounds: Dict[int, Tuple[int, int]] = {}
+            filled = 0
+            for sensor_id in sensor_ids:
+                start = filled
+                cursor.execute("""
+                    SELECT date, value
+                    FROM sensor_data
+                    WHERE sensor_id = :sid
+                      AND date >= :dfrom
+                      AND date <= :dto
+                      AND value IS NOT NULL
+                    ORDER BY date
+                """, {"sid": sensor_id, "dfrom": dfrom, "dto": dto})
+                while rows := cursor.fetchmany():
+                    if filled + len(rows) > len(timestamps):
+                        # Agregaty nie obejmują wszystkich pomiarów (np. baza zmieniana poza klientem)
+                        grow = max(len(rows), len(timestamps))
+                        timestamps = np.concatenate([timestamps, np.empty(grow, dtype=np.int64)])
+                        values = np.concatenate([values, np.empty(grow, dtype=np.float64)])
+                    # Partia spłaszczana jest do jednej tablicy (data, wartość) bez pośrednich
+                    # list; daty mieszczą się dokładnie w float64
+                    batch = np.fromiter(
+                        itertools.chain.from_iterable(rows), dtype=np.float64, count=2 * len(rows)
+                    ).reshape(-1, 2)
+                    timestamps[filled:filled + len(rows)] = batch[:, 0]
+                    values[filled:filled + len(rows)] = batch[:, 1]
+                    filled += len(rows)
+                bounds[sensor_id] = (start, filled)
+        finally:
+            if snapshot:
+                self._conn.commit()
+            cursor.close()
+
+        return {
+            sensor_id: SensorSeries(timestamps[start:end], values[start:end])
+            for sensor_id, (start, end) in bounds.items()
+        }
+
+    def fetch_sensor_rollup(
+        self,
+        sensor_id: int,
+        date_from: datetime,
+        date_to: datetime,
+        max_points: int = config.SENSOR_ROLLUPS["max_points"]
+    ) -> SensorRollup:
+        """
+        Zwraca serię agregatów pomiarów sensora w najdokładniejszej rozdzielczości
+        (godzinowej, dobowej lub miesięcznej) mieszczącej się w budżecie punktów.
+
+        Pełne przedziały odczytywane są z tabel agregatów, a niepełne przedziały na krańcach
+        zakresu liczone z pomiarów, więc statystyki serii dotyczą dokładnie podanego zakresu.
+        Wyjątkiem są okresy, z których polityka retencji usunęła pomiary godzinowe: seria ma
+        wtedy co najmniej rozdzielczość dobową, a przedziały na krańcach odczytywane są w całości
+        z agregatów.
+
+        Args:
+            sensor_id: id sensora.
+            date_from: początek zakresu.
+            date_to: koniec zakresu.
+            max_points: maksymalna liczba punktów serii.
+        """
+        raw_from = self._fetch_sensor_raw_from(sensor_id)
+        resolution = Resolution.for_budget(date_from, date_to, max_points)
+        if resolution is Resolution.HOUR:
+            if raw_from is None or _epoch(date_from) >= raw_from:
+                return SensorRollup.from_series(self.fetch_sensor_data(sensor_id, date_from, date_to))
+            resolution = Resolution.DAY
+
+        def pruned(bucket: datetime) -> bool:
+            return raw_from is not None and _epoch(bucket) < raw_from
+
+        # Przedziały z tabel agregatów: [inner_from, inner_to)
+        inner_from = rollups.bucket_start(date_from, resolution)
+        if inner_from < date_from and not pruned(inner_from):
+            inner_from = rollups.next_bucket_start(date_from, resolution)
+        inner_to = rollups.bucket_start(date_to + timedelta(seconds=1), resolution)
+        if inner_to <= date_to and pruned(inner_to):
+            inner_to = rollups.next_bucket_start(date_to, resolution)
+
+        cursor = self._conn.cursor()
+        cursor.row_factory = None
+        edge = rollups.aggregate_sql(resolution, "sensor_id = :sid AND date >= :dfrom AND date <= :dto")
+        if inner_from >= inner_to:
+            rows = cursor.execute(
+                edge, {"sid": sensor_id, "dfrom": _epoch(date_from), "dto": _epoch(date_to)}
+            ).fetchall()
+        else:
+            rows = cursor.execute(f"""
+                SELECT sensor_id, bucket, count, sum, min, max, min_date, max_date
+                FROM {rollups.TABLES[resolution]}
+                WHERE sensor_id = :sid AND bucket >= :dfrom AND bucket < :dto
+            """, {"sid": sensor_id, "dfrom": _epoch(inner_from), "dto": _epoch(inner_to)}).fetchall()
+            rows += cursor.execute(edge, {
+                "sid": sensor_id, "dfrom": _epoch(date_from), "dto": _epoch(inner_from) - 1
+            }).fetchall()
+            rows += cursor.execute(edge, {
+                "sid": sensor_id, "dfrom": _epoch(inner_to), "dto": _epoch(date_to)
+            }).fetchall()
+        return SensorRollup.from_rows(resolution, [r[1:] for r in rows])
+
+    def _fetch_sensor_raw_from(self, sensor_id: int) -> Optional[int]:
+        """Zwraca granicę (sekundy epoki), przed którą usunięto pomiary godzinowe sensora."""
+        row = self._cursor.execute(
+            "SELECT raw_from FROM sensor_retention WHERE sensor_id = ?", (sensor_id,)
+        ).fetchone()
+        return row["raw_from"] if row else None
+
+    def apply_retention_step(
+        self,
+        keep_raw: timedelta,
+        batch_rows: int = config.DATABASE_RETENTION["batch_rows"],
+        vacuum_pages: int = config.DATABASE_RETENTION["vacuum_pages"],
+    ) -> RetentionReport:
+        """
+        Wykonuje jeden krok polityki retencji: w jednej transakcji usuwa najwyżej `batch_rows`
+        pomiarów godzinowych z dób starszych niż `keep_raw`, a następnie zwalnia najwyżej
+        `vacuum_pages` pustych stron pliku bazy (PRAGMA incremental_vacuum).
+
+        Agregaty dobowe i miesięczne usuniętych pomiarów pozostają w bazie. Plik bazy zmniejsza
+        się przy najbliższym checkpoincie WAL.
+
+        Args:
+            keep_raw: jak długo przechowywać pomiary godzinowe.
+            batch_rows: maksymalna liczba pomiarów usuwanych w kroku.
+            vacuum_pages: maksymalna liczba stron zwalnianych w kroku.
+
+        Returns:
+            RetentionReport: raport kroku; finished oznacza, że kolejne kroki nie są potrzebne.
+        """
+        started = time.perf_counter()
+        report = RetentionReport(steps=1)
+        cutoff = _epoch(rollups.bucket_start(datetime.now() - keep_raw, Resolution.DAY))
+
+        with self.transaction():
+            sensor_ids = [r["id"] for r in self._cursor.execute("""
+                SELECT s.id
+                FROM sensor AS s
+                LEFT JOIN sensor_retention AS r ON r.sensor_id = s.id
+                WHERE COALESCE(r.raw_from, 0) < ?
+                ORDER BY s.id
+            """, (cutoff,)).fetchall()]
+            budget = max(1, batch_rows)
+            for position, sensor_id in enumerate(sensor_ids):
+                if budget == 0:
+                    break
+                # Usuwanie po kluczu (sensor_id, date) od najstarszych pomiarów sensora
+                deleted = max(self._cursor.execute("""
+                    DELETE FROM sensor_data
+                    WHERE sensor_id = :sid AND date IN (
+                        SELECT date FROM sensor_data
+                        WHERE sensor_id = :sid AND date < :cutoff
+                        ORDER BY date
+                        LIMIT :limit
+                    )
+                """, {"sid": sensor_id, "cutoff": cutoff, "limit": budget}).rowcount, 0)
+                report.rows_deleted += deleted
+                if deleted == budget:
+                    break
+                budget -= deleted
+                self._cursor.execute("""
+                    INSERT INTO sensor_retention (sensor_id, raw_from) VALUES (?, ?)
+                    ON CONFLICT(sensor_id) DO UPDATE
+                      SET raw_from = MAX(raw_from, EXCLUDED.raw_from)
+                """, (sensor_id, cutoff))
+                report.sensors_pruned += 1
+            # Sensory, które zostały do usunięcia (ostatni mógł zostać przerwany limitem)
+            remaining = len(sensor_ids) - report.sensors_pruned
+
+        page_size = self._cursor.execute("PRAGMA page_size").fetchone()[0]
+        free_before = free_after = self._cursor.execute("PRAGMA freelist_count").fetchone()[0]
+        # executescript() zatwierdziłby zewnętrzną transakcję; strony zwolni kolejny krok
+        if self._transaction_depth == 0:
+            # Każdy krok polecenia zwalnia jedną stronę; execute() wykonuje tylko pierwszy krok
+            # polecenia bez kolumn wyniku, a executescript() wykonuje je do końca
+            self._conn.executescript(f"PRAGMA incremental_vacuum({max(1, int(vacuum_pages))})")
+            free_after = self._cursor.execute("PRAGMA freelist_count").fetchone()[0]
+
+        report.pages_freed = max(free_before - free_after, 0)
+        report.bytes_reclaimed = report.pages_freed * page_size
+        report.finished = remaining == 0 and free_after == 0
+        report.duration = time.perf_counter() - started
+        return report
@@ -0,0 +1,663 @@
+"""
+Wersjonowane migracje schematu lokalnej bazy SQLite.
+
+Wersja schematu pliku przechowywana jest w PRAGMA user_version. Przy otwarciu bazy
+MigrationRunner wykonuje po kolei wszystkie kroki o wersji wyższej niż zapisana. Każdy krok
+składa się z:
+  - opcjonalnej fazy przygotowania (`prepare`), w której duże tabele kopiowane są partiami
+    do tabel pomocniczych, a każda partia zatwierdzana jest osobno - blokada zapisu bazy jest
+    zwalniana między partiami, więc inne połączenia nie czekają do końca migracji,
+  - fazy właściwej (`apply`), wykonywanej w jednej transakcji razem z podbiciem user_version:
+    błąd wycofuje cały krok, a baza zostaje w poprzedniej wersji.
+
+Uruchomienie (raport bez zmiany pliku bazy):
+    python -m src.database.migrations database.db --dry-run
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import src.config as config
+import src.database.rollups as rollups
+import src.database.search as search
+from src.series import Resolution
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    Krok migracji schematu.
+
+    Attributes:
+        version: wersja schematu po wykonaniu kroku.
+        description: krótki opis zmiany.
+        apply: zmiany wykonywane w jednej transakcji.
+        prepare: przygotowanie wykonywane przed transakcją (np. kopiowanie partiami);
+            musi dać się bezpiecznie powtórzyć po przerwaniu.
+        vacuum: czy po migracji odzyskać miejsce w pliku bazy (VACUUM).
+    """
+    version: int
+    description: str
+    apply: Callable[["MigrationContext"], None]
+    prepare: Optional[Callable[["MigrationContext"], None]] = None
+    vacuum: bool = False
+
+
+@dataclass
+class MigrationStepReport:
+    """
+    Wynik wykonania kroku migracji.
+
+    Attributes:
+        version: wersja schematu po kroku.
+        description: opis kroku.
+        duration: czas wykonania kroku [s].
+        rows_copied: liczba wierszy skopiowanych przez copy_in_batches().
+        batches: liczba zatwierdzonych partii kopiowania.
+    """
+    version: int
+    description: str
+    duration: float = 0.0
+    rows_copied: int = 0
+    batches: int = 0
+
+
+@dataclass
+class MigrationReport:
+    """
+    Raport z uruchomienia migracji.
+
+    Attributes:
+        from_version: wersja schematu przed migracją.
+        to_version: wersja schematu po migracji.
+        dry_run: czy migracja została wykonana na kopii bazy.
+        steps: raporty wykonanych kroków.
+        vacuum_time: czas odzyskiwania miejsca po migracji [s].
+    """
+    from_version: int
+    to_version: int
+    dry_run: bool = False
+    steps: List[MigrationStepReport] = field(default_factory=list)
+    vacuum_time: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        """Łączny czas migracji [s]."""
+        return sum(s.duration for s in self.steps) + self.vacuum_time
+
+    def format(self) -> str:
+        """Zwraca raport w formie tekstowej tabeli."""
+        lines = [
+            f"Schema version {self.from_version} -> {self.to_version}"
+            + (" (dry run)" if self.dry_run else "")
+        ]
+        for s in self.steps:
+            lines.append(
+                f"  v{s.version:<3} {s.description:<50} {s.duration:8.2f} s"
+                f"  {s.rows_copied:>10} rows in {s.batches} batches"
+            )
+        if self.vacuum_time:
+            lines.append(f"  {'VACUUM':<55} {self.vacuum_time:8.2f} s")
+        lines.append(f"  {'total':<55} {self.duration:8.2f} s")
+        return "\n".join(lines)
+
+
+class MigrationContext:
+    """Połączenie i narzędzia udostępniane krokom migracji."""
+
+    def __init__(self, conn: sqlite3.Connection, report: MigrationStepReport, batch_size: int):
+        self.conn = conn
+        self.report = report
+        self.batch_size = batch_size
+        # Ostatni skopiowany klucz dla każdej pary (źródło, cel), aby apply() kopiowało
+        # tylko wiersze dopisane po fazie prepare()
+        self._copied_until: dict[Tuple[str, str], tuple] = {}
+
+    def execute(self, sql: str, params: Sequence = ()) -> sqlite3.Cursor:
+        return self.conn.execute(sql, params)
+
+    def copy_in_batches(
+        self,
+        source: str,
+        target: str,
+        columns: Sequence[str],
+        expressions: Sequence[str],
+        key: Sequence[str],
+        where: str = "1",
+    ) -> int:
+        """
+        Kopiuje wiersze tabeli `source` do `target` partiami po `batch_size` wierszy,
+        w kolejności klucza `key` (paginacja po kluczu, bez OFFSET na całej tabeli).
+
+        Poza transakcją każda partia zatwierdzana jest osobno. Wewnątrz transakcji (faza apply)
+        kopiowane są tylko wiersze o kluczu większym niż ostatni skopiowany w fazie prepare.
+
+        Args:
+            source: tabela źródłowa.
+            target: tabela docelowa.
+            columns: kolumny tabeli docelowej.
+            expressions: wyrażenia SQL wyliczające kolejne kolumny z wiersza źródłowego.
+            key: kolumny unikalnego klucza tabeli źródłowej (najlepiej indeksowanego).
+            where: dodatkowy warunek SQL na wiersze źródłowe.
+
+        Returns:
+            int: liczba wstawionych wierszy.
+        """
+        key_sql = ", ".join(key)
+        key_tuple = f"({key_sql})"
+        placeholders = f"({', '.join('?' * len(key))})"
+        state_key = (source, target)
+        lower: Optional[tuple] = self._copied_until.get(state_key)
+        batched = not self.conn.in_transaction
+        copied = 0
+
+        while True:
+            lower_sql = f"{key_tuple} > {placeholders}" if lower else "1"
+            lower_params = tuple(lower or ())
+
+            # Ostatni klucz partii; brak oznacza, że pozostałe wiersze mieszczą się w jednej partii
+            bound = None
+            if batched:
+                bound = self.conn.execute(
+                    f"SELECT {key_sql} FROM {source} WHERE ({where}) AND {lower_sql} "
+                    f"ORDER BY {key_sql} LIMIT 1 OFFSET ?",
+                    (*lower_params, self.batch_size - 1)
+                ).fetchone()
+            range_sql, params = lower_sql, lower_params
+            if bound is not None:
+                range_sql += f" AND {key_tuple} <= {placeholders}"
+                params += tuple(bound)
+
+            if batched:
+                self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                copied += max(self.conn.execute(
+                    f"INSERT OR IGNORE INTO {target} ({', '.join(columns)}) "
+                    f"SELECT {', '.join(expressions)} FROM {source} "
+                    f"WHERE ({where}) AND {range_sql} ORDER BY {key_sql}",
+                    params
+                ).rowcount, 0)
+                if bound is None:
+                    bound = self.conn.execute(
+                        f"SELECT {key_sql} FROM {source} WHERE ({where}) AND {lower_sql} "
+                        f"ORDER BY {key_sql} DESC LIMIT 1",
+                        lower_params
+                    ).fetchone()
+                    last_batch = True
+                else:
+                    last_batch = False
+            except BaseException:
+                if batched:
+                    self.conn.rollback()
+                raise
+            if batched:
+                self.conn.commit()
+            self.report.batches += 1
+
+            if bound is not None:
+                lower = tuple(bound)
+            if last_batch:
+                break
+            if self.report.batches % 20 == 0:
+                logging.info("Migration copied %d rows from %s to %s", copied, source, target)
+
+        if lower is not None:
+            self._copied_until[state_key] = lower
+        self.report.rows_copied += copied
+        return copied
+
+    def write_in_batches(self, source: str, group: str, step: Callable[[str, tuple], int]) -> int:
+        """
+        Wykonuje zapis `step` dla kolejnych zakresów wartości kolumny `group` tabeli `source`,
+        obejmujących po około `batch_size` wierszy (wiersze jednej wartości nie są dzielone między
+        partie). Każda partia zatwierdzana jest osobno, jak w copy_in_batches().
+
+        Args:
+            source: tabela źródłowa.
+            group: kolumna grupująca, pierwsza kolumna klucza tabeli (np. sensor_id).
+            step: funkcja (warunek SQL, parametry) -> liczba zapisanych wierszy, wykonująca zapis
+                dla wierszy źródłowych spełniających warunek.
+
+        Returns:
+            int: liczba zapisanych wierszy.
+        """
+        lower = None
+        written = 0
+        while True:
+            lower_sql = f"{group} > ?" if lower is not None else "1"
+            lower_params = (lower,) if lower is not None else ()
+            row = self.conn.execute(
+                f"SELECT {group} FROM {source} WHERE {lower_sql} ORDER BY {group} LIMIT 1 OFFSET ?",
+                (*lower_params, self.batch_size - 1)
+            ).fetchone()
+            if row is None:
+                row = self.conn.execute(
+                    f"SELECT MAX({group}) FROM {source} WHERE {lower_sql}", lower_params
+                ).fetchone()
+            bound = row[0]
+            if bound is None:
+                break
+
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                written += step(f"{lower_sql} AND {group} <= ?", (*lower_params, bound))
+            except BaseException:
+                self.conn.rollback()
+                raise
+            self.conn.commit()
+            self.report.batches += 1
+            lower = bound
+            if self.report.batches % 20 == 0:
+                logging.info("Migration wrote %d rows from %s", written, source)
+
+        self.report.rows_copied += written
+        return written
+
+    def _changes_table(self, source: str) -> str:
+        return f"{source}_changes_v{self.report.version}"
+
+    def track_changes(self, source: str, columns: Sequence[str]) -> None:
+        """
+        Zaczyna zapisywać kolumny `columns` wierszy dodanych, zmienionych i usuniętych w `source`
+        (triggery i tabela pomocnicza), aby faza apply przeliczyła tylko zmiany wprowadzone
+        przez inne połączenia po rozpoczęciu fazy prepare. Wywołanie przed odczytem
+        pierwszej partii; bezpieczne do powtórzenia.
+        """
+        log = self._changes_table(source)
+        names = ", ".join(columns)
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS {log} ({names})")
+        for event, rows in (("insert", ("NEW",)), ("update", ("OLD", "NEW")), ("delete", ("OLD",))):
+            body = " ".join(
+                f"INSERT INTO {log} ({names}) VALUES ({', '.join(f'{row}.{c}' for c in columns)});"
+                for row in rows
+            )
+            self.conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {log}_{event} AFTER {event.upper()} ON {source} "
+                f"BEGIN {body} END"
+            )
+
+    def tracked_changes(self, source: str, select: str) -> List[sqlite3.Row]:
+        """
+        Zwraca wynik `select` (np. "DISTINCT sensor_id") na wierszach zapisanych przez
+        track_changes() i kończy ich zapisywanie. Wywołanie w fazie apply.
+        """
+        log = self._changes_table(source)
+        if self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (log,)
+        ).fetchone() is None:
+            return []
+        rows = self.conn.execute(f"SELECT {select} FROM {log}").fetchall()
+        for event in ("insert", "update", "delete"):
+            self.conn.execute(f"DROP TRIGGER IF EXISTS {log}_{event}")
+        self.conn.execute(f"DROP TABLE {log}")
+        return rows
+
+
+# Granica pomiarów godzinowych usuniętych przez politykę retencji (sekundy epoki)
+SENSOR_RETENTION_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS sensor_retention (
+        sensor_id INTEGER PRIMARY KEY,
+        raw_from INTEGER NOT NULL,
+        FOREIGN KEY(sensor_id) REFERENCES sensor(id)
+    ) WITHOUT ROWID
+"""
+
+
+def _epoch_dates_prepare(ctx: MigrationContext) -> None:
+    ctx.execute("DROP TABLE IF EXISTS sensor_data_migrated")
+    ctx.execute("""
+        CREATE TABLE sensor_data_migrated (
+            sensor_id INTEGER NOT NULL,
+            date INTEGER NOT NULL,
+            value REAL NOT NULL,
+            PRIMARY KEY(sensor_id, date),
+            FOREIGN KEY(sensor_id) REFERENCES sensor(id)
+        ) WITHOUT ROWID
+    """)
+    _copy_epoch_sensor_data(ctx)
+
+
+def _copy_epoch_sensor_data(ctx: MigrationContext) -> None:
+    # Kopiowanie w kolejności klucza głównego wstawia wiersze w kolejności klucza nowej tabeli.
+    # Daty tekstowe to czas lokalny; czasy nieistniejące (przestawienie zegara) pokrywają się
+    # z następną godziną i zostaje jeden z wierszy.
+    ctx.copy_in_batches(
+        source="sensor_data",
+        target="sensor_data_migrated",
+        columns=("sensor_id", "date", "value"),
+        expressions=("sensor_id", "unixepoch(date, 'utc')", "value"),
+        key=("sensor_id", "date"),
+        where="unixepoch(date, 'utc') IS NOT NULL",
+    )
+
+
+def _epoch_dates_apply(ctx: MigrationContext) -> None:
+    # Wiersze dopisane po fazie przygotowania
+    _copy_epoch_sensor_data(ctx)
+    ctx.execute("DROP TABLE sensor_data")
+    ctx.execute("ALTER TABLE sensor_data_migrated RENAME TO sensor_data")
+
+    # ADD/DROP/RENAME COLUMN zachowuje triggery tabel (przebudowa tabeli by je usunęła)
+    for table, column in (("aq_index", "record_date"),
+                          ("station_meta", "launch_date"),
+                          ("station_meta", "shutdown_date")):
+        ctx.execute(f"ALTER TABLE {table} ADD COLUMN {column}_epoch INTEGER")
+        ctx.execute(f"UPDATE {table} SET {column}_epoch = unixepoch({column}, 'utc')")
+        ctx.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+        ctx.execute(f"ALTER TABLE {table} RENAME COLUMN {column}_epoch TO {column}")
+
+
+SENSOR_COVERAGE_STAGING = "sensor_coverage_migrated"
+
+
+def _insert_sensor_coverage(ctx: MigrationContext, where: str, params: tuple) -> int:
+    # Początkowe pokrycie to ciągłe przedziały godzin z pomiarami w bazie; w każdym z nich
+    # różnica daty i numeru kolejnej godziny jest stała
+    return max(ctx.execute(f"""
+        INSERT INTO {SENSOR_COVERAGE_STAGING} (sensor_id, date_from, date_to)
+        SELECT sensor_id, MIN(date), MAX(date)
+        FROM (
+            SELECT sensor_id, date,
+                   date - 3600 * ROW_NUMBER() OVER (PARTITION BY sensor_id ORDER BY date) AS island
+            FROM sensor_data
+            WHERE {where}
+        )
+        GROUP BY sensor_id, island
+    """, params).rowcount, 0)
+
+
+def _sensor_coverage_prepare(ctx: MigrationContext) -> None:
+    ctx.track_changes("sensor_data", ("sensor_id",))
+    ctx.execute(f"DROP TABLE IF EXISTS {SENSOR_COVERAGE_STAGING}")
+    ctx.execute(f"""
+        CREATE TABLE {SENSOR_COVERAGE_STAGING} (
+            sensor_id INTEGER NOT NULL,
+            date_from INTEGER NOT NULL,
+            date_to INTEGER NOT NULL,
+            PRIMARY KEY(sensor_id, date_from),
+            FOREIGN KEY(sensor_id) REFERENCES sensor(id)
+        ) WITHOUT ROWID
+    """)
+    # Przedziały wyznaczane są partiami sensorów, każda w osobnej transakcji
+    ctx.write_in_batches(
+        "sensor_data", "sensor_id",
+        lambda where, params: _insert_sensor_coverage(ctx, where, params)
+    )
+
+
+def _sensor_coverage_apply(ctx: MigrationContext) -> None:
+    # Pokrycie sensorów, których pomiary zmieniły się po fazie przygotowania, liczone jest od nowa
+    for row in ctx.tracked_changes("sensor_data", "DISTINCT sensor_id"):
+        ctx.execute(f"DELETE FROM {SENSOR_COVERAGE_STAGING} WHERE sensor_id = ?", (row[0],))
+        _insert_sensor_coverage(ctx, "sensor_id = ?", (row[0],))
+    ctx.execute(f"ALTER TABLE {SENSOR_COVERAGE_STAGING} RENAME TO sensor_coverage")
+
+
+# Tabele agregatów budowane w fazie przygotowania
+SENSOR_ROLLUP_STAGING = {resolution: f"{table}_migrated" for resolution, table in rollups.TABLES.items()}
+
+
+def _insert_sensor_rollups(ctx: MigrationContext, where: str, params: tuple) -> int:
+    day, month = SENSOR_ROLLUP_STAGING[Resolution.DAY], SENSOR_ROLLUP_STAGING[Resolution.MONTH]
+    written = ctx.execute(
+        f"INSERT OR REPLACE INTO {day} " + rollups.aggregate_sql(Resolution.DAY, where), params
+    ).rowcount
+    ctx.execute(
+        f"INSERT OR REPLACE INTO {month} " + rollups.monthly_from_daily_sql(where, source=day), params
+    )
+    return max(written, 0)
+
+
+def _sensor_rollups_prepare(ctx: MigrationContext) -> None:
+    ctx.track_changes("sensor_data", ("sensor_id", "date"))
+    for resolution, table in SENSOR_ROLLUP_STAGING.items():
+        ctx.execute(f"DROP TABLE IF EXISTS {table}")
+        ctx.execute(rollups.create_table_sql(resolution, table))
+    # Agregaty liczone są partiami sensorów, każda w osobnej transakcji
+    ctx.write_in_batches(
+        "sensor_data", "sensor_id",
+        lambda where, params: _insert_sensor_rollups(ctx, where, params)
+    )
+
+
+def _sensor_rollups_apply(ctx: MigrationContext) -> None:
+    # Przeliczane są tylko doby (i ich miesiące) z pomiarami zmienionymi po fazie przygotowania
+    day, month = SENSOR_ROLLUP_STAGING[Resolution.DAY], SENSOR_ROLLUP_STAGING[Resolution.MONTH]
+    changed = ctx.tracked_changes(
+        "sensor_data",
+        f"DISTINCT sensor_id, {rollups.bucket_sql('date', Resolution.DAY)}, "
+        f"{rollups.bucket_sql('date', Resolution.MONTH)}"
+    )
+    for sensor_id, day_bucket, _ in changed:
+        ctx.execute(f"DELETE FROM {day} WHERE sensor_id = ? AND bucket = ?", (sensor_id, day_bucket))
+        ctx.execute(
+            f"INSERT INTO {day} " + rollups.aggregate_sql(
+                Resolution.DAY,
+                f"sensor_id = ? AND date >= ? AND date < {rollups.bucket_sql('?', Resolution.DAY, next_bucket=True)}"
+            ),
+            (sensor_id, day_bucket, day_bucket)
+        )
+    for sensor_id, month_bucket in {(r[0], r[2]) for r in changed}:
+        ctx.execute(f"DELETE FROM {month} WHERE sensor_id = ? AND bucket = ?", (sensor_id, month_bucket))
+        ctx.execute(
+            f"INSERT INTO {month} " + rollups.monthly_from_daily_sql(
+                f"sensor_id = ? AND bucket >= ? AND bucket < {rollups.bucket_sql('?', Resolution.MONTH, next_bucket=True)}",
+                source=day
+            ),
+            (sensor_id, month_bucket, month_bucket)
+        )
+    for resolution, table in SENSOR_ROLLUP_STAGING.items():
+        ctx.execute(f"ALTER TABLE {table} RENAME TO {rollups.TABLES[resolution]}")
+
+
+def _statement_bookkeeping_apply(ctx: MigrationContext) -> None:
+    # Czasy aktualizacji zapisuje klient, raz na wywołanie update_* lub blok bulk_ingest()
+    for table in ("station", "station_meta", "aq_index", "sensor"):
+        for evt in ("insert", "update"):
+            ctx.execute(f"DROP TRIGGER IF EXISTS tgr_on_{evt}_{table}")
+    # INSERT OR REPLACE bez klucza dopisywał kolejne kopie metadanych; zostaje najnowsza
+    ctx.execute("""
+        DELETE FROM station_meta
+        WHERE rowid NOT IN (SELECT MAX(rowid) FROM station_meta GROUP BY station_id)
+    """)
+    ctx.execute("CREATE UNIQUE INDEX idx_station_meta_station_id ON station_meta(station_id)")
+
+
+def _retention_apply(ctx: MigrationContext) -> None:
+    ctx.execute(SENSOR_RETENTION_TABLE_SQL)
+    # Zmiana trybu wymaga przebudowy pliku (VACUUM po migracji)
+    ctx.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+
+def _station_search_apply(ctx: MigrationContext) -> None:
+    ctx.execute(search.create_table_sql())
+    ctx.execute(search.index_sql("1"))
+
+
+# Kroki migracji w kolejności wersji. Wersja 0 to schemat z datami zapisanymi jako tekst ISO.
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        description="integer epoch dates, sensor_data WITHOUT ROWID",
+        prepare=_epoch_dates_prepare,
+        apply=_epoch_dates_apply,
+        vacuum=True,
+    ),
+    Migration(
+        version=2,
+        description="sensor_coverage table of fetched intervals",
+        prepare=_sensor_coverage_prepare,
+        apply=_sensor_coverage_apply,
+    ),
+    Migration(
+        version=3,
+        description="daily and monthly sensor_data rollups",
+        prepare=_sensor_rollups_prepare,
+        apply=_sensor_rollups_apply,
+    ),
+    Migration(
+        version=4,
+        description="statement-level station_update bookkeeping, unique station_meta",
+        apply=_statement_bookkeeping_apply,
+    ),
+    Migration(
+        version=5,
+        description="sensor_retention table, incremental auto_vacuum",
+        apply=_retention_apply,
+        vacuum=True,
+    ),
+    Migration(
+        version=6,
+        description="station_search FTS5 index",
+        apply=_station_search_apply,
+    ),
+]
+
+# Wersja schematu tworzonego dla nowej bazy (Client._populate_tables)
+SCHEMA_VERSION: int = MIGRATIONS[-1].version
+
+
+class MigrationRunner:
+    """
+    Wykonuje brakujące kroki migracji na pliku bazy.
+
+    Przykład:
+        runner = MigrationRunner(conn)
+        if runner.pending():
+            print(runner.run().format())
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        migrations: Sequence[Migration] = MIGRATIONS,
+        batch_size: int = config.DATABASE_MIGRATIONS["batch_size"],
+    ):
+        """
+        Args:
+            conn: połączenie z bazą (poza transakcją).
+            migrations: kroki migracji posortowane rosnąco po wersji.
+            batch_size: liczba wierszy kopiowanych w jednej partii.
+        """
+        self.conn = conn
+        self.migrations = sorted(migrations, key=lambda m: m.version)
+        self.batch_size = max(1, batch_size)
+
+    @property
+    def version(self) -> int:
+        """Bieżąca wersja schematu pliku bazy."""
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def is_empty(self) -> bool:
+        """Czy baza nie zawiera jeszcze żadnych tabel (nowy lub pusty plik)."""
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' LIMIT 1"
+        ).fetchone() is None
+
+    def pending(self) -> List[Migration]:
+        """Zwraca kroki migracji, które nie zostały jeszcze wykonane."""
+        version = self.version
+        return [m for m in self.migrations if m.version > version]
+
+    def run(self, dry_run: bool = False) -> MigrationReport:
+        """
+        Wykonuje brakujące kroki migracji.
+
+        Args:
+            dry_run: wykonaj migrację na tymczasowej kopii bazy, nie zmieniając pliku;
+                raport zawiera rzeczywiste czasy kroków.
+
+        Returns:
+            MigrationReport: raport z wykonanych kroków.
+        """
+        if not dry_run:
+            return self._run(self.conn, dry_run=False)
+
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        copy = sqlite3.connect(path)
+        try:
+            self.conn.backup(copy)
+            return self._run(copy, dry_run=True)
+        finally:
+            copy.close()
+            for suffix in ("", "-wal", "-shm", "-journal"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+    def _run(self, conn: sqlite3.Connection, dry_run: bool) -> MigrationReport:
+        start_version = conn.execute("PRAGMA user_version").fetchone()[0]
+        report = MigrationReport(start_version, start_version, dry_run=dry_run)
+        if self.is_empty():
+            # Nowa baza tworzona jest od razu w bieżącej wersji schematu
+            return report
+        vacuum = False
+
+        for migration in self.migrations:
+            if migration.version <= report.to_version:
+                continue
+            step = MigrationStepReport(migration.version, migration.description)
+            ctx = MigrationContext(conn, step, self.batch_size)
+            started = time.perf_counter()
+
+            if migration.prepare is not None:
+                migration.prepare(ctx)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Krok mógł zostać wykonany przez inne połączenie w trakcie przygotowania
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= migration.version:
+                    conn.rollback()
+                    report.to_version = migration.version
+                    continue
+                migration.apply(ctx)
+                conn.execute(f"PRAGMA user_version = {migration.version}")
+            except BaseException:
+                conn.rollback()
+                logging.exception("Database migration to version %d failed", migration.version)
+                raise
+            conn.commit()
+
+            step.duration = time.perf_counter() - started
+            report.steps.append(step)
+            report.to_version = migration.version
+            vacuum = vacuum or migration.vacuum
+            logging.info(
+                "Database migrated to version %d (%s) in %.2f s",
+                migration.version, migration.description, step.duration
+            )
+
+        if vacuum:
+            started = time.perf_counter()
+            conn.execute("VACUUM")
+            # W trybie WAL plik bazy zmniejsza się dopiero po checkpoincie
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            report.vacuum_time = time.perf_counter() - started
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migracje schematu lokalnej bazy SQLite")
+    parser.add_argument("database", help="ścieżka do pliku bazy")
+    parser.add_argument("--dry-run", action="store_true", help="wykonaj migrację na kopii bazy")
+    parser.add_argument("--batch-size", type=int, default=config.DATABASE_MIGRATIONS["batch_size"])
+    options = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if not os.path.exists(options.database):
+        parser.error(f"plik {options.database} nie istnieje")
+    conn = sqlite3.connect(options.database)
+    try:
+        runner = MigrationRunner(conn, batch_size=options.batch_size)
+        print(runner.run(dry_run=options.dry_run).format())
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Kopia tabel referencyjnych lokalnej bazy w pamięci.
+
+Lista stacji z miastami, sensory stacji, kategorie indeksów i czasy aktualizacji tych danych
+są małe, rzadko zmieniane i czytane przy każdym widoku. ReferenceMirror wczytuje każdą sekcję
+jednym przebiegiem po tabelach i udostępnia ją jako słowniki współdzielone przez wszystkie
+duplikaty klienta bazy (src.database.client.Client). Klient po zatwierdzeniu zapisu
+unieważnia zmienione sekcje; kolejny odczyt wczytuje je ponownie.
+
+Zwracane widoki są współdzielone i należy je traktować jako tylko do odczytu.
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import src.database.views as views
+
+
+class Section(Enum):
+    """Sekcje kopii, unieważniane niezależnie."""
+    STATIONS = "stations"
+    SENSORS = "sensors"
+    CATEGORIES = "categories"
+    UPDATES = "updates"
+
+
+@dataclass(frozen=True)
+class Stations:
+    """
+    Stacje z miastami.
+
+    Attributes:
+        list_views: widoki listy stacji w kolejności tabeli.
+        details: widoki szczegółów stacji według id.
+    """
+    list_views: Tuple[views.StationListView, ...]
+    details: Dict[int, views.StationDetailsView]
+
+
+@dataclass(frozen=True)
+class UpdateTimes:
+    """
+    Czasy ostatnich aktualizacji danych referencyjnych.
+
+    Attributes:
+        global_updates: czasy aktualizacji globalnych według id (global_update).
+        sensors: czasy aktualizacji listy sensorów według id stacji.
+        meta: czasy aktualizacji metadanych według id stacji.
+    """
+    global_updates: Dict[int, datetime]
+    sensors: Dict[int, datetime]
+    meta: Dict[int, datetime]
+
+
+def _load_stations(conn: sqlite3.Connection) -> Stations:
+    rows = conn.execute("""
+        SELECT s.id, s.codename, s.name, s.latitude, s.longitude, s.address,
+               c.district, c.voivodeship, c.city
+        FROM station AS s
+        JOIN city AS c ON c.id = s.city_id
+    """).fetchall()
+    return Stations(
+        list_views=tuple(
+            views.StationListView(
+                id=r["id"],
+                name=r["name"],
+                latitude=r["latitude"],
+                longitude=r["longitude"],
+                city=r["city"]
+            ) for r in rows
+        ),
+        details={
+            r["id"]: views.StationDetailsView(
+                id=r["id"],
+                codename=r["codename"],
+                name=r["name"],
+                district=r["district"],
+                voivodeship=r["voivodeship"],
+                city=r["city"],
+                address=r["address"]
+            ) for r in rows
+        }
+    )
+
+
+def _load_sensors(conn: sqlite3.Connection) -> Dict[int, Tuple[views.SensorView, ...]]:
+    sensors: Dict[int, List[views.SensorView]] = {}
+    for r in conn.execute("""
+        SELECT s.station_id, s.id, st.codename
+        FROM sensor AS s
+        JOIN sensor_type AS st ON s.sensor_type_id = st.id
+    """):
+        sensors.setdefault(r["station_id"], []).append(views.SensorView(id=r["id"], codename=r["codename"]))
+    return {station_id: tuple(items) for station_id, items in sensors.items()}
+
+
+def _load_categories(conn: sqlite3.Connection) -> Dict[int, str]:
+    return {r["value"]: r["name"] for r in conn.execute("SELECT value, name FROM aq_index_category_name")}
+
+
+def _load_update_times(conn: sqlite3.Connection) -> UpdateTimes:
+    rows = conn.execute(
+        "SELECT station_id, last_sensors_update_at, last_meta_update_at FROM station_update"
+    ).fetchall()
+    return UpdateTimes(
+        global_updates={
+            r["id"]: datetime.fromtimestamp(r["last_update_at"])
+            for r in conn.execute("SELECT id, last_update_at FROM global_update")
+        },
+        sensors={r["station_id"]: datetime.fromtimestamp(r["last_sensors_update_at"]) for r in rows},
+        meta={r["station_id"]: datetime.fromtimestamp(r["last_meta_update_at"]) for r in rows},
+    )
+
+
+_LOADERS: Dict[Section, Callable[[sqlite3.Connection], object]] = {
+    Section.STATIONS: _load_stations,
+    Section.SENSORS: _load_sensors,
+    Section.CATEGORIES: _load_categories,
+    Section.UPDATES: _load_update_times,
+}
+
+
+def load(section: Section, conn: sqlite3.Connection) -> object:
+    """Wczytuje sekcję z bazy bez zapisywania jej w kopii."""
+    return _LOADERS[section](conn)
+
+
+class ReferenceMirror:
+    """
+    Kopia tabel referencyjnych współdzielona przez klientów tej samej bazy.
+
+    Odczyt wczytanej sekcji to odczyt ze słownika. Unieważnienie zwiększa licznik generacji,
+    więc sekcja wczytana z migawki sprzed zatwierdzenia zapisu nie trafia do kopii.
+    """
+
+    def __init__(self):
+        self._sections: Dict[Section, object] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, section: Section, conn: sqlite3.Connection) -> object:
+        """
+        Zwraca sekcję, wczytując ją przez `conn`, jeśli nie ma jej w kopii.
+
+        Args:
+            section: sekcja kopii.
+            conn: połączenie z bazą (poza transakcją z niezatwierdzonymi zmianami tej sekcji).
+        """
+        data = self._sections.get(section)
+        if data is not None:
+            return data
+        with self._lock:
+            generation = self._generation
+        data = load(section, conn)
+        with self._lock:
+            if self._generation == generation:
+                self._sections[section] = data
+        return data
+
+    def load_all(self, conn: sqlite3.Connection) -> None:
+        """Wczytuje wszystkie sekcje (przy starcie aplikacji)."""
+        for section in Section:
+            self.get(section, conn)
+
+    def invalidate(self, sections: Iterable[Section]) -> None:
+        """Usuwa sekcje z kopii po zatwierdzeniu zmian w ich tabelach."""
+        with self._lock:
+            self._generation += 1
+            for section in sections:
+                self._sections.pop(section, None)
@@ -0,0 +1,174 @@
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import src.config as config
+
+
+@dataclass
+class PoolStats:
+    """
+    Liczniki puli połączeń SQLite (liczniki wydań aktualizowane są pod blokadą puli,
+    liczniki blokad zapisu pod własną blokadą).
+
+    Attributes:
+        checkouts: liczba wydanych połączeń.
+        created: liczba otwartych połączeń.
+        waits: liczba wydań, które czekały na zwolnienie połączenia.
+        wait_time: łączny czas oczekiwania na wolne połączenie [s].
+        overflow: liczba połączeń otwartych ponad limit po przekroczeniu czasu oczekiwania.
+        lock_waits: liczba transakcji zapisu, które czekały na blokadę zapisu bazy.
+        lock_wait_time: łączny czas oczekiwania na blokadę zapisu [s].
+        busy_timeouts: liczba transakcji zapisu odrzuconych po upływie busy timeout.
+    """
+    checkouts: int = 0
+    created: int = 0
+    waits: int = 0
+    wait_time: float = 0.0
+    overflow: int = 0
+    lock_waits: int = 0
+    lock_wait_time: float = 0.0
+    busy_timeouts: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def reused(self) -> int:
+        """Liczba wydań obsłużonych już otwartym połączeniem."""
+        return max(0, self.checkouts - self.created)
+
+    def count_lock_wait(self, elapsed: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.busy_timeouts += 1
+            if timed_out or elapsed >= ConnectionPool.LOCK_WAIT_THRESHOLD:
+                self.lock_waits += 1
+                self.lock_wait_time += elapsed
+
+
+class ConnectionPool:
+    """
+    Pula połączeń SQLite współdzielona przez klientów bazy z różnych wątków.
+
+    Połączenia są otwierane w trybie WAL (czytelnicy nie blokują piszącego) z ustawieniami
+    z config.DATABASE_POOL i wielokrotnie używane: zwolnione połączenie trafia na stos
+    i jest wydawane jako pierwsze, więc wątek, który często korzysta z bazy, zwykle dostaje
+    to samo, "rozgrzane" połączenie (z wypełnioną pamięcią podręczną stron).
+    Jednocześnie wydanych jest co najwyżej `max_size` połączeń; kolejne wydania czekają.
+    """
+
+    # Oczekiwanie na BEGIN IMMEDIATE dłuższe niż próg liczone jest jako rywalizacja o blokadę [s]
+    LOCK_WAIT_THRESHOLD = 0.001
+
+    def __init__(
+        self,
+        filepath: str,
+        max_size: int = config.DATABASE_POOL["max_size"],
+        checkout_timeout: float = config.DATABASE_POOL["checkout_timeout"],
+        busy_timeout: float = config.DATABASE_POOL["busy_timeout"],
+        pragmas: dict[str, object] = None,
+    ):
+        """
+        Args:
+            filepath: ścieżka do pliku SQLite.
+            max_size: maksymalna liczba jednocześnie wydanych połączeń.
+            checkout_timeout: maksymalny czas oczekiwania na wolne połączenie [s]; po jego
+                upływie otwierane jest połączenie ponad limit.
+            busy_timeout: czas oczekiwania na blokadę bazy, zanim SQLite zgłosi "database is locked" [s].
+            pragmas: ustawienia PRAGMA nowych połączeń; domyślnie config.DATABASE_POOL["pragmas"].
+        """
+        self.filepath = filepath
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.busy_timeout = busy_timeout
+        self.pragmas = pragmas if pragmas is not None else config.DATABASE_POOL["pragmas"]
+        self.stats = PoolStats()
+
+        self._idle: list[sqlite3.Connection] = []
+        self._checked_out = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Połączenie może być używane przez różne wątki, ale zawsze tylko przez jeden naraz
+        conn = sqlite3.connect(self.filepath, timeout=self.busy_timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = WAL")
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Wydaje połączenie z puli (ponownie używane lub nowe).
+
+        Returns:
+            sqlite3.Connection: połączenie do zwrócenia przez release().
+        """
+        with self._cond:
+            if not self._idle and self._checked_out >= self.max_size:
+                started = time.perf_counter()
+                self._cond.wait_for(
+                    lambda: self._idle or self._checked_out < self.max_size,
+                    timeout=self.checkout_timeout
+                )
+                self.stats.waits += 1
+                self.stats.wait_time += time.perf_counter() - started
+
+            self._checked_out += 1
+            self.stats.checkouts += 1
+            if self._idle:
+                return self._idle.pop()
+
+            self.stats.created += 1
+            if self._checked_out > self.max_size:
+                self.stats.overflow += 1
+                logging.warning(
+                    "Database pool exhausted (%d connections), opening overflow connection",
+                    self.max_size
+                )
+        try:
+            return self._connect()
+        except BaseException:
+            with self._cond:
+                self._checked_out -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Zwraca połączenie do puli, wycofując niezatwierdzoną transakcję."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            conn = None
+
+        with self._cond:
+            self._checked_out -= 1
+            if conn is not None:
+                if not self._closed and len(self._idle) < self.max_size:
+                    self._idle.append(conn)
+                else:
+                    conn.close()
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Wydaje połączenie na czas bloku with."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Zamyka bezczynne połączenia (wydane zamykane są przy zwrocie)."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._closed = True
+        for conn in idle:
+            conn.close()
@@ -0,0 +1,96 @@
+"""
+Polityka retencji pomiarów w lokalnej bazie.
+
+Pomiary godzinowe starsze niż config.DATABASE_RETENTION["raw_data"] są usuwane pełnymi dobami;
+dla tego okresu zostają tylko agregaty dobowe i miesięczne (src.database.rollups). Granica
+usuniętych pomiarów każdego sensora zapisywana jest w tabeli sensor_retention. Zwolnione strony
+oddawane są systemowi przez PRAGMA incremental_vacuum, małymi krokami, aby porządkowanie
+nie blokowało zapisu na długo.
+
+Uruchomienie wszystkich kroków z wiersza poleceń:
+    python -m src.database.retention database.db [--raw-data-days 730]
+"""
+
+import argparse
+import logging
+import os
+from dataclasses import dataclass
+from datetime import timedelta
+
+import src.config as config
+
+
+@dataclass
+class RetentionReport:
+    """
+    Raport z wykonania polityki retencji (jednego lub wielu kroków).
+
+    Attributes:
+        rows_deleted: liczba usuniętych pomiarów godzinowych.
+        sensors_pruned: liczba sensorów, których pomiary sprzed granicy retencji usunięto w całości.
+        pages_freed: liczba stron zwolnionych z pliku bazy.
+        bytes_reclaimed: miejsce odzyskane w pliku bazy [B].
+        duration: łączny czas kroków [s].
+        steps: liczba wykonanych kroków.
+        finished: czy po ostatnim kroku nie zostało nic do usunięcia ani do zwolnienia.
+    """
+    rows_deleted: int = 0
+    sensors_pruned: int = 0
+    pages_freed: int = 0
+    bytes_reclaimed: int = 0
+    duration: float = 0.0
+    steps: int = 0
+    finished: bool = False
+
+    def merge(self, other: "RetentionReport") -> "RetentionReport":
+        """Dolicza raport kolejnego kroku i zwraca ten raport."""
+        self.rows_deleted += other.rows_deleted
+        self.sensors_pruned += other.sensors_pruned
+        self.pages_freed += other.pages_freed
+        self.bytes_reclaimed += other.bytes_reclaimed
+        self.duration += other.duration
+        self.steps += other.steps
+        self.finished = other.finished
+        return self
+
+    def format(self) -> str:
+        """Zwraca raport w formie tekstowej."""
+        return (
+            f"Retention: {self.rows_deleted} rows deleted ({self.sensors_pruned} sensors pruned),"
+            f" {self.bytes_reclaimed / 1e6:.1f} MB reclaimed ({self.pages_freed} pages)"
+            f" in {self.steps} steps, {self.duration:.2f} s"
+            + ("" if self.finished else " (unfinished)")
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retencja pomiarów w lokalnej bazie SQLite")
+    parser.add_argument("database", help="ścieżka do pliku bazy")
+    parser.add_argument("--raw-data-days", type=int, default=None,
+                        help="liczba dni przechowywania pomiarów godzinowych")
+    options = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if not os.path.exists(options.database):
+        parser.error(f"plik {options.database} nie istnieje")
+    keep_raw = config.DATABASE_RETENTION["raw_data"]
+    if options.raw_data_days is not None:
+        keep_raw = timedelta(days=options.raw_data_days)
+    if keep_raw is None:
+        parser.error("retencja pomiarów jest wyłączona (DATABASE_RETENTION['raw_data'] = None)")
+
+    # Import lokalny: klient bazy korzysta z RetentionReport
+    from src.database.client import Client
+
+    client = Client(options.database)
+    try:
+        report = RetentionReport()
+        while not report.finished:
+            report.merge(client.apply_retention_step(keep_raw))
+        print(report.format())
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Agregaty pomiarów sensorów w przedziałach dobowych i miesięcznych.
+
+Tabele sensor_rollup_day i sensor_rollup_month przechowują dla każdego sensora i przedziału
+liczbę pomiarów, sumę, minimum i maksimum wartości wraz z datami wystąpienia minimum
+i maksimum. Przedziały wyznaczane są w czasie lokalnym i identyfikowane sekundami epoki Unix
+swojego początku. Agregaty miesięczne liczone są z dobowych.
+"""
+
+from datetime import datetime, timedelta
+
+from src.series import Resolution
+
+
+# Tabela agregatów dla danej rozdzielczości
+TABLES = {
+    Resolution.DAY: "sensor_rollup_day",
+    Resolution.MONTH: "sensor_rollup_month",
+}
+
+# Modyfikatory SQLite wyznaczające początek przedziału (czas lokalny) dla daty w sekundach epoki
+_START_MODIFIERS = {
+    Resolution.DAY: "'start of day'",
+    Resolution.MONTH: "'start of month'",
+}
+_NEXT_MODIFIERS = {
+    Resolution.DAY: "'+1 day'",
+    Resolution.MONTH: "'+1 month'",
+}
+
+
+def create_table_sql(resolution: Resolution, table: str = None) -> str:
+    return f"""
+        CREATE TABLE IF NOT EXISTS {table or TABLES[resolution]} (
+            sensor_id INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            sum REAL NOT NULL,
+            min REAL NOT NULL,
+            max REAL NOT NULL,
+            min_date INTEGER NOT NULL,
+            max_date INTEGER NOT NULL,
+            PRIMARY KEY(sensor_id, bucket),
+            FOREIGN KEY(sensor_id) REFERENCES sensor(id)
+        ) WITHOUT ROWID
+    """
+
+
+def bucket_sql(column: str, resolution: Resolution, next_bucket: bool = False) -> str:
+    """Wyrażenie SQL zwracające początek przedziału (lub następnego przedziału) dla kolumny z epoką."""
+    modifiers = _START_MODIFIERS[resolution]
+    if next_bucket:
+        modifiers += ", " + _NEXT_MODIFIERS[resolution]
+    return f"unixepoch({column}, 'unixepoch', 'localtime', {modifiers}, 'utc')"
+
+
+def aggregate_sql(resolution: Resolution, where: str) -> str:
+    """
+    Zapytanie agregujące pomiary z sensor_data w przedziały danej rozdzielczości.
+
+    Zwraca kolumny (sensor_id, bucket, count, sum, min, max, min_date, max_date), posortowane
+    po sensorze i przedziale. Przy równych wartościach datą minimum/maksimum jest najwcześniejsza.
+
+    Args:
+        resolution: rozdzielczość przedziałów.
+        where: warunek SQL na wiersze sensor_data.
+    """
+    return f"""
+        SELECT sensor_id, bucket, COUNT(*), SUM(value), MIN(value), MAX(value),
+               MIN(min_date), MIN(max_date)
+        FROM (
+            SELECT sensor_id, bucket, value,
+                   FIRST_VALUE(date) OVER (
+                       PARTITION BY sensor_id, bucket ORDER BY value, date
+                   ) AS min_date,
+                   FIRST_VALUE(date) OVER (
+                       PARTITION BY sensor_id, bucket ORDER BY value DESC, date
+                   ) AS max_date
+            FROM (
+                SELECT sensor_id, date, value, {bucket_sql("date", resolution)} AS bucket
+                FROM sensor_data
+                WHERE {where}
+            )
+        )
+        GROUP BY sensor_id, bucket
+        ORDER BY sensor_id, bucket
+    """
+
+
+def monthly_from_daily_sql(where: str, source: str = TABLES[Resolution.DAY]) -> str:
+    """
+    Zapytanie łączące agregaty dobowe w miesięczne (kolumny jak w aggregate_sql).
+
+    Args:
+        where: warunek SQL na wiersze tabeli agregatów dobowych.
+        source: tabela agregatów dobowych; domyślnie sensor_rollup_day.
+    """
+    return f"""
+        SELECT sensor_id, month, SUM(count), SUM(sum), MIN(min), MAX(max),
+               MIN(month_min_date), MIN(month_max_date)
+        FROM (
+            SELECT sensor_id, count, sum, min, max,
+                   {bucket_sql("bucket", Resolution.MONTH)} AS month,
+                   FIRST_VALUE(min_date) OVER (
+                       PARTITION BY sensor_id, {bucket_sql("bucket", Resolution.MONTH)}
+                       ORDER BY min, min_date
+                   ) AS month_min_date,
+                   FIRST_VALUE(max_date) OVER (
+                       PARTITION BY sensor_id, {bucket_sql("bucket", Resolution.MONTH)}
+                       ORDER BY max DESC, max_date
+                   ) AS month_max_date
+            FROM {source}
+            WHERE {where}
+        )
+        GROUP BY sensor_id, month
+        ORDER BY sensor_id, month
+    """
+
+
+def bucket_start(date: datetime, resolution: Resolution) -> datetime:
+    """Początek przedziału zawierającego datę (czas lokalny)."""
+    date = date.replace(hour=0, minute=0, second=0, microsecond=0)
+    if resolution is Resolution.MONTH:
+        date = date.replace(day=1)
+    return date
+
+
+def next_bucket_start(date: datetime, resolution: Resolution) -> datetime:
+    """Początek przedziału następującego po przedziale zawierającym datę."""
+    start = bucket_start(date, resolution)
+    if resolution is Resolution.DAY:
+        return start + timedelta(days=1)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
@@ -0,0 +1,81 @@
+"""
+Indeks pełnotekstowy stacji (FTS5).
+
+Tabela station_search zawiera dla każdej stacji (rowid = id stacji) nazwę, miasto, powiat,
+województwo, adres i kod stacji. Tokenizer unicode61 z remove_diacritics 2 pomija wielkość liter
+i znaki diakrytyczne (ą, ę, ó, ś, ...). Litera ł nie jest w Unicode literą l ze znakiem
+diakrytycznym, więc jest zamieniana na l zarówno w indeksowanym tekście, jak i w zapytaniach.
+"""
+
+import re
+from typing import Optional
+
+TABLE = "station_search"
+
+# Kolumny indeksu i ich wagi w rankingu bm25 (dopasowanie w nazwie liczy się najbardziej)
+COLUMNS = {
+    "name": 10.0,
+    "city": 5.0,
+    "district": 1.0,
+    "voivodeship": 1.0,
+    "address": 2.0,
+    "codename": 3.0,
+}
+
+# Zamiany liter, których tokenizer nie sprowadza do liter bez znaków diakrytycznych
+_FOLDS = {"ł": "l", "Ł": "L"}
+
+_TOKEN = re.compile(r"\w+")
+
+
+def create_table_sql() -> str:
+    return f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5(
+            {", ".join(COLUMNS)},
+            tokenize = "unicode61 remove_diacritics 2"
+        )
+    """
+
+
+def _fold_sql(expression: str) -> str:
+    for letter, replacement in _FOLDS.items():
+        expression = f"replace({expression}, '{letter}', '{replacement}')"
+    return expression
+
+
+def index_sql(where: str) -> str:
+    """
+    Polecenie wstawiające do indeksu stacje spełniające warunek.
+
+    Args:
+        where: warunek SQL na wiersze station (alias s) i city (alias c).
+    """
+    return f"""
+        INSERT INTO {TABLE} (rowid, {", ".join(COLUMNS)})
+        SELECT s.id, {_fold_sql("s.name")}, {_fold_sql("c.city")}, {_fold_sql("c.district")},
+               {_fold_sql("c.voivodeship")}, {_fold_sql("COALESCE(s.address, '')")}, s.codename
+        FROM station AS s
+        JOIN city AS c ON c.id = s.city_id
+        WHERE {where}
+    """
+
+
+def fold(text: str) -> str:
+    """Zamienia litery, których nie obsługuje tokenizer (ł -> l)."""
+    for letter, replacement in _FOLDS.items():
+        text = text.replace(letter, replacement)
+    return text
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    Zamienia tekst wpisany przez użytkownika na zapytanie FTS5: każde słowo jest prefiksem
+    (np. "krak" pasuje do "Kraków"), a wszystkie słowa muszą wystąpić w którejś z kolumn.
+
+    Returns:
+        Optional[str]: wyrażenie MATCH lub None, gdy zapytanie nie zawiera słów.
+    """
+    tokens = _TOKEN.findall(fold(query))
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
@@ -3,8 +3,8 @@ Objekty przechowujące dane z bazy danych
 """
 
 
-from datetime import datetime
 from dataclasses import dataclass
+from datetime import datetime
 
 @dataclass
 class StationCommonView:
@@ -23,6 +23,26 @@ class AQIndexView:
     value: int
     category: str
 
+@dataclass
+class StationAQIndexValueView:
+    station_id: int
+    value: int | None
+    updated_at: datetime
+    stale: bool
+
+@dataclass
+class AQIndexValuesView:
+    stations: list[StationAQIndexValueView]
+
+    @property
+    def stale_ids(self) -> list[int]:
+        """Identyfikatory stacji, których indeksy wymagają odświeżenia."""
+        return [st.station_id for st in self.stations if st.stale]
+
+    def values(self) -> dict[int, int | None]:
+        """Słownik id stacji -> wartość indeksu (None, gdy brak)."""
+        return {st.station_id: st.value for st in self.stations}
+
 @dataclass
 class SensorView:
     id: int
@@ -35,9 +55,4 @@ class StationDetailsView(StationCommonView):
     district: str
     voivodeship: str
     city: str
-    address: str
-
-@dataclass
-class SensorValueView:
-    date: datetime
-    value: float
\ No newline at end of file
+    address: str
\ No newline at end of file
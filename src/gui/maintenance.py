@@ -0,0 +1,73 @@
+import logging
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal, Slot
+
+from src.config import DATABASE_RETENTION
+from src.database.retention import RetentionReport
+from src.repository import Repository
+
+
+class RetentionStepRunner(QRunnable):
+    class Signals(QObject):
+        finished = Signal(object)
+
+    def __init__(self,repository: Repository):
+        super().__init__()
+        self.repository = repository
+        self.signals = self.Signals()
+
+    def run(self):
+        try:
+            own_repository = self.repository.clone()
+            report = own_repository.apply_retention_step()
+        except Exception:
+            logging.exception("Database retention step failed")
+            report = RetentionReport(finished=True)
+        self.signals.finished.emit(report)
+
+
+class RetentionScheduler(QObject):
+    """
+    Wykonuje kroki polityki retencji lokalnej bazy, gdy aplikacja jest bezczynna
+    (żadne zadanie nie działa w globalnej puli wątków), i raportuje łączny wynik porządkowania.
+    """
+
+    def __init__(self,repository: Repository,parent: QObject = None):
+        super().__init__(parent)
+        self.repository = repository
+        self.report = RetentionReport()
+        self.is_running = False
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.on_timeout)
+
+    def start(self):
+        if DATABASE_RETENTION["raw_data"] is None:
+            return
+        self.timer.start(int(DATABASE_RETENTION["idle_interval"].total_seconds() * 1000))
+
+    @Slot()
+    def on_timeout(self):
+        thread_pool = QThreadPool.globalInstance()
+        # Krok czeka, aż zakończą się pobierania danych i poprzedni krok
+        if self.is_running or thread_pool.activeThreadCount() > 0:
+            return
+
+        self.is_running = True
+        runner = RetentionStepRunner(self.repository)
+        runner.signals.finished.connect(self.on_step_finished)
+        thread_pool.start(runner)
+
+    @Slot(object)
+    def on_step_finished(self,report: RetentionReport):
+        self.is_running = False
+        self.report.merge(report)
+        if not report.finished:
+            self.timer.setInterval(int(DATABASE_RETENTION["idle_interval"].total_seconds() * 1000))
+            return
+
+        if self.report.rows_deleted or self.report.pages_freed:
+            logging.info(self.report.format())
+        self.report = RetentionReport()
+        # Kolejne pomiary zestarzeją się dopiero po dłuższym czasie
+        self.timer.setInterval(int(DATABASE_RETENTION["recheck_interval"].total_seconds() * 1000))
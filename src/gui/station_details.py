@@ -9,10 +9,11 @@ from PySide6.QtWidgets import QWidget, QHBoxLayout, QLabel, QTabWidget, QFormLay
     QVBoxLayout, QPushButton, QMessageBox, QGroupBox, QGridLayout, QToolTip
 
 from src.api.exceptions import TooManyRequests
-from src.database.views import StationDetailsView, SensorView, SensorValueView
+from src.database.views import StationDetailsView, SensorView
 from src.gui.loading_overlay import LoadingOverlay
 from src.gui.qt import qt_to_datetime
 from src.repository import Repository
+from src.series import Resolution, SensorRollup
 
 
 class StationInfoWidget(QWidget):
@@ -40,6 +41,8 @@ class SensorDataFetcher(QRunnable):
     class Signals(QObject):
         finished = Signal(Any)
         too_many_requests = Signal()
+        #                 przewidywany czas oczekiwania [s]
+        queued = Signal(float)
 
     def __init__(self,sensor_id: int,date_from: datetime,date_to: datetime,repository: Repository):
         super().__init__()
@@ -52,7 +55,14 @@ class SensorDataFetcher(QRunnable):
     def run(self):
         try:
             own_repository = self.repository.clone()
-            data = own_repository.fetch_sensor_data(self.sensor_id,self.date_from,self.date_to)
+
+            # Dane archiwalne podlegają limitowi zapytań, żądanie poczeka w kolejce
+            expected_wait = own_repository.api_client().expected_wait()
+            if expected_wait > 0:
+                self.signals.queued.emit(expected_wait)
+
+            # Długie zakresy zwracane są jako agregaty dobowe lub miesięczne
+            data = own_repository.fetch_sensor_rollup(self.sensor_id,self.date_from,self.date_to)
             self.signals.finished.emit(data)
         except TooManyRequests as e:
             self.signals.too_many_requests.emit()
@@ -281,6 +291,7 @@ class StationDataWidget(QWidget):
     @is_loading.setter
     def is_loading(self,value: bool):
         if value:
+            self.loading_overlay.label.setText("Ładowanie...")
             self.loading_overlay.show()
         else:
             self.loading_overlay.hide()
@@ -306,65 +317,60 @@ class StationDataWidget(QWidget):
         job = SensorDataFetcher(current_sensor.id,dt_from,dt_to,self.repository.clone())
         job.signals.finished.connect(self.on_data_load_finished)
         job.signals.too_many_requests.connect(self.on_too_many_requests)
+        job.signals.queued.connect(self.on_request_queued)
         thread_pool.start(job)
 
     @Slot()
-    def on_data_load_finished(self,data: list[SensorValueView]):
+    def on_data_load_finished(self,data: SensorRollup):
         self.is_loading = False
-        if not data:
+        if not len(data):
             QMessageBox.information(
                 self, "Brak danych",
                 "Brak dostępnych danych pomiarowych w wybranym zakresie!"
             )
             return
 
-        # Zamiana na (timestamp_ms, value) i sortowanie
-        numeric = sorted(
-            ((int(entry.date.timestamp() * 1000), entry.value) for entry in data),
-            key=lambda v: v[0]
-        )
-        xs, ys = zip(*numeric)
+        # Seria jest już posortowana po czasie, oś X wykresu wymaga milisekund
+        xs = data.timestamps_ms
+        means = data.means
 
-        # Ustawienie zakresów osi
+        # Ustawienie zakresów osi (skrajne pomiary ostatniego przedziału mogą leżeć za jego początkiem)
+        last_ms = max(int(xs[-1]), int(data.min_timestamps.max()) * 1000, int(data.max_timestamps.max()) * 1000)
         self.axis_x.setRange(
-            QDateTime.fromMSecsSinceEpoch(xs[0]),
-            QDateTime.fromMSecsSinceEpoch(xs[-1])
+            QDateTime.fromMSecsSinceEpoch(int(xs[0])),
+            QDateTime.fromMSecsSinceEpoch(last_ms)
         )
-        self.axis_y.setRange(0, max(ys) * 1.1)
+        self.axis_x.setFormat("MM-dd hh:mm" if data.resolution is Resolution.HOUR else "yyyy-MM-dd")
+        self.axis_y.setRange(0, float(data.maxs.max()) * 1.1)
 
         # Wypisanie serii
         self.series.clear()
         self.min_scatter.clear()
         self.max_scatter.clear()
 
-        for x, y in numeric:
-            self.series.append(x, y)
+        # Dla agregatów wykres pokazuje średnie w przedziałach
+        self.series.replaceNp(xs.astype(np.float64), means)
 
-        # Obliczenie min/max
-        min_idx = ys.index(min(ys))
-        max_idx = ys.index(max(ys))
-        min_ts, min_val = numeric[min_idx]
-        max_ts, max_val = numeric[max_idx]
-        min_dt = datetime.fromtimestamp(min_ts / 1000)
-        max_dt = datetime.fromtimestamp(max_ts / 1000)
+        # Min/max i średnia liczone z agregatów przedziałów
+        min_idx = data.argmin()
+        max_idx = data.argmax()
+        min_val = float(data.mins[min_idx])
+        max_val = float(data.maxs[max_idx])
+        min_dt = datetime.fromtimestamp(int(data.min_timestamps[min_idx]))
+        max_dt = datetime.fromtimestamp(int(data.max_timestamps[max_idx]))
 
-        avg_val = np.average(ys)
+        avg_val = data.mean()
 
         self.min_value_label.setText(f"{min_val:.2f} µg/m³ ({min_dt})")
         self.max_value_label.setText(f"{max_val:.2f} µg/m³ ({max_dt})")
         self.avg_value_label.setText(f"{avg_val:.4f} µg/m³")
 
-        self.min_scatter.append(min_ts, min_val)
-        self.max_scatter.append(max_ts, max_val)
+        # Punkty min/max w miejscu wystąpienia skrajnego pomiaru (dla agregatów poza linią średnich)
+        self.min_scatter.append(float(data.min_timestamps[min_idx]) * 1000, min_val)
+        self.max_scatter.append(float(data.max_timestamps[max_idx]) * 1000, max_val)
 
         # Obliczenie trendu (regresja liniowa)
-        # weź czasy jako liczby (timestamp)
-        x = np.array([sv.date.timestamp() for sv in data], dtype=float)
-        y = np.array([sv.value for sv in data], dtype=float)
-
-        # y = m * x + b
-        A = np.vstack([x, np.ones_like(x)]).T
-        m, _ = np.linalg.lstsq(A, y, rcond=None)[0]
+        m = data.trend()
 
         def trend_str():
             if m > 0:
@@ -376,6 +382,10 @@ class StationDataWidget(QWidget):
 
         self.trend_value_label.setText(f"{trend_str()}")
 
+    @Slot(float)
+    def on_request_queued(self,expected_wait: float):
+        self.loading_overlay.label.setText(f"Oczekiwanie na limit API (~{expected_wait:.0f} s)...")
+
     @Slot()
     def on_too_many_requests(self):
         self.is_loading = False
@@ -387,18 +397,7 @@ class StationDataWidget(QWidget):
 
     @Slot()
     def on_display_btn(self):
-        date_from = self.date_from_edit.dateTime()
-        date_to = self.date_to_edit.dateTime()
-        days_diff = date_from.daysTo(date_to)
-
-        if days_diff > 30:
-            QMessageBox.warning(
-                self,
-                "Błędny zakres",
-                "Możesz wyświetlić maksymalnie 30 dni naraz, popraw zakres"
-            )
-            return
-
+        # Długie zakresy są dzielone przez planer repozytorium na minimalną liczbę żądań
         self.start_loading_data()
 
     @Slot(QPointF,bool)
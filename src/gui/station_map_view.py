@@ -29,11 +29,11 @@ class MapViewBackend(QObject):
     def on_station_selected(self,station_id: int):
         self.stationSelected.emit(station_id)
 
-    requestStationIndexValue = Signal(int)
-    @Slot(int)
-    def request_station_index_value(self,station_id: int):
-        print(f"Request station index value: {station_id}")
-        self.requestStationIndexValue.emit(station_id)
+    # Wszystkie markery, które pojawiły się w widoku, zgłaszane są jednym wywołaniem
+    requestStationIndexValues = Signal(list)
+    @Slot(list)
+    def request_station_index_values(self,station_ids: list):
+        self.requestStationIndexValues.emit(station_ids)
 
     leaftletLoaded = Signal()
     @Slot()
@@ -64,7 +64,7 @@ class StationMapViewWidget(QWidget):
         self.channel.registerObject("backend",self.backend) # Przekazanie obiektu do JavaScriptu
 
         self.stationSelected = self.backend.stationSelected
-        self.requestStationIndexValue = self.backend.requestStationIndexValue
+        self.requestStationIndexValues = self.backend.requestStationIndexValues
         self.leaftletLoaded = self.backend.leaftletLoaded
         web.load(QUrl.fromLocalFile(map_path))
 
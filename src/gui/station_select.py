@@ -101,24 +101,48 @@ class StationSelectFilter(QWidget):
 
 class StationIndexFetcher(QRunnable):
     class Signals(QObject):
+        #                station_id, index_value
         finished = Signal(int,int)
 
-    def __init__(self,station_id: int,index_type: str,repository: Repository):
-        logging.info(f"Fetcher created: station_id:  {station_id}, index_type: {index_type}")
+    def __init__(self,station_ids: list[int],index_type: str,repository: Repository):
+        logging.info(f"Fetcher created: {len(station_ids)} stations, index_type: {index_type}")
         super().__init__()
-        self.station_id = station_id
+        self.station_ids = station_ids
         self.index_type = index_type
         self.repository = repository
         self.signals = self.Signals()
 
     def run(self):
         own_repository = self.repository.clone()
-        value = own_repository.fetch_station_air_quality_index_value(self.station_id,self.index_type)
+        # Jedno zapytanie dla wszystkich stacji; z API odświeżane są tylko nieaktualne
+        values = own_repository.fetch_station_air_quality_index_values(self.station_ids,self.index_type)
 
-        if value is None:
-             value = -1
+        for station_id, value in values.items():
+            self.signals.finished.emit(station_id, -1 if value is None else value)
 
-        self.signals.finished.emit(self.station_id,value)
+
+class StationIndexPrefetcher(QRunnable):
+    class Signals(QObject):
+        #                 ukończone, wszystkie
+        progress = Signal(int, int)
+        finished = Signal()
+
+    def __init__(self,repository: Repository):
+        super().__init__()
+        self.repository = repository
+        self.signals = self.Signals()
+
+    def run(self):
+        try:
+            own_repository = self.repository.clone()
+            own_repository.update_all_air_quality_indexes(
+                only_stale=True,
+                progress=self.signals.progress.emit
+            )
+        except Exception:
+            logging.exception("Air quality index prefetch failed")
+        finally:
+            self.signals.finished.emit()
 
 
 class StationSelectWidget(QMainWindow):
@@ -173,7 +197,7 @@ class StationSelectWidget(QMainWindow):
         self.map_view.leaftletLoaded.connect(lambda : right.setVisible(True))
         self.map_view.web.loadFinished.connect(self.on_map_loaded)
         self.map_view.stationSelected.connect(self.on_station_marker_clicked)
-        self.map_view.requestStationIndexValue.connect(self.on_request_station_index_value)
+        self.map_view.requestStationIndexValues.connect(self.on_request_station_index_values)
 
 
         right_layout.addLayout(aq_index_type_form, stretch=0)
@@ -243,6 +267,23 @@ class StationSelectWidget(QMainWindow):
     def on_map_loaded(self):
         self.setup_markers()
         self.center()
+        self.start_index_prefetch()
+
+    def start_index_prefetch(self):
+        # Zbiorcze odświeżenie indeksów, aby mapa była kolorowana z lokalnej bazy
+        task = StationIndexPrefetcher(self.repository)
+        task.signals.progress.connect(self.on_index_prefetch_progress)
+        task.signals.finished.connect(self.on_index_prefetch_finished)
+        self.thread_pool.start(task)
+
+    @Slot(int,int)
+    def on_index_prefetch_progress(self,done: int,total: int):
+        self.statusBar().showMessage(f"Pobieranie indeksów: {done}/{total}")
+
+    @Slot()
+    def on_index_prefetch_finished(self):
+        self.statusBar().clearMessage()
+        self.map_view.reset_indexes()
 
 
     @Slot(FilterState)
@@ -262,14 +303,24 @@ class StationSelectWidget(QMainWindow):
                     st for st in self.filtered_stations
                     if distance((lat,lng),(st.latitude,st.longitude)).km <= state.range
                 ]
-            else: # Szukaj po nazwie
-                name_to_station = {
-                    st.name: st for st in self.filtered_stations
+            else: # Szukaj po nazwie, mieście i adresie (indeks FTS5, wyniki od najlepszego)
+                id_to_station = {
+                    st.id: st for st in self.filtered_stations
                 }
-                searched = fuzzy_search(state.search_query,name_to_station.keys(),score_cutoff=60)
+                searched = self.repository.search_stations(state.search_query)
                 self.filtered_stations = [
-                name_to_station[result] for result in searched
+                    id_to_station[station_id] for station_id in searched
+                    if station_id in id_to_station
                 ]
+                if not self.filtered_stations:
+                    # Brak dopasowań prefiksów (np. literówka) - dopasowanie przybliżone po nazwie
+                    name_to_station = {
+                        st.name: st for st in id_to_station.values()
+                    }
+                    searched = fuzzy_search(state.search_query,name_to_station.keys(),score_cutoff=60)
+                    self.filtered_stations = [
+                        name_to_station[result] for result in searched
+                    ]
         else:
             self.filtered_stations.sort(key=lambda x: x.name)
 
@@ -304,11 +355,11 @@ class StationSelectWidget(QMainWindow):
     def on_aq_index_changed(self,index: int):
         self.map_view.reset_indexes()
 
-    @Slot(int)
-    def on_request_station_index_value(self,station_id: int):
+    @Slot(list)
+    def on_request_station_index_values(self,station_ids: list):
         current_index = self.aq_index_type_combo.currentText()
 
-        task = StationIndexFetcher(station_id,current_index,self.repository)
+        task = StationIndexFetcher([int(station_id) for station_id in station_ids],current_index,self.repository)
         task.signals.finished.connect(self.map_view.init_index_value)
 
         self.thread_pool.start(task)
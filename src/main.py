@@ -1,5 +1,6 @@
 import logging
 
+from api.cache import ResponseCache
 from api.client import Client as APIClient
 from app import Application
 from database.client import Client as DatabaseClient
@@ -8,7 +9,7 @@ from repository import Repository
 
 def main():
     database_client = DatabaseClient("database.db")
-    api_client = APIClient()
+    api_client = APIClient(cache=ResponseCache())
 
     repository = Repository(api_client, database_client)
 
@@ -0,0 +1,158 @@
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from src.config import ARCHIVAL_PLANNER
+
+
+HOUR = timedelta(hours=1)
+
+Interval = tuple[datetime, datetime]
+
+
+def truncate_to_hour(dt: datetime) -> datetime:
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+@dataclass
+class ArchivalChunk:
+    """Pojedyncze żądanie danych archiwalnych (zakres godzin włącznie z końcami)."""
+    sensor_id: int
+    date_from: datetime
+    date_to: datetime
+
+    @property
+    def hours(self) -> int:
+        return int((self.date_to - self.date_from) / HOUR) + 1
+
+
+class ArchivalChunkPlanner:
+    """
+    Dzieli żądanie danych archiwalnych (sensor, od, do) na fragmenty przyjazne dla API.
+
+    Planer:
+      - pomija godziny już obecne w lokalnej bazie,
+      - scala brakujące przedziały, jeśli ponowne pobranie dzielącej je luki nie zwiększa
+        liczby stron (żądań) do API,
+      - dzieli długie przedziały na fragmenty o długości będącej wielokrotnością rozmiaru strony,
+        dzięki czemu liczba żądań jest najmniejsza możliwa,
+      - układa fragmenty tak, by najpierw pobierane były dane widoczne lub najnowsze.
+    """
+
+    def __init__(
+        self,
+        page_size: int = ARCHIVAL_PLANNER["page_size"],
+        max_span: timedelta = ARCHIVAL_PLANNER["max_span"],
+    ):
+        """
+        Args:
+            page_size: liczba pomiarów (godzin) na stronę odpowiedzi API.
+            max_span: maksymalny zakres czasu jednego żądania archiwalnego.
+        """
+        self.page_size = page_size
+        max_hours = int(max_span / HOUR)
+        self.chunk_hours = max(page_size, max_hours // page_size * page_size)
+
+    def pages(self, date_from: datetime, date_to: datetime) -> int:
+        """Liczba stron (żądań) potrzebnych do pobrania przedziału godzin włącznie z końcami."""
+        hours = int((date_to - date_from) / HOUR) + 1
+        return max(1, math.ceil(hours / self.page_size))
+
+    @staticmethod
+    def missing_intervals(
+        date_from: datetime,
+        date_to: datetime,
+        present: Iterable[Interval]
+    ) -> list[Interval]:
+        """
+        Zwraca przedziały godzin z [date_from, date_to] nieobecne w `present`.
+
+        Args:
+            date_from: początek zakresu.
+            date_to: koniec zakresu.
+            present: przedziały godzin (włącznie z końcami) dostępne lokalnie.
+        """
+        date_from = truncate_to_hour(date_from)
+        date_to = truncate_to_hour(date_to)
+
+        missing = []
+        cursor = date_from
+        for start, end in sorted(present):
+            if end < cursor:
+                continue
+            if start > date_to:
+                break
+            if start > cursor:
+                missing.append((cursor, start - HOUR))
+            cursor = max(cursor, end + HOUR)
+        if cursor <= date_to:
+            missing.append((cursor, date_to))
+        return missing
+
+    def _merge(self, intervals: list[Interval]) -> list[Interval]:
+        merged: list[Interval] = []
+        for start, end in intervals:
+            if merged:
+                last_start, last_end = merged[-1]
+                separate = self.pages(last_start, last_end) + self.pages(start, end)
+                if self.pages(last_start, end) <= separate:
+                    merged[-1] = (last_start, end)
+                    continue
+            merged.append((start, end))
+        return merged
+
+    def _split(self, sensor_id: int, date_from: datetime, date_to: datetime) -> list[ArchivalChunk]:
+        # Pełne fragmenty liczone od najnowszych danych, niepełna reszta trafia do najstarszego
+        chunks = []
+        end = date_to
+        while end >= date_from:
+            start = max(date_from, end - (self.chunk_hours - 1) * HOUR)
+            chunks.append(ArchivalChunk(sensor_id, start, end))
+            end = start - HOUR
+        return chunks
+
+    def plan(
+        self,
+        sensor_id: int,
+        date_from: datetime,
+        date_to: datetime,
+        present: Iterable[Interval] = (),
+        focus: Optional[Interval] = None
+    ) -> list[ArchivalChunk]:
+        """
+        Planuje żądania archiwalne dla zakresu, pomijając dane dostępne lokalnie.
+
+        Args:
+            sensor_id: id sensora.
+            date_from: początek zakresu.
+            date_to: koniec zakresu.
+            present: przedziały godzin dostępne lokalnie.
+            focus: przedział aktualnie wyświetlany; fragmenty z nim związane są pobierane najpierw.
+
+        Returns:
+            list[ArchivalChunk]: fragmenty w kolejności pobierania.
+        """
+        if date_from > date_to:
+            return []
+
+        chunks = [
+            chunk
+            for start, end in self._merge(self.missing_intervals(date_from, date_to, present))
+            for chunk in self._split(sensor_id, start, end)
+        ]
+
+        def priority(chunk: ArchivalChunk):
+            if focus is None:
+                return 0, -chunk.date_to.timestamp()
+            focus_from, focus_to = focus
+            if chunk.date_to < focus_from:
+                distance = (focus_from - chunk.date_to).total_seconds()
+            elif chunk.date_from > focus_to:
+                distance = (chunk.date_from - focus_to).total_seconds()
+            else:
+                distance = 0
+            return distance, -chunk.date_to.timestamp()
+
+        chunks.sort(key=priority)
+        return chunks
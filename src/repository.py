@@ -1,14 +1,44 @@
 import logging
+import time
 import typing
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from typing import Callable, Hashable, Iterable
 
 import requests.exceptions
 
 import src.database.views as views
 from src.api.client import Client as APIClient
 from src.api.exceptions import APIError, TooManyRequests
-from src.config import UPDATE_INTERVALS
-from src.database.client import Client as DatabaseClient
+from src.config import UPDATE_INTERVALS, BULK_UPDATE, ARCHIVAL_PLANNER, SENSOR_ROLLUPS, DATABASE_RETENTION
+from src.database.client import Client as DatabaseClient, OVERALL_SENSOR_TYPE_CODENAME
+from src.database.retention import RetentionReport
+from src.planner import ArchivalChunk, ArchivalChunkPlanner, truncate_to_hour
+from src.series import SensorRollup, SensorSeries
+from src.singleflight import SingleFlight, SingleFlightStats
+
+@dataclass
+class BulkUpdateReport:
+    """
+    Podsumowanie zbiorczego odświeżenia danych.
+
+    Attributes:
+        total: liczba stacji (lub sensorów) objętych odświeżeniem.
+        updated: liczba stacji (lub sensorów) zapisanych w bazie.
+        failed: identyfikatory stacji (lub sensorów), których nie udało się pobrać.
+        elapsed: czas trwania w sekundach.
+    """
+    total: int
+    updated: int
+    failed: list[int] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Liczba przetworzonych stacji (lub sensorów) na sekundę."""
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
 
 class Repository:
     """
@@ -21,22 +51,68 @@ class Repository:
       - pobieranie i aktualizację szczegółowych danych jakości powietrza dla konkretnej stacji.
     """
 
-    def __init__(self, api_client: APIClient, database_client: DatabaseClient):
+    def __init__(
+        self,
+        api_client: APIClient,
+        database_client: DatabaseClient,
+        single_flight: SingleFlight = None,
+    ):
         """
         Inicjalizuje instancję repozytorium.
 
         Args:
             api_client (api.Client): Klient do komunikacji z zewnętrznym API.
             database_client (database.Client): Klient do operacji na lokalnej bazie danych.
+            single_flight (SingleFlight, opcjonalnie): Warstwa scalająca równoczesne odświeżenia;
+                współdzielona przez klony repozytorium.
         """
         self._api_client = api_client
         self._database_client = database_client
+        self._single_flight = single_flight if single_flight is not None else SingleFlight()
+        self._planner = ArchivalChunkPlanner()
 
     def api_client(self):
         return self._api_client
 
     def clone(self):
-        return Repository(self._api_client,self._database_client.duplicate_connection())
+        return Repository(
+            self._api_client,
+            self._database_client.duplicate_connection(),
+            self._single_flight
+        )
+
+    def single_flight_stats(self) -> SingleFlightStats:
+        """Zwraca liczniki scalonych odświeżeń (wspólne dla wszystkich klonów repozytorium)."""
+        return self._single_flight.stats
+
+    def _refresh_if_stale(
+        self,
+        key: Hashable,
+        last_update: Callable[[], datetime],
+        interval: timedelta,
+        update: Callable[[], None]
+    ) -> None:
+        """
+        Odświeża zasób, jeśli od ostatniej aktualizacji minął podany interwał.
+
+        Równoczesne odświeżenia tego samego zasobu (np. z kilku wątków mapy) są scalane
+        w jedno żądanie API i jeden zapis do bazy. Wewnątrz lotu aktualność jest sprawdzana
+        ponownie, więc wywołujący, który spóźnił się na zakończony lot, nie pobiera danych drugi raz.
+
+        Args:
+            key: identyfikator zasobu.
+            last_update: funkcja zwracająca czas ostatniej aktualizacji zasobu.
+            interval: dopuszczalny wiek danych.
+            update: funkcja pobierająca dane z API i zapisująca je w bazie.
+        """
+        if datetime.now() - last_update() < interval:
+            return
+
+        def refresh():
+            if datetime.now() - last_update() >= interval:
+                update()
+
+        self._single_flight.do(key, refresh)
 
     # Ta fukcja nie jest prywatna poniewaz moze sluzyc do odswierzenia
     def update_stations(self):
@@ -54,6 +130,14 @@ class Repository:
             stations=api_stations
         )
 
+    def _refresh_stations_if_stale(self):
+        self._refresh_if_stale(
+            key=("stations",),
+            last_update=self._database_client.get_last_stations_update,
+            interval=UPDATE_INTERVALS['station'],
+            update=self.update_stations
+        )
+
     def get_station_list_view(self) -> list[views.StationListView]:
         """
         Zwraca widok listy stacji, odświeżając dane jeśli upłynął zdefiniowany interwał.
@@ -64,25 +148,34 @@ class Repository:
         Returns:
             list[database.views.StationListView]: Lista obiektów widoku stacji.
         """
-        last_update_at = self._database_client.get_last_stations_update()
-        elapsed = datetime.now() - last_update_at
-
         try:
-            if elapsed >= UPDATE_INTERVALS['station']:
-                self.update_stations()
+            self._refresh_stations_if_stale()
         except requests.exceptions.ConnectionError as e:
             logging.warning("Error while updating stations: %s",e)
 
         return self._database_client.get_station_list_view()
 
 
-    def fetch_station_details_view(self, station_id: int) -> views.StationDetailsView:
-        last_update_at = self._database_client.get_last_stations_update()
-        elapsed = datetime.now() - last_update_at
+    def search_stations(self, query: str, limit: int = None) -> list[int]:
+        """
+        Wyszukuje stacje po nazwie, mieście, powiecie, województwie, adresie i kodzie.
+
+        Słowa zapytania dopasowywane są jako prefiksy, bez rozróżniania wielkości liter
+        i znaków diakrytycznych; koszt to jedno zapytanie do indeksu FTS5 niezależnie
+        od liczby stacji.
+
+        Args:
+            query (str): Tekst wpisany przez użytkownika.
+            limit (int, opcjonalnie): Maksymalna liczba wyników; domyślnie wszystkie.
+
+        Returns:
+            list[int]: Identyfikatory stacji od najlepiej dopasowanej.
+        """
+        return self._database_client.search_stations(query, limit)
 
+    def fetch_station_details_view(self, station_id: int) -> views.StationDetailsView:
         try:
-            if elapsed >= UPDATE_INTERVALS['station']:
-                self.update_stations()
+            self._refresh_stations_if_stale()
         except requests.exceptions.ConnectionError as e:
             logging.warning("Error while updating stations: %s",e)
 
@@ -103,6 +196,82 @@ class Repository:
             indexes=air_quality_indexes
         )
 
+    def update_all_air_quality_indexes(
+        self,
+        station_ids: Iterable[int] = None,
+        only_stale: bool = False,
+        max_workers: int = BULK_UPDATE['max_workers'],
+        progress: Callable[[int, int], None] = None
+    ) -> BulkUpdateReport:
+        """
+        Zbiorczo odświeża indeksy jakości powietrza dla wszystkich stacji (lub podanych).
+
+        Indeksy pobierane są z API równolegle przez ograniczoną pulę wątków, a następnie
+        zapisywane w bazie w jednej transakcji.
+
+        Args:
+            station_ids (Iterable[int], opcjonalnie): Identyfikatory stacji; domyślnie wszystkie.
+            only_stale (bool, opcjonalnie): Czy pominąć stacje odświeżone w ciągu
+                `UPDATE_INTERVALS['aq_indexes']`.
+            max_workers (int, opcjonalnie): Maksymalna liczba równoczesnych żądań do API.
+            progress (Callable[[int, int], None], opcjonalnie): Callback (ukończone, wszystkie)
+                wywoływany po pobraniu indeksów każdej stacji.
+
+        Returns:
+            BulkUpdateReport: Liczba odświeżonych stacji, nieudane stacje, czas i przepustowość.
+        """
+        started = time.perf_counter()
+
+        if station_ids is None:
+            station_ids = [st.id for st in self._database_client.get_station_list_view()]
+        station_ids = list(station_ids)
+
+        if only_stale:
+            station_ids = self._database_client.fetch_station_air_quality_index_values(
+                station_ids, OVERALL_SENSOR_TYPE_CODENAME, UPDATE_INTERVALS['aq_indexes']
+            ).stale_ids
+
+        results = {}
+        failed = []
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aq-bulk") as executor:
+            futures = {
+                executor.submit(self._api_client.fetch_air_quality_indexes, station_id): station_id
+                for station_id in station_ids
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                station_id = futures[future]
+                try:
+                    results[station_id] = future.result()
+                except (requests.exceptions.ConnectionError, APIError) as e:
+                    logging.warning("Error while fetching air quality indexes of station %s: %s", station_id, e)
+                    failed.append(station_id)
+                except Exception:
+                    # Nieoczekiwany błąd jednej stacji nie może przerwać odświeżania pozostałych
+                    logging.exception("Unexpected error while fetching air quality indexes of station %s", station_id)
+                    failed.append(station_id)
+
+                if progress is not None:
+                    progress(done, len(station_ids))
+
+        with self._database_client.bulk_ingest():
+            for station_id, indexes in results.items():
+                self._database_client.update_station_air_quality_indexes(
+                    station_id=station_id,
+                    indexes=indexes
+                )
+
+        report = BulkUpdateReport(
+            total=len(station_ids),
+            updated=len(results),
+            failed=failed,
+            elapsed=time.perf_counter() - started
+        )
+        logging.info(
+            "Bulk air quality index update: %d/%d stations in %.2fs (%.1f stations/s)",
+            report.updated, report.total, report.elapsed, report.throughput
+        )
+        return report
+
     def fetch_station_air_quality_index_value(self, station_id: int,type_codename: str) -> int:
         """
         Zwraca listę wskaźników jakości powietrza, odświeżając dane
@@ -114,82 +283,277 @@ class Repository:
         Returns:
             list[database.views.AQIndexView]: Lista obiektów widoku wskaźników jakości powietrza.
         """
-        last_update_at = self._database_client.fetch_last_station_air_quality_indexes_update(station_id)
-        elapsed = datetime.now() - last_update_at
-
         try:
-            if elapsed >= UPDATE_INTERVALS['aq_indexes']:
-                self.update_station_air_quality_indexes(station_id)
+            self._refresh_if_stale(
+                key=("aq_indexes", station_id),
+                last_update=lambda: self._database_client.fetch_last_station_air_quality_indexes_update(station_id),
+                interval=UPDATE_INTERVALS['aq_indexes'],
+                update=lambda: self.update_station_air_quality_indexes(station_id)
+            )
         except requests.exceptions.ConnectionError as e:
             logging.warning("Error while updating air quality index values: %s",e)
 
         return self._database_client.fetch_station_air_quality_index_value(station_id, type_codename)
 
+    def fetch_station_air_quality_index_values(
+        self,
+        station_ids: Iterable[int],
+        type_codename: str
+    ) -> dict[int, int | None]:
+        """
+        Zwraca wartości indeksu danego typu dla wielu stacji (np. widocznych na mapie).
+
+        Wartości i ich aktualność odczytywane są jednym zapytaniem; z API odświeżane są
+        zbiorczo tylko stacje z nieaktualnymi indeksami.
+
+        Args:
+            station_ids (Iterable[int]): Identyfikatory stacji.
+            type_codename (str): Kod sensora (typ indeksu).
+
+        Returns:
+            dict[int, int | None]: Słownik id stacji -> wartość indeksu (None, gdy brak).
+        """
+        station_ids = list(station_ids)
+        indexes = self._database_client.fetch_station_air_quality_index_values(
+            station_ids, type_codename, UPDATE_INTERVALS['aq_indexes']
+        )
+        if indexes.stale_ids:
+            report = self.update_all_air_quality_indexes(indexes.stale_ids)
+            if report.updated:
+                indexes = self._database_client.fetch_station_air_quality_index_values(
+                    station_ids, type_codename, UPDATE_INTERVALS['aq_indexes']
+                )
+        return indexes.values()
+
     def update_station_sensors(self,station_id: int):
         stations = self._api_client.fetch_station_sensors(station_id)
         self._database_client.update_station_sensors(station_id, stations)
 
     def fetch_station_sensors(self,station_id: int) -> list[views.SensorView]:
-        last_update_at = self._database_client.fetch_last_station_sensors_update(station_id)
-        elapsed = datetime.now() - last_update_at
-
         try:
-            if elapsed >= UPDATE_INTERVALS['sensors']:
-                self.update_station_sensors(station_id)
+            self._refresh_if_stale(
+                key=("sensors", station_id),
+                last_update=lambda: self._database_client.fetch_last_station_sensors_update(station_id),
+                interval=UPDATE_INTERVALS['sensors'],
+                update=lambda: self.update_station_sensors(station_id)
+            )
         except requests.exceptions.ConnectionError as e:
             logging.warning("Error while updating station sensors: %s",e)
 
         return self._database_client.fetch_station_sensors(station_id)
 
 
-    def update_sensor_data(self,sensor_id: int,date_from: datetime,date_to: datetime):
-        now = datetime.now()
-        from_delta = (now - date_from)
+    def plan_sensor_data_update(
+            self,
+            sensor_id: int,
+            date_from: datetime,
+            date_to: datetime,
+            focus: tuple[datetime, datetime] = None
+    ) -> list[ArchivalChunk]:
+        """
+        Planuje żądania danych archiwalnych potrzebne do uzupełnienia zakresu w bazie.
+
+        Pomijane są przedziały z pokrycia sensora w bazie (również godziny, dla których API
+        nie zwróciło wartości). Dane z ostatnich `ARCHIVAL_PLANNER['live_window']` pobierane są
+        z endpointu danych bieżących, więc nie są objęte planem.
 
-        if from_delta >= timedelta(days=3,hours=1):
-            data = self._api_client.fetch_sensor_archival_data(
+        Args:
+            sensor_id (int): Identyfikator sensora.
+            date_from (datetime): Początek zakresu.
+            date_to (datetime): Koniec zakresu.
+            focus (tuple[datetime, datetime], opcjonalnie): Wyświetlany przedział, pobierany najpierw.
+
+        Returns:
+            list[ArchivalChunk]: Fragmenty zakresu w kolejności pobierania.
+        """
+        date_from = truncate_to_hour(date_from)
+        archival_to = min(date_to, datetime.now() - ARCHIVAL_PLANNER['live_window'])
+        if date_from > archival_to:
+            return []
+
+        present = self._database_client.fetch_sensor_coverage(sensor_id, date_from, archival_to)
+        return self._planner.plan(sensor_id, date_from, archival_to, present, focus)
+
+    def update_sensor_data(
+            self,
+            sensor_id: int,
+            date_from: datetime,
+            date_to: datetime,
+            focus: tuple[datetime, datetime] = None
+    ):
+        """
+        Uzupełnia pomiary sensora w bazie dla podanego zakresu.
+
+        Brakujące dane archiwalne pobierane są fragmentami wyznaczonymi przez planer
+        (z pominięciem przedziałów już pobranych) w ramach limitu zapytań API; dane z ostatnich
+        dni pochodzą z endpointu danych bieżących. Każdy zapisany fragment dodawany jest
+        do pokrycia sensora, więc ponowne wyświetlenie zakresu nie wymaga żądań do API.
+
+        Args:
+            sensor_id (int): Identyfikator sensora.
+            date_from (datetime): Początek zakresu.
+            date_to (datetime): Koniec zakresu.
+            focus (tuple[datetime, datetime], opcjonalnie): Wyświetlany przedział, pobierany najpierw.
+        """
+        # Strony z API trafiają do bazy strumieniowo, bez budowania pełnej listy pomiarów
+        for chunk in self.plan_sensor_data_update(sensor_id, date_from, date_to, focus):
+            coverage = (chunk.date_from, chunk.date_to)
+            if self._api_client.parser_pool is not None:
+                # Strony parsowane są w puli procesów i trafiają do bazy jako tablice
+                series = self._api_client.iter_sensor_archival_series(
+                    sensor_id=sensor_id,
+                    date_from=chunk.date_from,
+                    date_to=chunk.date_to
+                )
+                self._database_client.update_sensor_series_pages(sensor_id, series, coverage)
+                continue
+
+            pages = self._api_client.iter_sensor_archival_data_pages(
                 sensor_id=sensor_id,
-                date_from=date_from,
-                date_to=date_to
+                date_from=chunk.date_from,
+                date_to=chunk.date_to
             )
-            self._database_client.update_sensor_data(sensor_id, data)
+            self._database_client.update_sensor_data_pages(sensor_id, pages, coverage)
 
-        to_delta = (now - date_to)
+        now = datetime.now()
+        live_from = truncate_to_hour(now - ARCHIVAL_PLANNER['live_window'])
+        requested = (max(truncate_to_hour(date_from), live_from), truncate_to_hour(min(date_to, now)))
+        if requested[0] > requested[1]:
+            return
+
+        # dane bieżące pobieramy tylko, gdy w pokryciu brakuje godzin z okna danych bieżących;
+        # pobranie obejmuje całe okno łącznie z trwającą godziną
+        covered = self._database_client.fetch_sensor_coverage(sensor_id, *requested)
+        if self._planner.missing_intervals(*requested, covered):
+            pages = self._api_client.iter_sensor_data_pages(sensor_id)
+            self._database_client.update_sensor_data_pages(
+                sensor_id, pages, coverage=(live_from, truncate_to_hour(now))
+            )
+
+
+    def backfill_sensor_data(
+            self,
+            sensor_ids: Iterable[int],
+            date_from: datetime,
+            date_to: datetime = None,
+            max_workers: int = BULK_UPDATE['max_workers'],
+            progress: Callable[[int, int], None] = None
+    ) -> BulkUpdateReport:
+        """
+        Uzupełnia historię pomiarów wielu sensorów równolegle.
 
-        if to_delta <= timedelta(days=3,hours=1):
-            data = self._api_client.fetch_sensor_data(sensor_id)
-            self._database_client.update_sensor_data(sensor_id, data)
+        Każdy sensor uzupełniany jest w osobnym wątku z własnym połączeniem z bazą; żądania
+        archiwalne czekają na budżet we wspólnym harmonogramie limitów klienta API. Gdy klient
+        ma pulę procesów parsujących, strony różnych sensorów parsowane są na wszystkich rdzeniach.
 
+        Args:
+            sensor_ids (Iterable[int]): Identyfikatory sensorów.
+            date_from (datetime): Początek zakresu.
+            date_to (datetime, opcjonalnie): Koniec zakresu; domyślnie teraz.
+            max_workers (int, opcjonalnie): Liczba równolegle uzupełnianych sensorów.
+            progress (Callable[[int, int], None], opcjonalnie): Callback (ukończone, wszystkie).
+
+        Returns:
+            BulkUpdateReport: Liczba uzupełnionych sensorów, nieudane sensory i czas.
+        """
+        started = time.perf_counter()
+        sensor_ids = list(sensor_ids)
+        if date_to is None:
+            date_to = datetime.now()
+
+        def backfill(sensor_id: int) -> None:
+            repository = self.clone()
+            repository.update_sensor_data(sensor_id, date_from, date_to)
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sensor-backfill") as executor:
+            futures = {executor.submit(backfill, sensor_id): sensor_id for sensor_id in sensor_ids}
+            for done, future in enumerate(as_completed(futures), start=1):
+                sensor_id = futures[future]
+                try:
+                    future.result()
+                except (requests.exceptions.ConnectionError, APIError, TooManyRequests) as e:
+                    logging.warning("Error while backfilling sensor %s: %s", sensor_id, e)
+                    failed.append(sensor_id)
+                except Exception:
+                    logging.exception("Unexpected error while backfilling sensor %s", sensor_id)
+                    failed.append(sensor_id)
+
+                if progress is not None:
+                    progress(done, len(sensor_ids))
+
+        report = BulkUpdateReport(
+            total=len(sensor_ids),
+            updated=len(sensor_ids) - len(failed),
+            failed=failed,
+            elapsed=time.perf_counter() - started
+        )
+        logging.info(
+            "Sensor data backfill: %d/%d sensors in %.2fs (%.1f sensors/s)",
+            report.updated, report.total, report.elapsed, report.throughput
+        )
+        return report
+
+    def _refresh_sensor_data(self, sensor_id: int, date_from: datetime, date_to: datetime) -> None:
+        try:
+            # planer pobiera tylko brakujące fragmenty, zaczynając od wyświetlanego przedziału
+            self.update_sensor_data(sensor_id, date_from, date_to, focus=(date_from, date_to))
+        except requests.exceptions.ConnectionError as e:
+            logging.warning("Error while updating sensor data: %s", e)
 
     def fetch_sensor_data(
             self,
             sensor_id: int,
             date_from: datetime,
             date_to: datetime = None
-    ) -> list[views.SensorValueView]:
+    ) -> SensorSeries:
         # jeśli nie podano date_to, użyj teraz()
         if date_to is None:
             date_to = datetime.now()
 
-        # pobierz zakres dostępny w bazie
-        latest = self._database_client.fetch_latest_sensor_record_date(sensor_id)
-        oldest = self._database_client.fetch_oldest_sensor_record_date(sensor_id)
+        self._refresh_sensor_data(sensor_id, date_from, date_to)
 
+        # w końcu zawsze zwracamy dane z bazy w zadanym przedziale
+        return self._database_client.fetch_sensor_data(sensor_id, date_from, date_to)
 
-        try:
-            # jeśli brak w ogóle rekordów, pobierz cały przedział
-            if latest is None or oldest is None:
-                self.update_sensor_data(sensor_id, date_from, date_to)
-            else:
-                # jeśli date_to jest co najmniej o godzinę później niż latest
-                if date_to.replace(minute=0,second=0,microsecond=0) != latest.replace(minute=0,second=0,microsecond=0):
-                    self.update_sensor_data(sensor_id, max(date_from,latest), date_to)
-
-                # jeśli date_from jest co najmniej o godzinę wcześniej niż oldest
-                if date_from <= oldest - timedelta(hours=1):
-                    self.update_sensor_data(sensor_id, date_from, min(date_to,oldest))
-        except requests.exceptions.ConnectionError as e:
-            logging.warning("Error while updating sensor data: %s", e)
+    def fetch_sensor_rollup(
+            self,
+            sensor_id: int,
+            date_from: datetime,
+            date_to: datetime = None,
+            max_points: int = SENSOR_ROLLUPS['max_points']
+    ) -> SensorRollup:
+        """
+        Uzupełnia pomiary sensora i zwraca je jako serię agregatów w rozdzielczości
+        dobranej do budżetu punktów (godzinowej, dobowej lub miesięcznej).
 
-        # w końcu zawsze zwracamy dane z bazy w zadanym przedziale
-        return self._database_client.fetch_sensor_data(sensor_id, date_from, date_to)
\ No newline at end of file
+        Args:
+            sensor_id (int): Identyfikator sensora.
+            date_from (datetime): Początek zakresu.
+            date_to (datetime, opcjonalnie): Koniec zakresu; domyślnie teraz.
+            max_points (int, opcjonalnie): Maksymalna liczba punktów serii.
+
+        Returns:
+            SensorRollup: Agregaty pomiarów; statystyki dotyczą dokładnie podanego zakresu.
+        """
+        if date_to is None:
+            date_to = datetime.now()
+
+        self._refresh_sensor_data(sensor_id, date_from, date_to)
+        return self._database_client.fetch_sensor_rollup(sensor_id, date_from, date_to, max_points)
+
+    def apply_retention_step(self) -> RetentionReport:
+        """
+        Wykonuje jeden krok polityki retencji lokalnej bazy (DATABASE_RETENTION): usuwa partię
+        pomiarów godzinowych starszych niż DATABASE_RETENTION['raw_data'] i zwalnia część
+        pustych stron pliku bazy.
+
+        Returns:
+            RetentionReport: Raport kroku; przy wyłączonej retencji pusty i zakończony.
+        """
+        keep_raw = DATABASE_RETENTION['raw_data']
+        if keep_raw is None:
+            return RetentionReport(finished=True)
+        report = self._database_client.apply_retention_step(keep_raw)
+        logging.debug("Database retention step: %s", report.format())
+        return report
@@ -0,0 +1,238 @@
+"""
+Kolumnowa reprezentacja serii pomiarów sensora.
+
+Zamiast listy obiektów (data, wartość) seria przechowuje dwie tablice NumPy:
+znaczniki czasu (sekundy epoki Unix, int64) oraz wartości (float64).
+Seria agregatów (SensorRollup) przechowuje w ten sam sposób statystyki przedziałów czasu.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SensorSeries:
+    """
+    Seria pomiarów sensora posortowana rosnąco po czasie.
+
+    Attributes:
+        timestamps: znaczniki czasu pomiarów w sekundach epoki Unix (int64).
+        values: wartości pomiarów (float64).
+    """
+    timestamps: np.ndarray
+    values: np.ndarray
+
+    def __post_init__(self):
+        if self.timestamps.shape != self.values.shape:
+            raise ValueError("Tablice znaczników czasu i wartości mają różne długości")
+
+    @classmethod
+    def empty(cls) -> "SensorSeries":
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+
+    @classmethod
+    def from_arrays(cls, timestamps: Iterable[int], values: Iterable[float], count: int = -1) -> "SensorSeries":
+        """
+        Tworzy serię z iterable znaczników czasu i wartości, sortując ją po czasie.
+
+        Args:
+            timestamps: znaczniki czasu (sekundy epoki Unix).
+            values: wartości pomiarów.
+            count: liczba elementów, jeśli jest znana (pozwala uniknąć realokacji).
+        """
+        ts = np.fromiter(timestamps, dtype=np.int64, count=count)
+        vs = np.fromiter(values, dtype=np.float64, count=count)
+        return cls(ts, vs).sorted()
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[datetime, float]]) -> "SensorSeries":
+        """Tworzy serię z krotek (data, wartość)."""
+        ts: list[int] = []
+        vs: list[float] = []
+        for date, value in rows:
+            ts.append(int(date.timestamp()))
+            vs.append(value)
+        return cls.from_arrays(ts, vs, len(ts))
+
+    @classmethod
+    def concat(cls, series: Iterable["SensorSeries"]) -> "SensorSeries":
+        """Łączy serie w jedną, posortowaną po czasie."""
+        series = list(series)
+        if not series:
+            return cls.empty()
+        return cls(
+            np.concatenate([s.timestamps for s in series]),
+            np.concatenate([s.values for s in series]),
+        ).sorted()
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def sorted(self) -> "SensorSeries":
+        """Zwraca serię posortowaną po czasie (bez kopiowania, jeśli już jest posortowana)."""
+        if len(self) < 2 or np.all(self.timestamps[1:] >= self.timestamps[:-1]):
+            return self
+        order = np.argsort(self.timestamps, kind="stable")
+        return SensorSeries(self.timestamps[order], self.values[order])
+
+    @property
+    def timestamps_ms(self) -> np.ndarray:
+        """Znaczniki czasu w milisekundach (format osi czasu wykresów Qt)."""
+        return self.timestamps * 1000
+
+    def date_at(self, index: int) -> datetime:
+        """Zwraca datę (czas lokalny) pomiaru o podanym indeksie."""
+        return datetime.fromtimestamp(int(self.timestamps[index]))
+
+    def rows(self) -> Iterator[tuple[datetime, float]]:
+        """Leniwie zwraca krotki (data, wartość), np. do zapisu w bazie."""
+        for ts, value in zip(self.timestamps.tolist(), self.values.tolist()):
+            yield datetime.fromtimestamp(ts), value
+
+    def argmin(self) -> int:
+        return int(np.argmin(self.values))
+
+    def argmax(self) -> int:
+        return int(np.argmax(self.values))
+
+    def mean(self) -> float:
+        return float(np.mean(self.values))
+
+    def trend(self) -> float:
+        """
+        Zwraca współczynnik kierunkowy regresji liniowej wartości względem czasu
+        (zmiana wartości na sekundę); 0 dla serii krótszych niż dwa pomiary.
+        """
+        if len(self) < 2:
+            return 0.0
+        # Przesunięcie osi czasu poprawia uwarunkowanie zadania najmniejszych kwadratów
+        x = (self.timestamps - self.timestamps[0]).astype(np.float64)
+        a = np.vstack([x, np.ones_like(x)]).T
+        m, _ = np.linalg.lstsq(a, self.values, rcond=None)[0]
+        return float(m)
+
+
+class Resolution(Enum):
+    """Rozdzielczość serii agregatów."""
+    HOUR = "hour"
+    DAY = "day"
+    MONTH = "month"
+
+    @classmethod
+    def for_budget(cls, date_from: datetime, date_to: datetime, max_points: int) -> "Resolution":
+        """
+        Zwraca najdokładniejszą rozdzielczość, przy której zakres mieści się w budżecie punktów.
+
+        Args:
+            date_from: początek zakresu.
+            date_to: koniec zakresu.
+            max_points: maksymalna liczba punktów serii.
+        """
+        span = date_to - date_from
+        if span / timedelta(hours=1) <= max_points:
+            return cls.HOUR
+        if span / timedelta(days=1) <= max_points:
+            return cls.DAY
+        return cls.MONTH
+
+
+@dataclass(frozen=True)
+class SensorRollup:
+    """
+    Seria agregatów pomiarów sensora w kolejnych przedziałach czasu, posortowana po czasie.
+
+    Statystyki całego zakresu liczone są z agregatów przedziałów, więc ich koszt zależy
+    od liczby przedziałów, a nie pomiarów.
+
+    Attributes:
+        resolution: rozdzielczość przedziałów.
+        timestamps: początki przedziałów w sekundach epoki Unix (dla HOUR - czasy pomiarów).
+        counts: liczby pomiarów w przedziałach.
+        sums: sumy wartości.
+        mins: minima wartości.
+        maxs: maksima wartości.
+        min_timestamps: czasy wystąpienia minimów.
+        max_timestamps: czasy wystąpienia maksimów.
+    """
+    resolution: Resolution
+    timestamps: np.ndarray
+    counts: np.ndarray
+    sums: np.ndarray
+    mins: np.ndarray
+    maxs: np.ndarray
+    min_timestamps: np.ndarray
+    max_timestamps: np.ndarray
+
+    @classmethod
+    def from_series(cls, series: SensorSeries) -> "SensorRollup":
+        """Tworzy serię agregatów godzinowych (po jednym pomiarze w przedziale)."""
+        return cls(
+            resolution=Resolution.HOUR,
+            timestamps=series.timestamps,
+            counts=np.ones(len(series), dtype=np.int64),
+            sums=series.values,
+            mins=series.values,
+            maxs=series.values,
+            min_timestamps=series.timestamps,
+            max_timestamps=series.timestamps,
+        )
+
+    @classmethod
+    def from_rows(cls, resolution: Resolution, rows: Sequence[tuple]) -> "SensorRollup":
+        """
+        Tworzy serię z krotek (przedział, liczba, suma, min, max, data min, data max).
+        """
+        # Epoki i liczby mieszczą się dokładnie w float64 (do 2^53)
+        data = np.array(rows, dtype=np.float64).reshape(-1, 7)
+        data = data[np.argsort(data[:, 0], kind="stable")]
+        return cls(
+            resolution=resolution,
+            timestamps=data[:, 0].astype(np.int64),
+            counts=data[:, 1].astype(np.int64),
+            sums=data[:, 2],
+            mins=data[:, 3],
+            maxs=data[:, 4],
+            min_timestamps=data[:, 5].astype(np.int64),
+            max_timestamps=data[:, 6].astype(np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def means(self) -> np.ndarray:
+        """Średnie wartości w przedziałach."""
+        return self.sums / self.counts
+
+    @property
+    def timestamps_ms(self) -> np.ndarray:
+        """Początki przedziałów w milisekundach (format osi czasu wykresów Qt)."""
+        return self.timestamps * 1000
+
+    def series(self) -> SensorSeries:
+        """Seria średnich wartości w przedziałach."""
+        return SensorSeries(self.timestamps, self.means)
+
+    def count(self) -> int:
+        """Liczba pomiarów w całym zakresie."""
+        return int(self.counts.sum())
+
+    def argmin(self) -> int:
+        """Indeks przedziału z najmniejszą wartością."""
+        return int(np.argmin(self.mins))
+
+    def argmax(self) -> int:
+        """Indeks przedziału z największą wartością."""
+        return int(np.argmax(self.maxs))
+
+    def mean(self) -> float:
+        """Średnia wszystkich pomiarów zakresu."""
+        return float(self.sums.sum() / self.counts.sum())
+
+    def trend(self) -> float:
+        """Współczynnik kierunkowy regresji liniowej średnich w przedziałach (zmiana na sekundę)."""
+        return self.series().trend()
@@ -0,0 +1,79 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable
+
+
+@dataclass
+class SingleFlightStats:
+    """
+    Liczniki warstwy single-flight.
+
+    Attributes:
+        calls: liczba wszystkich wywołań `do`.
+        executions: liczba faktycznych wykonań funkcji.
+        coalesced: liczba wywołań obsłużonych wynikiem cudzego, trwającego wykonania.
+    """
+    calls: int = 0
+    executions: int = 0
+    coalesced: int = 0
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Scala równoczesne wywołania o tym samym kluczu w jedno wykonanie.
+
+    Pierwszy wywołujący (lider) wykonuje funkcję, pozostali czekają na jej zakończenie
+    i otrzymują ten sam wynik lub ten sam wyjątek. Po zakończeniu klucz jest zwalniany,
+    więc kolejne wywołania wykonują funkcję ponownie.
+    """
+
+    def __init__(self):
+        self.stats = SingleFlightStats()
+        self._flights: dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Wykonuje `fn(*args, **kwargs)` lub dołącza do trwającego wykonania o kluczu `key`.
+
+        Args:
+            key: identyfikator zasobu.
+            fn: funkcja pobierająca zasób.
+
+        Returns:
+            Any: wynik funkcji (współdzielony między scalonymi wywołaniami).
+        """
+        with self._lock:
+            self.stats.calls += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.stats.executions += 1
+            else:
+                self.stats.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn(*args, **kwargs)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
@@ -0,0 +1,130 @@
+"""
+Testy regresyjne bezpiecznika połączeń: żądanie próbne przerwane bez wyniku (anulowana korutyna,
+nieoczekiwany wyjątek) nie może na stałe blokować klienta, a żądanie archiwalne czekające
+na limit zapytań nie może zajmować żądania próbnego.
+
+Uruchomienie:
+    python -m unittest discover -s tests -t .
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from datetime import timedelta
+
+import requests
+
+from src.api.breaker import CircuitBreaker, CircuitState
+from src.api.client import Client
+from src.api.exceptions import CircuitOpenError
+from src.api.scheduler import RequestScheduler
+from src.api.simulator import Simulator
+
+try:
+    import aiohttp
+    from src.api.async_client import AsyncClient
+except ImportError:
+    aiohttp = None
+
+COOLDOWN = timedelta(seconds=0.05)
+
+
+def open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=COOLDOWN)
+    breaker.record_failure()
+    time.sleep(COOLDOWN.total_seconds() * 2)
+    return breaker
+
+
+class _FailingTransport:
+    def get(self, url, headers=None, stream=False):
+        raise RuntimeError("przerwane żądanie")
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def test_released_probe_can_be_retried(self):
+        breaker = open_breaker()
+        self.assertTrue(breaker.before_call())
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.release_probe()
+        self.assertTrue(breaker.before_call())
+
+    def test_check_does_not_take_probe(self):
+        breaker = open_breaker()
+        breaker.check()
+        breaker.check()
+        self.assertTrue(breaker.before_call())
+        with self.assertRaises(CircuitOpenError):
+            breaker.check()
+
+    def test_raised_probe_releases_breaker(self):
+        breaker = open_breaker()
+        client = Client(transport=_FailingTransport(), breaker=breaker)
+        with self.assertRaises(RuntimeError):
+            client.fetch_stations()
+
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(breaker.before_call())
+
+
+class ProbeOrderingTest(unittest.TestCase):
+
+    def test_archival_request_waiting_for_budget_does_not_hold_probe(self):
+        limits = {"archival": {
+            "prefix": "pjp-api/v1/rest/archivalData/", "requests": 1, "period": timedelta(seconds=1),
+        }}
+        scheduler = RequestScheduler(limits)
+        # Budżet archiwalny wyczerpany: kolejne żądanie archiwalne czeka na żeton ok. 1 s
+        scheduler.acquire("pjp-api/v1/rest/archivalData/getDataBySensor/1")
+
+        with Simulator(port=0, stations=3, latency=0) as simulator:
+            breaker = open_breaker()
+            client = Client(base_url=simulator.url, scheduler=scheduler, breaker=breaker)
+            sensor_id = simulator.sensor_ids()[0]
+            archival = threading.Thread(target=client.fetch_sensor_archival_data, args=(sensor_id,), kwargs={"days": 1})
+            archival.start()
+            time.sleep(0.1)
+
+            # Żądanie bez limitu wykonuje próbę i zamyka bezpiecznik, zanim archiwalne dostanie żeton
+            self.assertTrue(client.fetch_stations())
+            self.assertEqual(breaker.state, CircuitState.CLOSED)
+            archival.join()
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp nie jest zainstalowany")
+class AsyncProbeTest(unittest.TestCase):
+
+    def test_cancelled_probe_releases_breaker(self):
+        with Simulator(port=0, stations=3, latency=0.5) as simulator:
+            breaker = open_breaker()
+
+            async def scenario():
+                async with AsyncClient(base_url=simulator.url, breaker=breaker) as client:
+                    with self.assertRaises(asyncio.TimeoutError):
+                        await asyncio.wait_for(client.fetch_stations(), 0.1)
+                    self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+
+                    simulator.latency = 0
+                    return await client.fetch_stations()
+
+            self.assertTrue(asyncio.run(scenario()))
+            self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def test_connection_error_reopens_breaker(self):
+        breaker = open_breaker()
+
+        async def scenario():
+            async with AsyncClient(base_url="http://127.0.0.1:1", breaker=breaker) as client:
+                with self.assertRaises(requests.exceptions.ConnectionError):
+                    await client.fetch_stations()
+
+        asyncio.run(scenario())
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+
+
+if __name__ == "__main__":
+    unittest.main()